@@ -0,0 +1,29 @@
+
+
+"""add full text search
+
+Revision ID: 3f9a2c7d1e84
+Revises: c1191529db54
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from smart_scheduler.models.search import install_search_index, drop_search_index
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a2c7d1e84'
+down_revision = 'c1191529db54'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 virtual tables + sync triggers, filled from the existing rows
+    install_search_index(op.get_bind(), rebuild=True)
+
+
+def downgrade():
+    drop_search_index(op.get_bind())
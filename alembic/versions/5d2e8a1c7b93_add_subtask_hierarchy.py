@@ -0,0 +1,58 @@
+
+
+"""add subtask hierarchy
+
+Revision ID: 5d2e8a1c7b93
+Revises: 8b4e61d2a9f0
+Create Date: 2026-10-19 11:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from smart_scheduler.services.subtask_service import rebuild_hierarchy
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e8a1c7b93'
+down_revision = '8b4e61d2a9f0'
+branch_labels = None
+depends_on = None
+
+ROLLUP_COLUMNS = (
+    'descendant_count',
+    'descendant_completed_count',
+    'descendant_estimated_duration',
+    'descendant_actual_duration',
+)
+
+
+def upgrade():
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('tasks')}
+    # Plain ADD COLUMNs: a batch table rebuild would drop the FTS triggers on tasks
+    # migrate_database.py may already have added parent_id
+    if 'parent_id' not in existing:
+        op.add_column('tasks', sa.Column('parent_id', sa.Integer(), nullable=True))
+    for name in ROLLUP_COLUMNS:
+        op.add_column('tasks', sa.Column(name, sa.Integer(), nullable=False, server_default='0'))
+    op.execute('CREATE INDEX IF NOT EXISTS idx_tasks_parent_id ON tasks (parent_id)')
+
+    op.create_table(
+        'task_closure',
+        sa.Column('ancestor_id', sa.Integer(), nullable=False),
+        sa.Column('descendant_id', sa.Integer(), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id'),
+    )
+    op.create_index('ix_task_closure_descendant_ancestor', 'task_closure', ['descendant_id', 'ancestor_id'])
+
+    # Closure rows and rollups for any parent_id data that already exists
+    rebuild_hierarchy(op.get_bind())
+
+
+def downgrade():
+    op.drop_index('ix_task_closure_descendant_ancestor', table_name='task_closure')
+    op.drop_table('task_closure')
+    # parent_id stays: it predates this revision via migrate_database.py
+    for name in ROLLUP_COLUMNS:
+        op.drop_column('tasks', name)
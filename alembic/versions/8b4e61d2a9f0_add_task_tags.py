@@ -0,0 +1,42 @@
+
+
+"""add task_tags
+
+Revision ID: 8b4e61d2a9f0
+Revises: 3f9a2c7d1e84
+Create Date: 2026-10-19 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from smart_scheduler.services.tag_service import backfill_task_tags
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4e61d2a9f0'
+down_revision = '3f9a2c7d1e84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'task_tags',
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('tag', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('task_id', 'tag'),
+    )
+    op.create_index('ix_task_tags_tag_task_id', 'task_tags', ['tag', 'task_id'])
+
+    # Parse the existing Task.tags strings a batch of tasks at a time
+    backfill_task_tags(
+        op.get_bind(),
+        batch_size=1000,
+        on_batch=lambda done: print(f"  backfilled tags for {done} tasks"),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_task_tags_tag_task_id', table_name='task_tags')
+    op.drop_table('task_tags')
@@ -0,0 +1,41 @@
+
+
+"""add task dependencies
+
+Revision ID: a7c3f0e95b12
+Revises: 5d2e8a1c7b93
+Create Date: 2026-10-19 12:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3f0e95b12'
+down_revision = '5d2e8a1c7b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'task_dependencies',
+        sa.Column('predecessor_id', sa.Integer(), nullable=False),
+        sa.Column('successor_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('predecessor_id', 'successor_id'),
+    )
+    op.create_index(
+        'ix_task_dependencies_successor_predecessor', 'task_dependencies', ['successor_id', 'predecessor_id']
+    )
+    # No edges exist yet, so every task's earliest_start is 0
+    op.add_column('tasks', sa.Column('earliest_start', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index('idx_tasks_project_id', 'tasks', ['project_id'])
+
+
+def downgrade():
+    op.drop_index('idx_tasks_project_id', table_name='tasks')
+    op.drop_column('tasks', 'earliest_start')
+    op.drop_index('ix_task_dependencies_successor_predecessor', table_name='task_dependencies')
+    op.drop_table('task_dependencies')
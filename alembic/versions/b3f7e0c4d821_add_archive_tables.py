@@ -0,0 +1,85 @@
+"""add archive tables for finished tasks and deadlines
+
+Revision ID: b3f7e0c4d821
+Revises: d8e3a6b2c915
+Create Date: 2026-10-19 18:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f7e0c4d821'
+down_revision = 'd8e3a6b2c915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Same columns as tasks / deadlines, plus archived_at
+    op.create_table(
+        'tasks_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=11), nullable=True),
+        sa.Column('priority', sa.String(length=6), nullable=True),
+        sa.Column('estimated_duration', sa.Integer(), nullable=True),
+        sa.Column('actual_duration', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('due_date', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('category', sa.String(), nullable=True),
+        sa.Column('tags', sa.String(), nullable=True),
+        sa.Column('progress_percentage', sa.Float(), nullable=True),
+        sa.Column('scheduled_start_time', sa.DateTime(), nullable=True),
+        sa.Column('scheduled_end_time', sa.DateTime(), nullable=True),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('recurrence', sa.String(length=7), nullable=True),
+        sa.Column('recurrence_end_date', sa.Date(), nullable=True),
+        sa.Column('energy_level_required', sa.Integer(), nullable=True),
+        sa.Column('focus_level_required', sa.Integer(), nullable=True),
+        sa.Column('parent_id', sa.Integer(), nullable=True),
+        sa.Column('descendant_count', sa.Integer(), nullable=False),
+        sa.Column('descendant_completed_count', sa.Integer(), nullable=False),
+        sa.Column('descendant_estimated_duration', sa.Integer(), nullable=False),
+        sa.Column('descendant_actual_duration', sa.Integer(), nullable=False),
+        sa.Column('earliest_start', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tasks_archive_created_at', 'tasks_archive', ['created_at'])
+    op.create_index('ix_tasks_archive_project_id', 'tasks_archive', ['project_id'])
+    op.create_table(
+        'deadlines_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('type', sa.String(length=7), nullable=True),
+        sa.Column('due_date', sa.DateTime(), nullable=False),
+        sa.Column('completed', sa.Boolean(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('color', sa.String(), nullable=True),
+        sa.Column('task_id', sa.Integer(), nullable=True),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('recurrence', sa.String(length=7), nullable=True),
+        sa.Column('recurrence_end_date', sa.Date(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_deadlines_archive_due_date', 'deadlines_archive', ['due_date'])
+
+
+def downgrade():
+    # Archived rows are dropped with the tables, not moved back
+    op.drop_index('ix_deadlines_archive_due_date', table_name='deadlines_archive')
+    op.drop_table('deadlines_archive')
+    op.drop_index('ix_tasks_archive_project_id', table_name='tasks_archive')
+    op.drop_index('ix_tasks_archive_created_at', table_name='tasks_archive')
+    op.drop_table('tasks_archive')
@@ -0,0 +1,40 @@
+
+
+"""add daily workload rollups
+
+Revision ID: b6d1f4a8c203
+Revises: e4b19d3f6a27
+Create Date: 2026-10-19 14:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from smart_scheduler.services.workload_service import rebuild_daily_load
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d1f4a8c203'
+down_revision = 'e4b19d3f6a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'daily_load',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('scheduled_minutes', sa.Integer(), nullable=False),
+        sa.Column('due_count', sa.Integer(), nullable=False),
+        sa.Column('deadline_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'project_id', 'category'),
+    )
+
+    # Buckets for the tasks and deadlines that already exist
+    rebuild_daily_load(op.get_bind())
+
+
+def downgrade():
+    op.drop_table('daily_load')
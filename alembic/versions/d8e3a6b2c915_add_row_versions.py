@@ -0,0 +1,31 @@
+
+
+"""add row versions for optimistic concurrency
+
+Revision ID: d8e3a6b2c915
+Revises: f2a9c5e7d140
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8e3a6b2c915'
+down_revision = 'f2a9c5e7d140'
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ('tasks', 'deadlines', 'projects')
+
+
+def upgrade():
+    # Existing rows start at version 1, like new ones
+    for table in VERSIONED_TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    for table in VERSIONED_TABLES:
+        op.drop_column(table, 'version')
@@ -0,0 +1,49 @@
+
+
+"""add work sessions and daily time totals
+
+Revision ID: e4b19d3f6a27
+Revises: a7c3f0e95b12
+Create Date: 2026-10-19 13:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b19d3f6a27'
+down_revision = 'a7c3f0e95b12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'work_sessions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('stopped_at', sa.DateTime(), nullable=True),
+        sa.Column('rolled_up', sa.Boolean(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_work_sessions_task_id', 'work_sessions', ['task_id'])
+    op.create_index(
+        'ix_work_sessions_pending', 'work_sessions', ['id'], sqlite_where=sa.text('rolled_up = 0')
+    )
+    op.create_table(
+        'daily_time_totals',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('seconds', sa.Integer(), nullable=False),
+        sa.Column('sessions', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'category'),
+    )
+
+
+def downgrade():
+    op.drop_table('daily_time_totals')
+    op.drop_index('ix_work_sessions_pending', table_name='work_sessions')
+    op.drop_index('ix_work_sessions_task_id', table_name='work_sessions')
+    op.drop_table('work_sessions')
@@ -0,0 +1,97 @@
+"""monotonic task and deadline ids; archived tags in their own table
+
+Revision ID: e7a2d4c9b615
+Revises: b3f7e0c4d821
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+from smart_scheduler.core.online_migration import rebuild_table
+from smart_scheduler.services.tag_service import parse_tags
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a2d4c9b615'
+down_revision = 'b3f7e0c4d821'
+branch_labels = None
+depends_on = None
+
+# Live table -> its archive: ids handed out must also stay clear of archived ones
+ARCHIVED_TABLES = {'tasks': 'tasks_archive', 'deadlines': 'deadlines_archive'}
+
+
+def _create_sql(table, autoincrement):
+    """The table's current CREATE TABLE, with the id column made AUTOINCREMENT (or plain again)"""
+    sql = op.get_bind().exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).scalar()
+    sql = sql.replace('{', '{{').replace('}', '}}')
+    sql = re.sub(rf'^CREATE TABLE "?{table}"?', 'CREATE TABLE {table}', sql)
+    if autoincrement:
+        sql = re.sub(r',\s*PRIMARY KEY \(id\)', '', sql)
+        return re.sub(r'\(\s*id INTEGER NOT NULL,', '(\n\tid INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,', sql, count=1)
+    sql = sql.replace('id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,', 'id INTEGER NOT NULL,', 1)
+    return re.sub(r'\s*\)$', ', \n\tPRIMARY KEY (id)\n)', sql)
+
+
+def _forget_rebuilds(suffix):
+    # Finished rebuilds are no-ops under their name: let the opposite direction run again later
+    op.get_bind().execute(sa.text("DELETE FROM online_migrations WHERE name LIKE :names"),
+                          {'names': f'rebuild:%:{suffix}'})
+
+
+def upgrade():
+    bind = op.get_bind()
+    # SQLite can't add AUTOINCREMENT in place: copy into a new table in
+    # batches. First, since a rerun after a failure resumes or skips them
+    create_sql = {table: _create_sql(table, autoincrement=True) for table in ARCHIVED_TABLES}
+    with op.get_context().autocommit_block():
+        for table in ARCHIVED_TABLES:
+            rebuild_table(bind, table, create_sql[table], name=f'rebuild:{table}:autoincrement')
+    _forget_rebuilds('plain')
+    # The sequence starts past every id in use, live or archived
+    for table, archive in ARCHIVED_TABLES.items():
+        op.execute(f"DELETE FROM sqlite_sequence WHERE name = '{table}'")
+        op.execute(
+            f"INSERT INTO sqlite_sequence (name, seq) SELECT '{table}', "
+            f"max(coalesce((SELECT max(id) FROM {table}), 0), coalesce((SELECT max(id) FROM {archive}), 0))"
+        )
+
+    # Archived tasks keep their tags here, so task_tags only holds live ids
+    op.create_table(
+        'task_tags_archive',
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('tag', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('task_id', 'tag'),
+    )
+    op.create_index('ix_task_tags_archive_tag_task_id', 'task_tags_archive', ['tag', 'task_id'])
+    # From the archived rows' own tags: where an archived id was already
+    # handed out again, task_tags holds the new task's tags
+    pairs = [
+        {'task_id': task_id, 'tag': tag}
+        for task_id, tags in bind.exec_driver_sql("SELECT id, tags FROM tasks_archive WHERE tags IS NOT NULL")
+        for tag in parse_tags(tags)
+    ]
+    if pairs:
+        bind.execute(sa.text("INSERT INTO task_tags_archive (task_id, tag) VALUES (:task_id, :tag)"), pairs)
+    op.execute("DELETE FROM task_tags WHERE task_id NOT IN (SELECT id FROM tasks)")
+
+
+def downgrade():
+    op.execute(
+        "INSERT OR IGNORE INTO task_tags (task_id, tag) SELECT task_id, tag FROM task_tags_archive "
+        "WHERE task_id NOT IN (SELECT id FROM tasks)"
+    )
+    op.drop_index('ix_task_tags_archive_tag_task_id', table_name='task_tags_archive')
+    op.drop_table('task_tags_archive')
+
+    bind = op.get_bind()
+    create_sql = {table: _create_sql(table, autoincrement=False) for table in ARCHIVED_TABLES}
+    with op.get_context().autocommit_block():
+        for table in ARCHIVED_TABLES:
+            rebuild_table(bind, table, create_sql[table], name=f'rebuild:{table}:plain')
+    _forget_rebuilds('autoincrement')
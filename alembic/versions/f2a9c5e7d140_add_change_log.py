@@ -0,0 +1,51 @@
+
+
+"""add change log for delta sync
+
+Revision ID: f2a9c5e7d140
+Revises: b6d1f4a8c203
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from smart_scheduler.models.change_log import install_change_log, drop_change_log
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a9c5e7d140'
+down_revision = 'b6d1f4a8c203'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'change_log',
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.Column('entity', sa.String(), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('op', sa.String(), nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('seq'),
+        sqlite_autoincrement=True,
+    )
+    op.create_index('ix_change_log_entity', 'change_log', ['entity_id', 'entity'], unique=True)
+    op.create_table(
+        'change_log_horizon',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    # Triggers, plus an upsert entry for every existing row so that a sync
+    # from 0 returns the full data set
+    install_change_log(op.get_bind(), backfill=True)
+
+
+def downgrade():
+    drop_change_log(op.get_bind())
+    op.drop_table('change_log_horizon')
+    op.drop_index('ix_change_log_entity', table_name='change_log')
+    op.drop_table('change_log')
@@ -1,4 +1,9 @@
 from .deadline import router as deadline_router
 from .schedule import router as schedule_router
 from .notification import router as notification_router 
-from .task import router as task_router 
\ No newline at end of file
+from .task import router as task_router
+from .search import router as search_router
+from .dependency import router as dependency_router
+from .report import router as report_router
+from .sync import router as sync_router
+from .admin import router as admin_router
@@ -0,0 +1,33 @@
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+from smart_scheduler.core.backup import BackupError, BackupInProgress, create_backup, list_backups
+from smart_scheduler.core.config import settings
+from smart_scheduler.core.serialization import FastJSONResponse
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Check X-Admin-Token against settings.admin_token, when one is configured"""
+    if settings.admin_token and not hmac.compare_digest(x_admin_token or "", settings.admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+@router.post("/backup")
+def backup(
+    compress: bool = Query(False, description="gzip the backup"),
+    keep: Optional[int] = Query(None, ge=0, description="Newest backups to keep, 0 for all (default: settings.backup_keep)")
+):
+    """Online backup of the database into settings.backup_dir; writers keep going meanwhile"""
+    try:
+        return FastJSONResponse(create_backup(compress=compress, keep=keep))
+    except BackupInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except BackupError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/backups")
+def backups():
+    """Existing backups, newest first"""
+    return FastJSONResponse(list_backups())
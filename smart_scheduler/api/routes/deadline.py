@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict
 from datetime import datetime
 from smart_scheduler.services.deadline_service import DeadlineService
-from smart_scheduler.models import Deadline, DeadlineType, DeadlineRecurrence
+from smart_scheduler.services.archive_service import ArchiveService, with_archived
+from smart_scheduler.services.progress_service import write_pending
+from smart_scheduler.models import Deadline, DeadlineArchive, DeadlineType, DeadlineRecurrence
+from smart_scheduler.core.concurrency import VersionConflict, conflict, etag, parse_if_match
 from smart_scheduler.core.database import get_db
+from smart_scheduler.core.serialization import (
+    FastJSONResponse, in_request_order, object_dict, parse_fields, parse_ids, row_dicts
+)
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/deadlines", tags=["Deadlines"])
@@ -46,27 +53,63 @@ class DeadlineResponse(BaseModel):
     project_id: Optional[int]
     created_at: datetime
     updated_at: datetime
+    version: int
 
     class Config:
         orm_mode = True
 
+DEADLINE_FIELDS = list(DeadlineResponse.model_fields)
+
+def deadline_response(deadline):
+    # Trusted ORM data: render directly instead of re-validating through DeadlineResponse
+    return FastJSONResponse(object_dict(deadline, DEADLINE_FIELDS), headers={"ETag": etag(deadline.version)})
+
 @router.get("/", response_model=List[DeadlineResponse])
 def list_deadlines(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     completed: Optional[bool] = Query(None),
+    include_archived: bool = Query(False, description="Also list archived deadlines, flagged archived=true"),
+    ids: Optional[str] = Query(None, description="Comma-separated ids: fetch exactly these deadlines, in this order"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return; id is always included"),
     db: Session = Depends(get_db)
 ):
+    """List deadlines by due date; with `ids`, fetch those as {"items": [...], "missing": [...]} (see GET /api/tasks)"""
+    try:
+        deadline_ids = parse_ids(ids) if ids is not None else None
+        columns = parse_fields(fields, DEADLINE_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if deadline_ids is not None:
+        rows = row_dicts(db, columns, Deadline, select(Deadline).where(Deadline.id.in_(deadline_ids)))
+        if include_archived:
+            found = {row["id"] for row in rows}
+            archived_ids = [deadline_id for deadline_id in deadline_ids if deadline_id not in found]
+            archived_stmt = select(DeadlineArchive).where(DeadlineArchive.id.in_(archived_ids))
+            rows = with_archived(rows, row_dicts(db, columns, DeadlineArchive, archived_stmt), "id")
+        return FastJSONResponse(in_request_order(rows, deadline_ids))
+
     service = DeadlineService(db)
-    return service.get_deadlines(start_date, end_date, completed)
+    stmt = service.deadlines_statement(start_date, end_date, completed)
+    # The merge with the archive orders by due_date, requested or not
+    query_columns = columns if "due_date" in columns or not include_archived else columns + ["due_date"]
+    rows = row_dicts(db, query_columns, Deadline, stmt)
+    if include_archived:
+        archived_stmt = service.deadlines_statement(start_date, end_date, completed, model=DeadlineArchive)
+        rows = with_archived(rows, row_dicts(db, query_columns, DeadlineArchive, archived_stmt), "due_date")
+        if query_columns is not columns:
+            for row in rows:
+                del row["due_date"]
+    return FastJSONResponse(rows)
 
 @router.post("/", response_model=DeadlineResponse)
 def create_deadline(deadline: DeadlineCreate, db: Session = Depends(get_db)):
     service = DeadlineService(db)
-    return service.create_deadline(**deadline.dict())
+    return deadline_response(service.create_deadline(**deadline.dict()))
 
-@router.get("/analytics", response_model=Dict[str, int])
-def deadline_analytics(db: Session = Depends(get_db)):
+@router.get("/analytics", response_model=Dict[str, int], dependencies=[Depends(write_pending)])
+def deadline_analytics(include_archived: bool = Query(False), db: Session = Depends(get_db)):
     service = DeadlineService(db)
     now = datetime.utcnow()
     all_deadlines = service.get_deadlines_plain()
@@ -76,8 +119,15 @@ def deadline_analytics(db: Session = Depends(get_db)):
     by_type = {t.value: 0 for t in DeadlineType}
     for d in all_deadlines:
         by_type[d["type"]] += 1
+    total = len(all_deadlines)
+    if include_archived:
+        # Archived deadlines are all completed
+        for deadline_type, count in ArchiveService(db).deadline_type_counts().items():
+            by_type[deadline_type.value] += count
+            total += count
+            completed += count
     return {
-        "total": len(all_deadlines),
+        "total": total,
         "completed": completed,
         "overdue": overdue,
         "upcoming": upcoming,
@@ -90,35 +140,50 @@ def get_deadline(deadline_id: int, db: Session = Depends(get_db)):
     deadline = service.get_deadline(deadline_id)
     if not deadline:
         raise HTTPException(status_code=404, detail="Deadline not found")
-    return deadline
+    return deadline_response(deadline)
 
 @router.put("/{deadline_id}", response_model=DeadlineResponse)
-def update_deadline(deadline_id: int, update: DeadlineUpdate, db: Session = Depends(get_db)):
+def update_deadline(deadline_id: int, update: DeadlineUpdate, if_match: Optional[str] = Header(None),
+                    db: Session = Depends(get_db)):
     service = DeadlineService(db)
-    deadline = service.update_deadline(deadline_id, **update.dict(exclude_unset=True))
+    try:
+        deadline = service.update_deadline(deadline_id, parse_if_match(if_match), **update.dict(exclude_unset=True))
+    except VersionConflict as e:
+        raise conflict(e)
     if not deadline:
         raise HTTPException(status_code=404, detail="Deadline not found")
-    return deadline
+    return deadline_response(deadline)
 
 @router.delete("/{deadline_id}")
-def delete_deadline(deadline_id: int, db: Session = Depends(get_db)):
+def delete_deadline(deadline_id: int, if_match: Optional[str] = Header(None), db: Session = Depends(get_db)):
     service = DeadlineService(db)
-    if not service.delete_deadline(deadline_id):
+    try:
+        deleted = service.delete_deadline(deadline_id, parse_if_match(if_match))
+    except VersionConflict as e:
+        raise conflict(e)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Deadline not found")
     return {"message": "Deadline deleted", "deadline_id": deadline_id}
 
 @router.patch("/{deadline_id}/complete", response_model=DeadlineResponse)
-def mark_complete(deadline_id: int, db: Session = Depends(get_db)):
+def mark_complete(deadline_id: int, if_match: Optional[str] = Header(None), db: Session = Depends(get_db)):
     service = DeadlineService(db)
-    deadline = service.mark_complete(deadline_id)
+    try:
+        deadline = service.mark_complete(deadline_id, parse_if_match(if_match))
+    except VersionConflict as e:
+        raise conflict(e)
     if not deadline:
         raise HTTPException(status_code=404, detail="Deadline not found")
-    return deadline
+    return deadline_response(deadline)
 
 @router.patch("/{deadline_id}/extend", response_model=DeadlineResponse)
-def extend_deadline(deadline_id: int, new_due_date: datetime, db: Session = Depends(get_db)):
+def extend_deadline(deadline_id: int, new_due_date: datetime, if_match: Optional[str] = Header(None),
+                    db: Session = Depends(get_db)):
     service = DeadlineService(db)
-    deadline = service.extend_deadline(deadline_id, new_due_date)
+    try:
+        deadline = service.extend_deadline(deadline_id, new_due_date, parse_if_match(if_match))
+    except VersionConflict as e:
+        raise conflict(e)
     if not deadline:
         raise HTTPException(status_code=404, detail="Deadline not found")
-    return deadline 
\ No newline at end of file
+    return deadline_response(deadline) 
\ No newline at end of file
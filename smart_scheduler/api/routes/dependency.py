@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from smart_scheduler.services.dependency_service import DependencyService, DependencyError
+from smart_scheduler.services.task_service import TaskService
+from smart_scheduler.services.ranking_service import tasks_changed
+from smart_scheduler.core.database import get_db
+from smart_scheduler.core.serialization import FastJSONResponse
+from pydantic import BaseModel
+
+router = APIRouter(prefix="/api", tags=["Dependencies"])
+
+class DependencyCreate(BaseModel):
+    predecessor_id: int  # the task that has to finish first
+
+@router.get("/tasks/{task_id}/dependencies")
+def list_dependencies(task_id: int, db: Session = Depends(get_db)):
+    """Direct predecessors and successors of a task"""
+    if not TaskService(db).get_task_by_id(task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+    return FastJSONResponse(DependencyService(db).get_dependencies(task_id))
+
+@router.post("/tasks/{task_id}/dependencies")
+def add_dependency(task_id: int, dependency: DependencyCreate, db: Session = Depends(get_db)):
+    """Make the task wait for `predecessor_id`; open predecessors block it"""
+    service = DependencyService(db)
+    try:
+        service.add_dependency(dependency.predecessor_id, task_id)
+    except DependencyError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    db.commit()
+    tasks_changed(db, [task_id])  # may have become BLOCKED
+    return FastJSONResponse(service.get_dependencies(task_id))
+
+@router.delete("/tasks/{task_id}/dependencies/{predecessor_id}")
+def remove_dependency(task_id: int, predecessor_id: int, db: Session = Depends(get_db)):
+    service = DependencyService(db)
+    if not service.remove_dependency(predecessor_id, task_id):
+        raise HTTPException(status_code=404, detail="Dependency not found")
+    db.commit()
+    tasks_changed(db, [task_id])
+    return FastJSONResponse(service.get_dependencies(task_id))
+
+@router.get("/projects/{project_id}/critical-path")
+def critical_path(project_id: int, db: Session = Depends(get_db)):
+    """Topological schedule of the project's tasks with slack and the critical path"""
+    return FastJSONResponse(DependencyService(db).critical_path(project_id))
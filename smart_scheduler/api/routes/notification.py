@@ -5,6 +5,7 @@ from datetime import datetime
 from smart_scheduler.services.notification_service import NotificationService
 from smart_scheduler.models import Notification
 from smart_scheduler.core.database import get_db
+from smart_scheduler.core.serialization import FastJSONResponse, object_dict, row_dicts
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/notifications", tags=["Notifications"])
@@ -30,6 +31,12 @@ class NotificationResponse(BaseModel):
     class Config:
         orm_mode = True
 
+NOTIFICATION_FIELDS = list(NotificationResponse.model_fields)
+
+def notification_response(notification):
+    # Trusted ORM data: render directly instead of re-validating through NotificationResponse
+    return FastJSONResponse(object_dict(notification, NOTIFICATION_FIELDS))
+
 @router.get("/", response_model=List[NotificationResponse])
 def list_notifications(
     user_id: Optional[int] = Query(None),
@@ -39,12 +46,13 @@ def list_notifications(
     db: Session = Depends(get_db)
 ):
     service = NotificationService(db)
-    return service.get_notifications(user_id, sent, read, upcoming)
+    stmt = service.notifications_statement(user_id, sent, read, upcoming)
+    return FastJSONResponse(row_dicts(db, NOTIFICATION_FIELDS, Notification, stmt))
 
 @router.post("/", response_model=NotificationResponse)
 def create_notification(notification: NotificationCreate, db: Session = Depends(get_db)):
     service = NotificationService(db)
-    return service.create_notification(**notification.dict())
+    return notification_response(service.create_notification(**notification.dict()))
 
 @router.get("/{notification_id}", response_model=NotificationResponse)
 def get_notification(notification_id: int, db: Session = Depends(get_db)):
@@ -52,7 +60,7 @@ def get_notification(notification_id: int, db: Session = Depends(get_db)):
     notification = service.get_notification(notification_id)
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
-    return notification
+    return notification_response(notification)
 
 @router.patch("/{notification_id}/sent", response_model=NotificationResponse)
 def mark_sent(notification_id: int, db: Session = Depends(get_db)):
@@ -60,7 +68,7 @@ def mark_sent(notification_id: int, db: Session = Depends(get_db)):
     notification = service.mark_sent(notification_id)
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
-    return notification
+    return notification_response(notification)
 
 @router.patch("/{notification_id}/read", response_model=NotificationResponse)
 def mark_read(notification_id: int, db: Session = Depends(get_db)):
@@ -68,7 +76,7 @@ def mark_read(notification_id: int, db: Session = Depends(get_db)):
     notification = service.mark_read(notification_id)
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
-    return notification
+    return notification_response(notification)
 
 @router.delete("/{notification_id}")
 def delete_notification(notification_id: int, db: Session = Depends(get_db)):
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date, datetime, timedelta
+from smart_scheduler.services.work_session_service import WorkSessionService
+from smart_scheduler.core.database import get_db
+from smart_scheduler.core.serialization import FastJSONResponse
+
+router = APIRouter(prefix="/api/reports", tags=["Reports"])
+
+@router.get("/time")
+def time_report(
+    start: Optional[date] = Query(None, description="First day (default: 30 days ago)"),
+    end: Optional[date] = Query(None, description="Last day, inclusive (default: today)"),
+    category: Optional[str] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """Tracked time per day and per category, read from the daily rollups.
+
+    Read-only: sessions closed since the last rollup (the background job,
+    or POST /api/reports/rollup) are not counted yet.
+    """
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    return FastJSONResponse(WorkSessionService(db).time_report(start, end, category))
+
+@router.post("/rollup")
+def run_rollup(db: Session = Depends(get_db)):
+    """Fold all closed work sessions into the rollups now.
+
+    Uses the request session, so in write-serialization mode the fold
+    queues for the writer like any other mutation.
+    """
+    return {"rolled_up": WorkSessionService(db).rollup()}
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from smart_scheduler.services.task_service import TaskService
 from smart_scheduler.services.deadline_service import DeadlineService
+from smart_scheduler.services.progress_service import overlay, write_pending
+from smart_scheduler.services.tag_service import TAG_MODES
+from smart_scheduler.services.workload_service import WorkloadService
 from smart_scheduler.models import Task, Deadline
 from smart_scheduler.core.database import get_db
+from smart_scheduler.core.serialization import FastJSONResponse
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/schedule", tags=["Schedule"])
@@ -34,16 +38,21 @@ def get_schedule(
     category: Optional[str] = Query(None),
     project_id: Optional[int] = Query(None),
     completed: Optional[bool] = Query(None),
+    tag: Optional[List[str]] = Query(None, description="Only tasks with these tags (repeatable)"),
+    tag_mode: str = Query("any", description="any or all"),
     db: Session = Depends(get_db)
 ):
+    if tag_mode not in TAG_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid tag_mode: {tag_mode}")
     # Fetch tasks
     task_service = TaskService(db)
-    tasks = task_service.get_tasks_plain(start_date, end_date)
+    tasks = overlay(task_service.get_tasks_plain(start_date, end_date, tags=tag, tag_mode=tag_mode))
     # Fetch deadlines
     deadline_service = DeadlineService(db)
     deadlines = deadline_service.get_deadlines_plain_range(start_date, end_date)
 
-    items: List[ScheduleItem] = []
+    # Plain dicts in ScheduleItem's shape; built from trusted rows, so no re-validation
+    items: List[Dict[str, Any]] = []
     if type in (None, "task"):
         for t in tasks:
             if (
@@ -52,33 +61,53 @@ def get_schedule(
                 and (project_id is None or t["project_id"] == project_id)
                 and (completed is None or t["completed"] == completed)
             ):
-                items.append(ScheduleItem(
-                    id=t["id"],
-                    type="task",
-                    title=t["title"],
-                    due_date=t["due_date"],
-                    color=t["color"],
-                    status=t["status"],
-                    completed=t["completed"],
-                    category=t["category"],
-                    project_id=t["project_id"],
-                    recurrence=t["recurrence"]
-                ))
-    if type in (None, "deadline"):
+                items.append({
+                    "id": t["id"],
+                    "type": "task",
+                    "title": t["title"],
+                    "due_date": t["due_date"],
+                    "color": t["color"],
+                    "status": t["status"],
+                    "completed": t["completed"],
+                    "category": t["category"],
+                    "project_id": t["project_id"],
+                    "recurrence": t["recurrence"]
+                })
+    # Deadlines carry no tags, so a tag filter limits the view to tasks
+    if type in (None, "deadline") and not tag:
         for d in deadlines:
             if (
                 (project_id is None or d["project_id"] == project_id)
                 and (completed is None or d["completed"] == completed)
             ):
-                items.append(ScheduleItem(
-                    id=d["id"],
-                    type="deadline",
-                    title=d["title"],
-                    due_date=d["due_date"],
-                    color=d["color"],
-                    completed=d["completed"],
-                    project_id=d["project_id"],
-                    recurrence=d["recurrence"]
-                ))
-    items.sort(key=lambda x: x.due_date)
-    return items 
\ No newline at end of file
+                items.append({
+                    "id": d["id"],
+                    "type": "deadline",
+                    "title": d["title"],
+                    "due_date": d["due_date"],
+                    "color": d["color"],
+                    "status": None,
+                    "completed": d["completed"],
+                    "category": None,
+                    "project_id": d["project_id"],
+                    "recurrence": d["recurrence"]
+                })
+    items.sort(key=lambda x: x["due_date"])
+    return FastJSONResponse(items) 
+
+@router.get("/heatmap", dependencies=[Depends(write_pending)])
+def get_heatmap(
+    start: Optional[date] = Query(None, description="First day (default: 364 days before end)"),
+    end: Optional[date] = Query(None, description="Last day, inclusive (default: today)"),
+    project_id: Optional[int] = Query(None),
+    category: Optional[str] = Query(None, description="Task category; deadlines count as uncategorized"),
+    db: Session = Depends(get_db)
+):
+    """Scheduled minutes, tasks due and deadlines per day, from the daily_load rollups"""
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=364)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days > 366 * 5:
+        raise HTTPException(status_code=400, detail="Range is limited to 5 years")
+    return FastJSONResponse(WorkloadService(db).heatmap(start, end, project_id, category))
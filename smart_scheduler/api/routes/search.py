@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from smart_scheduler.services.search_service import SearchService, SEARCH_TYPES
+from smart_scheduler.core.database import get_db
+from smart_scheduler.core.serialization import FastJSONResponse
+from pydantic import BaseModel
+
+router = APIRouter(prefix="/api/search", tags=["Search"])
+
+class SearchResult(BaseModel):
+    type: str  # 'task', 'deadline' or 'project'
+    id: int
+    title: str
+    snippet: Optional[str]
+    rank: float
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResult]
+    limit: int
+    offset: int
+    has_more: bool
+
+@router.get("/", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=1, description="Words to search for"),
+    type: Optional[List[str]] = Query(None, description="task, deadline and/or project"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    if type:
+        invalid = [t for t in type if t not in SEARCH_TYPES]
+        if invalid:
+            raise HTTPException(status_code=400, detail=f"Invalid type: {', '.join(invalid)}")
+    service = SearchService(db)
+    return FastJSONResponse(service.search(q, types=type, limit=limit, offset=offset))
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from smart_scheduler.services.progress_service import write_pending
+from smart_scheduler.services.sync_service import SyncService, SYNC_PAGE_SIZE
+from smart_scheduler.core.config import settings
+from smart_scheduler.core.database import get_db
+from smart_scheduler.core.serialization import FastJSONResponse
+
+router = APIRouter(prefix="/api/sync", tags=["Sync"])
+
+# Pending updates reach the change log (and the cursor) when they are written
+@router.get("", dependencies=[Depends(write_pending)])
+def sync(
+    since: int = Query(0, ge=0, description="cursor from the previous response; 0 for a full download"),
+    limit: int = Query(SYNC_PAGE_SIZE, ge=1, le=10000),
+    db: Session = Depends(get_db)
+):
+    """Tasks, deadlines, projects and notifications changed since the cursor, plus deletions"""
+    return FastJSONResponse(SyncService(db).changes(since, limit))
+
+@router.post("/compact")
+def compact(
+    retention_days: Optional[int] = Query(None, ge=0, description="Default: settings.change_log_retention_days"),
+    db: Session = Depends(get_db)
+):
+    """Drop old tombstones; clients whose cursor is older get a reset on their next sync"""
+    service = SyncService(db)
+    days = settings.change_log_retention_days if retention_days is None else retention_days
+    removed = service.compact(days)
+    db.commit()
+    return {"removed": removed, "horizon": service.horizon()}
@@ -1,14 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
+import io
+import tempfile
 from smart_scheduler.services.task_service import TaskService
-from smart_scheduler.models.task import Task
-from smart_scheduler.core.database import get_db
+from smart_scheduler.services.subtask_service import HierarchyError, SubtaskService
+from smart_scheduler.services.task_transfer_service import (
+    TaskTransferService, EXPORT_FORMATS, parse_csv, parse_ndjson
+)
+from smart_scheduler.services.tag_service import TagService, TAG_MODES
+from smart_scheduler.services.work_session_service import WorkSessionService
+from smart_scheduler.services.ranking_service import RankingService
+from smart_scheduler.services.progress_service import ProgressService, overlay
+from smart_scheduler.services.archive_service import with_archived
+from smart_scheduler.models.task import Task, TaskStatus, TaskPriority
+from smart_scheduler.models.archive import TaskArchive
+from smart_scheduler.core.concurrency import VersionConflict, conflict, etag, parse_if_match
+from smart_scheduler.core.database import get_db, SessionLocal
+from smart_scheduler.core.writer import run_exclusive
+from smart_scheduler.core.serialization import (
+    FastJSONResponse, in_request_order, object_dict, parse_fields, parse_ids, row_dicts
+)
+from sqlalchemy import select
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/tasks", tags=["Tasks"])
 
+# Every column, in table order - the shape GET/PUT have always returned
+TASK_FIELDS = [column.key for column in Task.__table__.columns]
+
 class TaskUpdate(BaseModel):
     title: Optional[str]
     description: Optional[str]
@@ -27,37 +49,231 @@ class TaskUpdate(BaseModel):
     class Config:
         orm_mode = True
 
-@router.put("/{task_id}")
-def update_task(task_id: int, update: TaskUpdate, db: Session = Depends(get_db)):
+@router.get("")
+def list_tasks(
+    status: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    priority: Optional[str] = Query(None),
+    project_id: Optional[int] = Query(None),
+    tag: Optional[List[str]] = Query(None, description="Repeat for several tags"),
+    tag_mode: str = Query("any", description="any or all"),
+    limit: int = Query(100, ge=1, le=1000),
+    include_archived: bool = Query(False, description="Also list archived tasks, flagged archived=true"),
+    ids: Optional[str] = Query(None, description="Comma-separated ids: fetch exactly these tasks, in this order"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return; id is always included"),
+    db: Session = Depends(get_db)
+):
+    """List tasks, newest first, with optional filters.
+
+    With `ids` the filters are ignored and the response is
+    {"items": [...], "missing": [...]}: one entry per id, in request
+    order, null for ids that don't exist.
+    """
+    try:
+        status_filter = TaskStatus(status.lower()) if status else None
+        priority_filter = TaskPriority(priority.lower()) if priority else None
+        task_ids = parse_ids(ids) if ids is not None else None
+        columns = parse_fields(fields, TASK_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if tag_mode not in TAG_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid tag_mode: {tag_mode}")
+
+    if task_ids is not None:
+        # One IN query per table instead of a request per task
+        rows = overlay(row_dicts(db, columns, Task, select(Task).where(Task.id.in_(task_ids))))
+        if include_archived:
+            found = {row["id"] for row in rows}
+            archived_ids = [task_id for task_id in task_ids if task_id not in found]
+            archived_stmt = select(TaskArchive).where(TaskArchive.id.in_(archived_ids))
+            rows = with_archived(rows, row_dicts(db, columns, TaskArchive, archived_stmt), "id")
+        return FastJSONResponse(in_request_order(rows, task_ids))
+
     service = TaskService(db)
-    task = service.update_task(
-        task_id,
-        title=update.title,
-        description=update.description,
-        priority=update.priority,
-        category=update.category,
-        estimated_duration=update.estimated_duration,
-        due_date=update.due_date,
-        tags=update.tags,
-        scheduled_start_time=update.scheduled_start_time,
-        scheduled_end_time=update.scheduled_end_time,
-        project_id=update.project_id
+    stmt = service.tasks_statement(
+        status_filter, category, priority_filter, project_id, limit, tags=tag, tag_mode=tag_mode
     )
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    # Optionally update status and completed fields
-    if update.status:
-        task.status = update.status
+    # The merge with the archive orders by created_at, requested or not
+    query_columns = columns if "created_at" in columns or not include_archived else columns + ["created_at"]
+    rows = overlay(row_dicts(db, query_columns, Task, stmt))
+    if include_archived:
+        archived_stmt = service.tasks_statement(
+            status_filter, category, priority_filter, project_id, limit, tags=tag, tag_mode=tag_mode,
+            model=TaskArchive
+        )
+        rows = with_archived(rows, row_dicts(db, query_columns, TaskArchive, archived_stmt),
+                             "created_at", descending=True, limit=limit)
+        if query_columns is not columns:
+            for row in rows:
+                del row["created_at"]
+    return FastJSONResponse(rows)
+
+@router.get("/tags")
+def tag_cloud(limit: Optional[int] = Query(None, ge=1), db: Session = Depends(get_db)):
+    """Tag usage counts for a tag cloud, most used first"""
+    return FastJSONResponse(TagService(db).get_tag_cloud(limit))
+
+@router.get("/next")
+def next_tasks(
+    energy: int = Query(5, ge=1, le=5, description="Current energy level (1-5)"),
+    focus: int = Query(5, ge=1, le=5, description="Current focus level (1-5)"),
+    minutes: Optional[int] = Query(None, ge=1, description="Free time; only tasks that fit"),
+    limit: int = Query(5, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Best tasks to work on now, from the cached urgency ranking"""
+    return FastJSONResponse(RankingService(db).next_tasks(energy, focus, minutes, limit))
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Uploads larger than this are spooled to a temporary file instead of memory
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+@router.get("/export")
+def export_tasks(format: str = Query("ndjson", description="ndjson or csv")):
+    """Stream every task as NDJSON or CSV"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format: {format}")
+
+    def stream():
+        # The request-scoped session from get_db() is closed before a
+        # streaming body is sent, so the export owns its own session.
+        # Read-only: in WAL mode it never waits on (or holds up) the writer
+        db = SessionLocal()
+        try:
+            yield from TaskTransferService(db).export(format)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'}
+    )
+
+@router.post("/import")
+async def import_tasks(
+    request: Request,
+    format: str = Query("ndjson", description="ndjson or csv"),
+    skip: int = Query(0, ge=0, description="Records to skip, i.e. resume_from of an earlier run"),
+    chunk_size: int = Query(500, ge=1, le=10000)
+):
+    """Import tasks from an NDJSON or CSV request body in chunked transactions"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format: {format}")
+
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES) as upload:
+        async for chunk in request.stream():
+            upload.write(chunk)
+        upload.seek(0)
+
+        def run_import():
+            lines = io.TextIOWrapper(upload, encoding="utf-8", newline="")
+            records = parse_csv(lines) if format == "csv" else parse_ndjson(lines)
+            db = SessionLocal()
+            try:
+                return TaskTransferService(db).import_records(records, chunk_size=chunk_size, skip=skip)
+            finally:
+                db.close()
+
+        # Commits chunk by chunk on its own session, so not inside a writer batch
+        return await run_exclusive(run_import)
+
+@router.put("/{task_id}")
+def update_task(task_id: int, update: TaskUpdate, if_match: Optional[str] = Header(None),
+                db: Session = Depends(get_db)):
+    service = TaskService(db)
+    try:
+        task = service.update_task(
+            task_id,
+            expected_version=parse_if_match(if_match),
+            title=update.title,
+            description=update.description,
+            priority=update.priority,
+            category=update.category,
+            estimated_duration=update.estimated_duration,
+            due_date=update.due_date,
+            tags=update.tags,
+            scheduled_start_time=update.scheduled_start_time,
+            scheduled_end_time=update.scheduled_end_time,
+            project_id=update.project_id
+        )
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        # Optionally update status and completed fields
+        if update.status:
+            # Through the service so subtree rollups of the parents follow
+            try:
+                status = TaskStatus(update.status.lower())
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            # Still the version this request just wrote
+            task = service.update_task_status(task_id, status, expected_version=task.version)
+    except VersionConflict as e:
+        raise conflict(e)
     if update.completed is not None:
         task.completed = update.completed
     db.commit()
     db.refresh(task)
-    return task
+    return FastJSONResponse(object_dict(task, TASK_FIELDS), headers={"ETag": etag(task.version)})
+
+@router.get("/{task_id}/subtree")
+def get_subtree(task_id: int, db: Session = Depends(get_db)):
+    """The task and every subtask below it, loaded in one statement"""
+    rows = SubtaskService(db).get_subtree(task_id)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return FastJSONResponse(rows)
+
+@router.get("/{task_id}/sessions")
+def list_sessions(
+    task_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """The task's work sessions, newest first"""
+    return FastJSONResponse(WorkSessionService(db).get_task_sessions(task_id, limit))
+
+@router.get("/{task_id}/rollup")
+def get_rollup(task_id: int, db: Session = Depends(get_db)):
+    """Progress and duration totals for the task's whole subtree"""
+    task = TaskService(db).get_task_by_id(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return FastJSONResponse(SubtaskService(db).get_rollup(task))
+
+@router.patch("/{task_id}/move")
+def move_task(
+    task_id: int,
+    parent_id: Optional[int] = Query(None, description="New parent; omit to make it a top-level task"),
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Re-parent a task together with its subtree"""
+    try:
+        task = TaskService(db).move_task(task_id, parent_id, expected_version=parse_if_match(if_match))
+    except HierarchyError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except VersionConflict as e:
+        raise conflict(e)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return FastJSONResponse(object_dict(task, TASK_FIELDS), headers={"ETag": etag(task.version)})
+
+@router.patch("/{task_id}/progress")
+def set_progress(
+    task_id: int,
+    percentage: float = Query(..., ge=0, le=100),
+    db: Session = Depends(get_db)
+):
+    """Record progress; written behind, together with other progress and start/pause updates"""
+    if not ProgressService(db).set_progress(task_id, percentage):
+        raise HTTPException(status_code=404, detail="Task not found")
+    return {"task_id": task_id, "progress_percentage": percentage}
 
 @router.get("/{task_id}")
 def get_task(task_id: int, db: Session = Depends(get_db)):
-    service = TaskService(db)
-    task = service.get_task_by_id(task_id)
-    if not task:
+    rows = overlay(row_dicts(db, TASK_FIELDS, Task, select(Task).where(Task.id == task_id)))
+    if not rows:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task 
\ No newline at end of file
+    return FastJSONResponse(rows[0], headers={"ETag": etag(rows[0]["version"])}) 
\ No newline at end of file
@@ -0,0 +1,611 @@
+# smart_scheduler/cli/commands.py - Typer application behind the `scheduler` launcher
+#
+# Loaded only when a command actually needs Typer (see cli/main.py).
+# Keep module-level imports light: SQLAlchemy, models and services are
+# imported inside the commands that use them.
+import shlex
+import sys
+import time
+import typer
+import click
+from rich.panel import Panel
+from rich.prompt import Prompt, Confirm
+from typing import List, Optional
+
+from smart_scheduler.cli.main import APP_HELP, get_console, hello
+
+app = typer.Typer(help=APP_HELP)
+console = get_console()
+
+# One session per process, shared by every command (and reused by `shell`)
+_session = None
+# False while `shell` replays a script from stdin, so commands never block on prompts
+_interactive = True
+
+def get_session():
+    """Get the process-wide database session, opening it on first use"""
+    global _session
+    if _session is None:
+        from smart_scheduler.core.database import SessionLocal, ensure_schema
+
+        # Only commands that touch the database pay for the schema check
+        ensure_schema()
+        _session = SessionLocal()
+    return _session
+
+def get_task_service():
+    """Get task service with database session"""
+    from smart_scheduler.services.task_service import TaskService
+    return TaskService(get_session())
+
+def ask(prompt: str) -> str:
+    """Prompt for an optional value; empty when running a batch script"""
+    if not _interactive:
+        return ""
+    return Prompt.ask(prompt, default="")
+
+def confirm(prompt: str) -> bool:
+    """Ask for confirmation; with no terminal to ask on (batch scripts, pipes) the answer is no.
+
+    Commands that confirm take --yes for running unattended.
+    """
+    if not _interactive or not sys.stdin.isatty():
+        console.print("[yellow]Not confirmed: no terminal to ask on (pass --yes)[/yellow]")
+        return False
+    return Confirm.ask(prompt)
+
+app.command()(hello)
+
+@app.command()
+def add_task(
+    title: str = typer.Argument(..., help="Task title"),
+    description: Optional[str] = typer.Option(None, "--desc", "-d", help="Task description"),
+    priority: str = typer.Option("medium", "--priority", "-p", help="Priority: low, medium, high, urgent"),
+    category: Optional[str] = typer.Option(None, "--category", "-c", help="Task category"),
+    duration: Optional[int] = typer.Option(None, "--duration", help="Estimated duration in minutes"),
+    tags: Optional[str] = typer.Option(None, "--tags", help="Comma-separated tags")
+):
+    """📝 Add a new task"""
+    from smart_scheduler.models.task import TaskPriority
+    
+    # Interactive prompts if not provided
+    if not description:
+        description = ask("Enter task description (optional)")
+        if not description:
+            description = None
+    
+    if not category:
+        category = ask("Enter category (optional)")
+        if not category:
+            category = None
+    
+    if not duration:
+        duration_input = ask("Estimated duration in minutes (optional)")
+        if duration_input:
+            try:
+                duration = int(duration_input)
+            except ValueError:
+                duration = None
+    
+    try:
+        # Convert string priority to enum
+        priority_enum = TaskPriority(priority.lower())
+    except ValueError:
+        console.print(f"[red]Invalid priority: {priority}. Using 'medium' instead.[/red]")
+        priority_enum = TaskPriority.MEDIUM
+    
+    # Create task in database
+    task_service = get_task_service()
+    task = task_service.create_task(
+        title=title,
+        description=description,
+        priority=priority_enum,
+        category=category,
+        estimated_duration=duration,
+        tags=tags
+    )
+    
+    console.print(Panel(
+        f"[bold green]✅ Task Created![/bold green]\n\n"
+        f"[bold]ID:[/bold] {task.id}\n"
+        f"[bold]Title:[/bold] {task.title}\n"
+        f"[bold]Description:[/bold] {task.description or 'None'}\n"
+        f"[bold]Priority:[/bold] {task.priority.value}\n"
+        f"[bold]Category:[/bold] {task.category or 'None'}\n"
+        f"[bold]Duration:[/bold] {task.estimated_duration or 'Not specified'} minutes",
+        title="New Task",
+        border_style="green"
+    ))
+
+@app.command()
+def list_tasks(
+    status: Optional[str] = typer.Option(None, "--status", "-s", help="Filter by status"),
+    category: Optional[str] = typer.Option(None, "--category", "-c", help="Filter by category"),
+    priority: Optional[str] = typer.Option(None, "--priority", "-p", help="Filter by priority"),
+    tag: Optional[List[str]] = typer.Option(None, "--tag", "-t", help="Filter by tag (repeatable)"),
+    all_tags: bool = typer.Option(False, "--all-tags", help="Require every --tag instead of any")
+):
+    """📋 List tasks"""
+    from rich.table import Table
+    from smart_scheduler.models.task import TaskPriority, TaskStatus
+    
+    task_service = get_task_service()
+    
+    # Convert string filters to enums
+    status_filter = None
+    if status:
+        try:
+            status_filter = TaskStatus(status.lower())
+        except ValueError:
+            console.print(f"[red]Invalid status: {status}[/red]")
+            return
+    
+    priority_filter = None
+    if priority:
+        try:
+            priority_filter = TaskPriority(priority.lower())
+        except ValueError:
+            console.print(f"[red]Invalid priority: {priority}[/red]")
+            return
+    
+    tasks = task_service.get_tasks(
+        status=status_filter,
+        category=category,
+        priority=priority_filter,
+        tags=tag,
+        tag_mode="all" if all_tags else "any"
+    )
+    
+    if not tasks:
+        console.print("[yellow]No tasks found![/yellow]")
+        return
+    
+    table = Table(title="📋 Your Tasks")
+    table.add_column("ID", style="cyan", width=4)
+    table.add_column("Title", style="bold")
+    table.add_column("Status", style="green")
+    table.add_column("Priority", style="yellow")
+    table.add_column("Category", style="blue")
+    table.add_column("Duration", style="magenta")
+    table.add_column("Created", style="dim")
+    
+    for task in tasks:
+        table.add_row(
+            str(task.id),
+            task.title,
+            task.status.value,
+            task.priority.value,
+            task.category or "-",
+            f"{task.estimated_duration}m" if task.estimated_duration else "-",
+            task.created_at.strftime("%m/%d %H:%M")
+        )
+    
+    console.print(table)
+
+@app.command()
+def complete_task(
+    task_id: int = typer.Argument(..., help="Task ID to complete"),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Don't ask for confirmation")
+):
+    """✅ Mark task as completed"""
+    from smart_scheduler.models.task import TaskStatus
+    
+    task_service = get_task_service()
+    task = task_service.get_task_by_id(task_id)
+    
+    if not task:
+        console.print(f"[red]Task #{task_id} not found![/red]")
+        return
+    
+    if task.status == TaskStatus.COMPLETED:
+        console.print(f"[yellow]Task #{task_id} is already completed![/yellow]")
+        return
+    
+    if yes or confirm(f"Mark task '{task.title}' as completed?"):
+        updated_task = task_service.update_task_status(task_id, TaskStatus.COMPLETED)
+        console.print(f"[bold green]✅ Task #{task_id} marked as completed![/bold green]")
+    else:
+        console.print("[yellow]Operation cancelled[/yellow]")
+
+@app.command()
+def delete_task(
+    task_id: int = typer.Argument(..., help="Task ID to delete"),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Don't ask for confirmation")
+):
+    """🗑️ Delete a task"""
+    
+    task_service = get_task_service()
+    task = task_service.get_task_by_id(task_id)
+    
+    if not task:
+        console.print(f"[red]Task #{task_id} not found![/red]")
+        return
+    
+    if yes or confirm(f"[bold red]Delete task '{task.title}'? This cannot be undone![/bold red]"):
+        success = task_service.delete_task(task_id)
+        if success:
+            console.print(f"[bold red]🗑️ Task #{task_id} deleted![/bold red]")
+        else:
+            console.print(f"[red]Failed to delete task #{task_id}[/red]")
+    else:
+        console.print("[yellow]Operation cancelled[/yellow]")
+
+@app.command()
+def status():
+    """📊 Show current system status"""
+    
+    task_service = get_task_service()
+    stats = task_service.get_task_stats()
+    
+    console.print(Panel(
+        f"[bold green]✅ System Status[/bold green]\n\n"
+        f"📋 Total Tasks: {stats['total']}\n"
+        f"✅ Completed: {stats['completed']}\n"
+        f"⏳ In Progress: {stats['in_progress']}\n"
+        f"📅 Pending: {stats['pending']}\n"
+        f"🎯 Completion Rate: {stats['completion_rate']}%",
+        title="Status",
+        border_style="green"
+    ))
+
+@app.command()
+def show_task(task_id: int = typer.Argument(..., help="Task ID to show")):
+    """👁️ Show detailed task information"""
+    
+    task_service = get_task_service()
+    task = task_service.get_task_by_id(task_id)
+    
+    if not task:
+        console.print(f"[red]Task #{task_id} not found![/red]")
+        return
+    
+    console.print(Panel(
+        f"[bold blue]📝 Task Details[/bold blue]\n\n"
+        f"[bold]ID:[/bold] {task.id}\n"
+        f"[bold]Title:[/bold] {task.title}\n"
+        f"[bold]Description:[/bold] {task.description or 'None'}\n"
+        f"[bold]Status:[/bold] {task.status.value}\n"
+        f"[bold]Priority:[/bold] {task.priority.value}\n"
+        f"[bold]Category:[/bold] {task.category or 'None'}\n"
+        f"[bold]Duration:[/bold] {task.estimated_duration or 'Not specified'} minutes\n"
+        f"[bold]Progress:[/bold] {task.progress_percentage}%\n"
+        f"[bold]Created:[/bold] {task.created_at.strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"[bold]Updated:[/bold] {task.updated_at.strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"[bold]Completed:[/bold] {task.completed_at.strftime('%Y-%m-%d %H:%M:%S') if task.completed_at else 'Not completed'}",
+        title=f"Task #{task.id}",
+        border_style="blue"
+    ))
+
+@app.command("export")
+def export_tasks(
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="File to write (default: stdout)"),
+    format: Optional[str] = typer.Option(None, "--format", "-f", help="ndjson or csv (default: from file extension)"),
+    batch_size: int = typer.Option(1000, "--batch-size", help="Rows fetched per round trip")
+):
+    """📤 Export all tasks as NDJSON or CSV"""
+    from smart_scheduler.services.task_transfer_service import TaskTransferService, guess_format
+
+    format = format or guess_format(output)
+    service = TaskTransferService(get_session())
+    try:
+        chunks = service.export(format, batch_size=batch_size)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
+    if output is None:
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+        return
+
+    count = 0
+    with open(output, "w", encoding="utf-8", newline="") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            count += 1
+    rows = count - 1 if format == "csv" else count
+    console.print(f"[bold green]📤 Exported {rows} tasks to {output}[/bold green]")
+
+@app.command("import")
+def import_tasks(
+    path: str = typer.Argument(..., help="NDJSON or CSV file to import"),
+    format: Optional[str] = typer.Option(None, "--format", "-f", help="ndjson or csv (default: from file extension)"),
+    chunk_size: int = typer.Option(500, "--chunk-size", help="Records committed per transaction"),
+    resume: bool = typer.Option(True, "--resume/--restart", help="Continue from the last committed chunk of an interrupted import")
+):
+    """📥 Import tasks from NDJSON or CSV"""
+    import os
+    from smart_scheduler.services.task_transfer_service import (
+        TaskTransferService, guess_format, parse_csv, parse_ndjson
+    )
+
+    format = format or guess_format(path)
+    if format not in ("ndjson", "csv"):
+        console.print(f"[red]Unsupported import format: {format}[/red]")
+        raise typer.Exit(1)
+
+    # Committed position is checkpointed next to the input file
+    progress_path = f"{path}.progress"
+    skip = 0
+    if resume and os.path.exists(progress_path):
+        with open(progress_path) as f:
+            skip = int(f.read().strip() or 0)
+        console.print(f"[yellow]Resuming after record {skip}[/yellow]")
+
+    def checkpoint(progress):
+        with open(progress_path, "w") as f:
+            f.write(str(progress["resume_from"]))
+        console.print(f"[dim]… {progress['resume_from']} records processed[/dim]")
+
+    with open(path, encoding="utf-8", newline="") as f:
+        records = parse_csv(f) if format == "csv" else parse_ndjson(f)
+        result = TaskTransferService(get_session()).import_records(
+            records, chunk_size=chunk_size, skip=skip, on_progress=checkpoint
+        )
+
+    os.remove(progress_path)
+    for error in result["errors"]:
+        console.print(f"[red]Record {error['record']}: {error['error']}[/red]")
+    console.print(
+        f"[bold green]📥 Imported {result['imported']} tasks[/bold green]"
+        f" ({result['failed']} failed, {result['skipped']} skipped)"
+    )
+
+@app.command()
+def search(
+    query: str = typer.Argument(..., help="Words to search for"),
+    type: Optional[str] = typer.Option(None, "--type", "-t", help="Only search task, deadline or project"),
+    limit: int = typer.Option(20, "--limit", "-n", help="Results per page"),
+    page: int = typer.Option(1, "--page", help="Page number")
+):
+    """🔍 Full-text search across tasks, deadlines and projects"""
+    from rich.table import Table
+    from smart_scheduler.services.search_service import SearchService, SEARCH_TYPES
+
+    if type and type not in SEARCH_TYPES:
+        console.print(f"[red]Invalid type: {type}[/red]")
+        return
+
+    result = SearchService(get_session()).search(
+        query, types=[type] if type else None, limit=limit, offset=(page - 1) * limit
+    )
+    if not result["results"]:
+        console.print("[yellow]No matches found![/yellow]")
+        return
+
+    table = Table(title=f"🔍 Results for '{query}'")
+    table.add_column("Type", style="blue")
+    table.add_column("ID", style="cyan", width=6)
+    table.add_column("Title", style="bold")
+    table.add_column("Match", style="dim")
+    for item in result["results"]:
+        table.add_row(item["type"], str(item["id"]), item["title"], item["snippet"] or "-")
+    console.print(table)
+    if result["has_more"]:
+        console.print(f"[dim]More results: --page {page + 1}[/dim]")
+
+@app.command()
+def forecast():
+    """🔮 Forecast completion dates for all open projects"""
+    from rich.table import Table
+    from smart_scheduler.services.forecast_service import ForecastService, reset_model
+
+    db = get_session()
+    reset_model()  # a batch run always relearns from the full history
+    service = ForecastService(db)
+    forecasts = service.forecast()
+    db.commit()
+
+    model = service.get_model_summary()
+    console.print(
+        f"[dim]Throughput: {model['daily_throughput_minutes']} min/day, "
+        f"actual/estimated: {model['global_ratio']}x[/dim]"
+    )
+    if not forecasts:
+        console.print("[yellow]No open projects with open tasks[/yellow]")
+        return
+
+    from smart_scheduler.models.project import Project
+    names = dict(db.query(Project.id, Project.name).filter(Project.id.in_(forecasts)).all())
+    table = Table(title="🔮 Project forecasts")
+    table.add_column("ID", style="cyan", width=6)
+    table.add_column("Project", style="bold")
+    table.add_column("Estimated completion", style="green")
+    for project_id, when in sorted(forecasts.items(), key=lambda item: item[1]):
+        table.add_row(str(project_id), names.get(project_id, "-"), when.strftime("%Y-%m-%d %H:%M"))
+    console.print(table)
+
+@app.command()
+def rollup():
+    """⏱️ Fold finished work sessions into actual durations and daily totals"""
+    from smart_scheduler.services.work_session_service import WorkSessionService
+
+    folded = WorkSessionService(get_session()).rollup()
+    console.print(f"[green]✅ Rolled up {folded} work sessions[/green]")
+
+@app.command()
+def rebuild_workload():
+    """🗓️ Recompute the daily workload rollups behind the calendar heatmap"""
+    from smart_scheduler.services.workload_service import rebuild_daily_load
+
+    db = get_session()
+    buckets = rebuild_daily_load(db.connection())
+    db.commit()
+    console.print(f"[green]✅ Rebuilt {buckets} daily workload buckets[/green]")
+
+@app.command()
+def compact_changes(
+    retention_days: Optional[int] = typer.Option(None, "--retention-days", help="Default: CHANGE_LOG_RETENTION_DAYS setting")
+):
+    """🧹 Drop old delete tombstones from the sync change log"""
+    from smart_scheduler.core.config import settings
+    from smart_scheduler.services.sync_service import SyncService
+
+    db = get_session()
+    removed = SyncService(db).compact(settings.change_log_retention_days if retention_days is None else retention_days)
+    db.commit()
+    console.print(f"[green]✅ Removed {removed} tombstones[/green]")
+
+@app.command()
+def archive(
+    days: Optional[int] = typer.Option(None, "--days", help="Finished more than this many days ago (default: ARCHIVE_AFTER_DAYS setting)"),
+    batch_size: Optional[int] = typer.Option(None, "--batch-size", help="Items moved per transaction (default: ARCHIVE_BATCH_SIZE setting)")
+):
+    """🗄️ Move long-finished tasks and deadlines to the archive tables"""
+    from smart_scheduler.core.config import settings
+    from smart_scheduler.services.archive_service import ArchiveService
+
+    def report(totals):
+        console.print(f"[dim]… {totals['tasks']} tasks, {totals['deadlines']} deadlines archived[/dim]")
+
+    service = ArchiveService(get_session())
+    moved = service.archive(
+        settings.archive_after_days if days is None else days,
+        settings.archive_batch_size if batch_size is None else batch_size,
+        on_batch=report,
+    )
+    stored = service.get_archive_counts()
+    console.print(
+        f"[green]✅ Archived {moved['tasks']} tasks and {moved['deadlines']} deadlines[/green]"
+        f" ({stored['tasks']} tasks, {stored['deadlines']} deadlines in the archive)"
+    )
+
+@app.command()
+def backup(
+    directory: Optional[str] = typer.Option(None, "--dir", "-d", help="Backup directory (default: BACKUP_DIR setting)"),
+    compress: bool = typer.Option(False, "--compress/--no-compress", help="gzip the backup"),
+    keep: Optional[int] = typer.Option(None, "--keep", help="Newest backups to keep, 0 for all (default: BACKUP_KEEP setting)"),
+    list_only: bool = typer.Option(False, "--list", help="List existing backups instead")
+):
+    """💾 Back up the database while the server keeps running"""
+    from rich.table import Table
+    from smart_scheduler.core.backup import BackupError, create_backup, list_backups
+
+    if list_only:
+        table = Table(title="Backups")
+        table.add_column("Path")
+        table.add_column("Size", justify="right")
+        table.add_column("Created (UTC)")
+        for item in list_backups(directory):
+            table.add_row(item["path"], f"{item['bytes'] / 1e6:.1f} MB", item["created_at"].strftime("%Y-%m-%d %H:%M:%S"))
+        console.print(table)
+        return
+
+    last_report = [time.perf_counter()]
+
+    def report(done, total):
+        # At most one progress line a second
+        if total and time.perf_counter() - last_report[0] >= 1:
+            last_report[0] = time.perf_counter()
+            console.print(f"[dim]… {done}/{total} pages ({done / total:.0%})[/dim]")
+
+    try:
+        result = create_backup(directory, compress=compress, keep=keep, on_progress=report)
+    except BackupError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    console.print(
+        f"[bold green]💾 Backed up to {result['path']}[/bold green] "
+        f"({result['bytes'] / 1e6:.1f} MB in {result['seconds']}s, {result['restarts']} restarts, "
+        f"integrity {result['integrity']})"
+    )
+    for path in result["removed"]:
+        console.print(f"[dim]Removed old backup {path}[/dim]")
+
+@app.command()
+def restore(
+    path: str = typer.Argument(..., help="Backup file (.db or .db.gz)"),
+    snapshot: bool = typer.Option(True, "--snapshot/--no-snapshot", help="Back up the current database first"),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Don't ask for confirmation")
+):
+    """♻️ Restore the database from a verified backup"""
+    from smart_scheduler.core.backup import BackupError, restore_backup
+
+    if not yes and not confirm(f"Replace the current database with {path}?"):
+        console.print("[yellow]Restore cancelled[/yellow]")
+        return
+    try:
+        result = restore_backup(path, snapshot_current=snapshot)
+    except BackupError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    console.print(f"[bold green]♻️ Restored {result['database']} from {path}[/bold green] (integrity {result['integrity']})")
+    if result["previous_database_snapshot"]:
+        console.print(f"[dim]Previous database saved to {result['previous_database_snapshot']}[/dim]")
+    console.print("[yellow]Restart the server so it drops data cached from the old database[/yellow]")
+
+def run_shell_line(line: str, timing: bool = True) -> bool:
+    """Run one shell line as a CLI command; returns False when the shell should exit"""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return True
+    if line in ("exit", "quit"):
+        return False
+
+    try:
+        args = shlex.split(line)
+    except ValueError as e:
+        console.print(f"[red]Parse error: {e}[/red]")
+        return True
+
+    if args[0] == "shell":
+        console.print("[yellow]Already in the shell[/yellow]")
+        return True
+
+    started = time.perf_counter()
+    try:
+        app(args=args, prog_name="scheduler", standalone_mode=False)
+    except click.ClickException as e:
+        e.show()
+    except (click.Abort, EOFError):
+        console.print("[yellow]Operation cancelled[/yellow]")
+    except SystemExit:
+        # --help and friends exit through click's standalone handling
+        pass
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+    finally:
+        # End the transaction so other writers aren't blocked by our snapshot
+        # and the next command sees fresh rows; the session itself stays open
+        if _session is not None:
+            _session.rollback()
+
+    if timing:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        console.print(f"[dim]⏱ {elapsed_ms:.1f} ms[/dim]")
+    return True
+
+@app.command()
+def shell(
+    timing: bool = typer.Option(True, "--timing/--no-timing", help="Print how long each command took")
+):
+    """🐚 Interactive shell that reuses one database session
+
+    Runs any scheduler command without paying interpreter and import
+    startup each time. Pipe a script to run it as a batch, e.g.
+    `scheduler shell < triage.txt` (one command per line, # for comments).
+    """
+    global _interactive
+    _interactive = sys.stdin.isatty()
+
+    # Open the engine and session up front so the first command is warm too
+    get_session()
+
+    if _interactive:
+        console.print("[bold blue]Smart Scheduler shell[/bold blue] [dim]- 'help' for commands, 'exit' to quit[/dim]")
+        while True:
+            try:
+                line = console.input("[bold]scheduler>[/bold] ")
+            except (EOFError, KeyboardInterrupt):
+                console.print()
+                break
+            if line.strip() == "help":
+                line = "--help"
+            if not run_shell_line(line, timing=timing):
+                break
+    else:
+        for line in sys.stdin:
+            if not run_shell_line(line, timing=timing):
+                break
+
+    _session.close()
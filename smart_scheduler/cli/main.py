@@ -1,30 +1,48 @@
-import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.prompt import Prompt, Confirm
-from typing import Optional
-from datetime import datetime
+# smart_scheduler/cli/main.py - `scheduler` entry point
+#
+# Importing Typer pulls in Click and most of Rich, which costs more than the
+# rest of a `--help` or `hello` invocation combined. This launcher answers
+# those directly and only loads the Typer app (cli/commands.py) for commands
+# that need it.
+import sys
+from functools import lru_cache
 
-from smart_scheduler.core.database import get_db, create_tables
-from smart_scheduler.services.task_service import TaskService
-from smart_scheduler.models.task import TaskPriority, TaskStatus
+APP_HELP = "🚀 Smart Study Scheduler - Your AI-powered personal assistant"
 
-app = typer.Typer(help="🚀 Smart Study Scheduler - Your AI-powered personal assistant")
-console = Console()
+# Top-level command listing for the fast `--help` path.
+# Keep in sync with the commands registered in cli/commands.py.
+COMMANDS = {
+    "hello": "👋 Welcome message and status check",
+    "add-task": "📝 Add a new task",
+    "list-tasks": "📋 List tasks",
+    "complete-task": "✅ Mark task as completed",
+    "delete-task": "🗑️ Delete a task",
+    "status": "📊 Show current system status",
+    "show-task": "👁️ Show detailed task information",
+    "shell": "🐚 Interactive shell that reuses one database session",
+    "export": "📤 Export all tasks as NDJSON or CSV",
+    "import": "📥 Import tasks from NDJSON or CSV",
+    "search": "🔍 Full-text search across tasks, deadlines and projects",
+    "forecast": "🔮 Forecast completion dates for all open projects",
+    "rollup": "⏱️ Fold finished work sessions into actual durations and daily totals",
+    "rebuild-workload": "🗓️ Recompute the daily workload rollups behind the calendar heatmap",
+    "compact-changes": "🧹 Drop old delete tombstones from the sync change log",
+    "archive": "🗄️ Move long-finished tasks and deadlines to the archive tables",
+    "backup": "💾 Back up the database while the server keeps running",
+    "restore": "♻️ Restore the database from a verified backup",
+}
 
-# Initialize database on first import
-create_tables()
+@lru_cache(maxsize=None)
+def get_console():
+    """Shared Rich console, created on first use"""
+    from rich.console import Console
+    return Console()
 
-def get_task_service():
-    """Get task service with database session"""
-    db = next(get_db())
-    return TaskService(db)
-
-@app.command()
 def hello():
     """👋 Welcome message and status check"""
-    console.print(Panel.fit(
+    from rich.panel import Panel
+
+    get_console().print(Panel.fit(
         "[bold blue]Smart Study Scheduler[/bold blue]\n"
         "[dim]Your AI-powered personal assistant[/dim]\n\n"
         "🚀 Ready to boost your productivity!",
@@ -32,209 +50,35 @@ def hello():
         border_style="blue"
     ))
 
-@app.command()
-def add_task(
-    title: str = typer.Argument(..., help="Task title"),
-    description: Optional[str] = typer.Option(None, "--desc", "-d", help="Task description"),
-    priority: str = typer.Option("medium", "--priority", "-p", help="Priority: low, medium, high, urgent"),
-    category: Optional[str] = typer.Option(None, "--category", "-c", help="Task category"),
-    duration: Optional[int] = typer.Option(None, "--duration", help="Estimated duration in minutes")
-):
-    """📝 Add a new task"""
-    
-    # Interactive prompts if not provided
-    if not description:
-        description = Prompt.ask("Enter task description (optional)", default="")
-        if not description:
-            description = None
-    
-    if not category:
-        category = Prompt.ask("Enter category (optional)", default="")
-        if not category:
-            category = None
-    
-    if not duration:
-        duration_input = Prompt.ask("Estimated duration in minutes (optional)", default="")
-        if duration_input:
-            try:
-                duration = int(duration_input)
-            except ValueError:
-                duration = None
-    
-    try:
-        # Convert string priority to enum
-        priority_enum = TaskPriority(priority.lower())
-    except ValueError:
-        console.print(f"[red]Invalid priority: {priority}. Using 'medium' instead.[/red]")
-        priority_enum = TaskPriority.MEDIUM
-    
-    # Create task in database
-    task_service = get_task_service()
-    task = task_service.create_task(
-        title=title,
-        description=description,
-        priority=priority_enum,
-        category=category,
-        estimated_duration=duration
-    )
-    
-    console.print(Panel(
-        f"[bold green]✅ Task Created![/bold green]\n\n"
-        f"[bold]ID:[/bold] {task.id}\n"
-        f"[bold]Title:[/bold] {task.title}\n"
-        f"[bold]Description:[/bold] {task.description or 'None'}\n"
-        f"[bold]Priority:[/bold] {task.priority.value}\n"
-        f"[bold]Category:[/bold] {task.category or 'None'}\n"
-        f"[bold]Duration:[/bold] {task.estimated_duration or 'Not specified'} minutes",
-        title="New Task",
-        border_style="green"
-    ))
+def print_help():
+    """Print the top-level usage without loading Typer"""
+    width = max(len(name) for name in COMMANDS) + 2
+    lines = [
+        "Usage: scheduler [OPTIONS] COMMAND [ARGS]...",
+        "",
+        f"  {APP_HELP}",
+        "",
+        "Options:",
+        f"  {'--help':<{width}}Show this message and exit.",
+        "",
+        "Commands:",
+    ]
+    lines += [f"  {name:<{width}}{help_text}" for name, help_text in COMMANDS.items()]
+    print("\n".join(lines))
 
-@app.command()
-def list_tasks(
-    status: Optional[str] = typer.Option(None, "--status", "-s", help="Filter by status"),
-    category: Optional[str] = typer.Option(None, "--category", "-c", help="Filter by category"),
-    priority: Optional[str] = typer.Option(None, "--priority", "-p", help="Filter by priority")
-):
-    """📋 List tasks"""
-    
-    task_service = get_task_service()
-    
-    # Convert string filters to enums
-    status_filter = None
-    if status:
-        try:
-            status_filter = TaskStatus(status.lower())
-        except ValueError:
-            console.print(f"[red]Invalid status: {status}[/red]")
-            return
-    
-    priority_filter = None
-    if priority:
-        try:
-            priority_filter = TaskPriority(priority.lower())
-        except ValueError:
-            console.print(f"[red]Invalid priority: {priority}[/red]")
-            return
-    
-    tasks = task_service.get_tasks(
-        status=status_filter,
-        category=category,
-        priority=priority_filter
-    )
-    
-    if not tasks:
-        console.print("[yellow]No tasks found![/yellow]")
-        return
-    
-    table = Table(title="📋 Your Tasks")
-    table.add_column("ID", style="cyan", width=4)
-    table.add_column("Title", style="bold")
-    table.add_column("Status", style="green")
-    table.add_column("Priority", style="yellow")
-    table.add_column("Category", style="blue")
-    table.add_column("Duration", style="magenta")
-    table.add_column("Created", style="dim")
-    
-    for task in tasks:
-        table.add_row(
-            str(task.id),
-            task.title,
-            task.status.value,
-            task.priority.value,
-            task.category or "-",
-            f"{task.estimated_duration}m" if task.estimated_duration else "-",
-            task.created_at.strftime("%m/%d %H:%M")
-        )
-    
-    console.print(table)
+def app(args=None):
+    """Run the CLI, loading Typer only when a command needs it"""
+    args = sys.argv[1:] if args is None else list(args)
 
-@app.command()
-def complete_task(task_id: int = typer.Argument(..., help="Task ID to complete")):
-    """✅ Mark task as completed"""
-    
-    task_service = get_task_service()
-    task = task_service.get_task_by_id(task_id)
-    
-    if not task:
-        console.print(f"[red]Task #{task_id} not found![/red]")
-        return
-    
-    if task.status == TaskStatus.COMPLETED:
-        console.print(f"[yellow]Task #{task_id} is already completed![/yellow]")
+    if args in ([], ["--help"]):
+        print_help()
         return
-    
-    if Confirm.ask(f"Mark task '{task.title}' as completed?"):
-        updated_task = task_service.update_task_status(task_id, TaskStatus.COMPLETED)
-        console.print(f"[bold green]✅ Task #{task_id} marked as completed![/bold green]")
-    else:
-        console.print("[yellow]Operation cancelled[/yellow]")
-
-@app.command()
-def delete_task(task_id: int = typer.Argument(..., help="Task ID to delete")):
-    """🗑️ Delete a task"""
-    
-    task_service = get_task_service()
-    task = task_service.get_task_by_id(task_id)
-    
-    if not task:
-        console.print(f"[red]Task #{task_id} not found![/red]")
+    if args == ["hello"]:
+        hello()
         return
-    
-    if Confirm.ask(f"[bold red]Delete task '{task.title}'? This cannot be undone![/bold red]"):
-        success = task_service.delete_task(task_id)
-        if success:
-            console.print(f"[bold red]🗑️ Task #{task_id} deleted![/bold red]")
-        else:
-            console.print(f"[red]Failed to delete task #{task_id}[/red]")
-    else:
-        console.print("[yellow]Operation cancelled[/yellow]")
 
-@app.command()
-def status():
-    """📊 Show current system status"""
-    
-    task_service = get_task_service()
-    stats = task_service.get_task_stats()
-    
-    console.print(Panel(
-        f"[bold green]✅ System Status[/bold green]\n\n"
-        f"📋 Total Tasks: {stats['total']}\n"
-        f"✅ Completed: {stats['completed']}\n"
-        f"⏳ In Progress: {stats['in_progress']}\n"
-        f"📅 Pending: {stats['pending']}\n"
-        f"🎯 Completion Rate: {stats['completion_rate']}%",
-        title="Status",
-        border_style="green"
-    ))
-
-@app.command()
-def show_task(task_id: int = typer.Argument(..., help="Task ID to show")):
-    """👁️ Show detailed task information"""
-    
-    task_service = get_task_service()
-    task = task_service.get_task_by_id(task_id)
-    
-    if not task:
-        console.print(f"[red]Task #{task_id} not found![/red]")
-        return
-    
-    console.print(Panel(
-        f"[bold blue]📝 Task Details[/bold blue]\n\n"
-        f"[bold]ID:[/bold] {task.id}\n"
-        f"[bold]Title:[/bold] {task.title}\n"
-        f"[bold]Description:[/bold] {task.description or 'None'}\n"
-        f"[bold]Status:[/bold] {task.status.value}\n"
-        f"[bold]Priority:[/bold] {task.priority.value}\n"
-        f"[bold]Category:[/bold] {task.category or 'None'}\n"
-        f"[bold]Duration:[/bold] {task.estimated_duration or 'Not specified'} minutes\n"
-        f"[bold]Progress:[/bold] {task.progress_percentage}%\n"
-        f"[bold]Created:[/bold] {task.created_at.strftime('%Y-%m-%d %H:%M:%S')}\n"
-        f"[bold]Updated:[/bold] {task.updated_at.strftime('%Y-%m-%d %H:%M:%S')}\n"
-        f"[bold]Completed:[/bold] {task.completed_at.strftime('%Y-%m-%d %H:%M:%S') if task.completed_at else 'Not completed'}",
-        title=f"Task #{task.id}",
-        border_style="blue"
-    ))
+    from smart_scheduler.cli.commands import app as typer_app
+    typer_app(args=args, prog_name="scheduler")
 
 if __name__ == "__main__":
     app()
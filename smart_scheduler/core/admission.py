@@ -0,0 +1,154 @@
+# smart_scheduler/core/admission.py - Admission control and load shedding
+#
+# Requests are sorted into route classes, each with its own limit on
+# concurrent requests and a bounded queue in front of it. A request that
+# finds the queue full - or waits in it longer than the timeout - gets an
+# immediate 503 with Retry-After instead of adding to the pile in
+# uvicorn's threadpool. The classes' limits together stay below the
+# threadpool size, and health and notification endpoints have a class of
+# their own, so a burst of page renders can't starve them.
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from fastapi.responses import JSONResponse
+
+from smart_scheduler.core.config import settings
+
+# Served without admission control (static assets, API docs)
+EXEMPT_PREFIXES = ("/static", "/docs", "/redoc", "/openapi.json")
+# Cheap and time-sensitive: never stuck behind the other classes
+CRITICAL_PREFIXES = ("/api/health", "/api/notifications")
+# Whole-table reads, page renders, imports and exports
+HEAVY_PREFIXES = (
+    "/api/schedule", "/api/reports", "/api/projects/forecast", "/api/sync",
+    "/api/tasks/export", "/api/tasks/import", "/api/admin",
+)
+HEAVY_PAGES = {"/", "/tasks", "/schedule", "/projects"}
+
+class RouteClass:
+    """Concurrency limit plus a bounded FIFO queue for one class of routes"""
+
+    def __init__(self, name: str, limit: int, queue_size: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.active = 0
+        self.waiters: deque = deque()
+        # Metrics
+        self.admitted = 0
+        self.rejected = 0   # queue full
+        self.timed_out = 0  # waited too long
+        self.max_active = 0
+        self.max_waiting = 0
+        self.wait_seconds = 0.0
+
+    async def acquire(self, timeout: float) -> bool:
+        """Take a slot, waiting up to `timeout` seconds; False means shed the request"""
+        if self.active < self.limit and not self.waiters:
+            self._admit()
+            return True
+        if len(self.waiters) >= self.queue_size:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self.max_waiting = max(self.max_waiting, len(self.waiters))
+        started = time.perf_counter()
+        try:
+            # release() hands its slot straight to the first waiter
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            return False
+        except BaseException:
+            # Client went away: give back a slot that was handed over meanwhile
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+        self.wait_seconds += time.perf_counter() - started
+        self.admitted += 1
+        return True
+
+    def _admit(self):
+        self.active += 1
+        self.admitted += 1
+        self.max_active = max(self.max_active, self.active)
+
+    def release(self):
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)  # the slot moves on, `active` is unchanged
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict:
+        return {
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "active": self.active,
+            "waiting": len(self.waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "max_active": self.max_active,
+            "max_waiting": self.max_waiting,
+            "average_wait_ms": round(1000 * self.wait_seconds / self.admitted, 2) if self.admitted else 0.0,
+        }
+
+class AdmissionController:
+    """The route classes and which class a request belongs to"""
+
+    def __init__(self):
+        self.classes = {
+            "critical": RouteClass("critical", settings.admission_critical_limit, settings.admission_critical_queue),
+            "default": RouteClass("default", settings.admission_default_limit, settings.admission_default_queue),
+            "heavy": RouteClass("heavy", settings.admission_heavy_limit, settings.admission_heavy_queue),
+        }
+
+    def classify(self, path: str) -> Optional[RouteClass]:
+        """The request's class, or None for exempt paths"""
+        if path.startswith(EXEMPT_PREFIXES):
+            return None
+        if path.startswith(CRITICAL_PREFIXES):
+            return self.classes["critical"]
+        if path in HEAVY_PAGES or path.startswith(HEAVY_PREFIXES) or path.endswith("/critical-path"):
+            return self.classes["heavy"]
+        return self.classes["default"]
+
+    def stats(self) -> Dict[str, Dict]:
+        return {name: route_class.stats() for name, route_class in self.classes.items()}
+
+admission = AdmissionController()
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware, so streaming responses keep their slot until fully sent"""
+
+    def __init__(self, app, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        route_class = self.controller.classify(scope["path"]) if scope["type"] == "http" else None
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await route_class.acquire(settings.admission_queue_timeout_seconds):
+            response = JSONResponse(
+                {"detail": f"Server busy ({route_class.name} requests), retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(settings.admission_retry_after_seconds)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route_class.release()
@@ -0,0 +1,249 @@
+# smart_scheduler/core/backup.py - Online backups and restore for the SQLite database
+#
+# Copying the database file while the server writes can capture a torn
+# state. SQLite's online backup API copies a consistent snapshot instead.
+# With a rollback journal it goes `step_pages` pages at a time: the source
+# is only read-locked during a step, so writers get in between steps. A
+# write from another connection makes SQLite restart the copy, though, and
+# if that keeps happening the rest is copied in one step, blocking writers
+# until it is done. In WAL mode readers never block writers, so the copy
+# is one read transaction from the start - no restarts, no waiting.
+# Every backup is checked with PRAGMA quick_check before it is kept, and
+# a restore runs the full integrity_check before touching the database.
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.engine import make_url
+
+from smart_scheduler.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKUP_PREFIX = "smart_scheduler-"
+# Restarts tolerated before the copy finishes in one step
+MAX_RESTARTS = 3
+# Chunk size for gzip streaming
+COPY_BUFFER_BYTES = 1024 * 1024
+
+_backup_lock = threading.Lock()
+
+class BackupError(RuntimeError):
+    """Raised for failed backups and for backups that fail verification"""
+
+class BackupInProgress(BackupError):
+    """Raised when another backup of this process is still running"""
+
+class _Restarted(Exception):
+    pass
+
+def database_path() -> str:
+    """Filesystem path of the configured SQLite database"""
+    url = make_url(settings.database_url)
+    if not url.drivername.startswith("sqlite") or not url.database or url.database == ":memory:":
+        raise BackupError(f"Backups need a file-based SQLite database, not {settings.database_url}")
+    return os.path.abspath(url.database)
+
+def _copy(source: sqlite3.Connection, target_path: str, pages: int, sleep: float,
+          on_progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, int]:
+    """Online-backup `source` into a new database file at `target_path`"""
+    stats = {"steps": 0, "restarts": 0, "pages": 0}
+    last_remaining = None
+
+    def progress(status, remaining, total):
+        nonlocal last_remaining
+        stats["steps"] += 1
+        stats["pages"] = total
+        if last_remaining is not None and remaining > last_remaining:
+            stats["restarts"] += 1
+            if stats["restarts"] > MAX_RESTARTS:
+                raise _Restarted()
+        last_remaining = remaining
+        if on_progress:
+            on_progress(total - remaining, total)
+
+    if source.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal":
+        pages = -1
+    target = sqlite3.connect(target_path)
+    try:
+        try:
+            source.backup(target, pages=pages, progress=progress, sleep=sleep)
+        except _Restarted:
+            logger.warning("Backup restarted %d times under concurrent writes; finishing in one step, "
+                           "which holds off writers until done (WAL mode avoids this)", MAX_RESTARTS)
+            source.backup(target, pages=-1)
+            stats["steps"] += 1
+    finally:
+        target.close()
+    return stats
+
+def check_integrity(path: str, full: bool = True) -> str:
+    """PRAGMA integrity_check (or the faster quick_check) of a database file; "ok" when sound"""
+    connection = sqlite3.connect(path)
+    try:
+        pragma = "integrity_check" if full else "quick_check"
+        return "; ".join(row[0] for row in connection.execute(f"PRAGMA {pragma}"))
+    except sqlite3.DatabaseError as e:
+        # Too damaged (or not a database at all) for the check to run
+        return str(e)
+    finally:
+        connection.close()
+
+def _compress(path: str, compressed_path: str, level: int):
+    with open(path, "rb") as raw, gzip.open(compressed_path, "wb", compresslevel=level) as packed:
+        shutil.copyfileobj(raw, packed, COPY_BUFFER_BYTES)
+
+def _decompress(compressed_path: str, path: str):
+    with gzip.open(compressed_path, "rb") as packed, open(path, "wb") as raw:
+        shutil.copyfileobj(packed, raw, COPY_BUFFER_BYTES)
+
+def _backup_path(directory: str, compress: bool) -> str:
+    stamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+    suffix = ".db.gz" if compress else ".db"
+    path = os.path.join(directory, f"{BACKUP_PREFIX}{stamp}{suffix}")
+    n = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f"{BACKUP_PREFIX}{stamp}-{n}{suffix}")
+        n += 1
+    return path
+
+def list_backups(directory: Optional[str] = None) -> List[Dict]:
+    """Backups in `directory`, newest first"""
+    directory = directory or settings.backup_dir
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(
+        (name for name in os.listdir(directory)
+         if name.startswith(BACKUP_PREFIX) and name.endswith((".db", ".db.gz"))),
+        key=lambda name: os.path.getmtime(os.path.join(directory, name)),
+        reverse=True,
+    )
+    return [
+        {
+            "path": os.path.join(directory, name),
+            "bytes": os.path.getsize(os.path.join(directory, name)),
+            "created_at": datetime.utcfromtimestamp(os.path.getmtime(os.path.join(directory, name))),
+            "compressed": name.endswith(".gz"),
+        }
+        for name in names
+    ]
+
+def rotate_backups(keep: int, directory: Optional[str] = None) -> List[str]:
+    """Delete all but the newest `keep` backups; returns the removed paths"""
+    removed = [backup["path"] for backup in list_backups(directory)[keep:]] if keep > 0 else []
+    for path in removed:
+        os.remove(path)
+    return removed
+
+def create_backup(directory: Optional[str] = None, compress: bool = False, keep: Optional[int] = None,
+                  step_pages: Optional[int] = None, step_sleep: Optional[float] = None,
+                  on_progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+    """Snapshot the live database into `directory` while the server keeps running.
+
+    The copy is written under a temporary name, checked, optionally
+    gzipped and only then renamed into place, so a listed backup is always
+    complete. Older backups beyond `keep` are removed afterwards.
+    """
+    directory = directory or settings.backup_dir
+    keep = settings.backup_keep if keep is None else keep
+    step_pages = step_pages or settings.backup_step_pages
+    step_sleep = settings.backup_step_sleep_seconds if step_sleep is None else step_sleep
+    if not _backup_lock.acquire(blocking=False):
+        raise BackupInProgress("A backup is already running")
+    try:
+        os.makedirs(directory, exist_ok=True)
+        path = _backup_path(directory, compress)
+        partial = path.removesuffix(".gz") + ".partial"
+        started = time.perf_counter()
+        source = sqlite3.connect(database_path(), timeout=30)
+        try:
+            stats = _copy(source, partial, step_pages, step_sleep, on_progress)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        finally:
+            source.close()
+        copied = time.perf_counter()
+
+        try:
+            integrity = check_integrity(partial, full=False)
+            if integrity != "ok":
+                raise BackupError(f"Backup failed verification: {integrity}")
+            if compress:
+                _compress(partial, path + ".partial", settings.backup_compress_level)
+                os.replace(path + ".partial", path)
+            else:
+                os.replace(partial, path)
+        finally:
+            for leftover in (partial, path + ".partial"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+        finished = time.perf_counter()
+
+        removed = rotate_backups(keep, directory)
+        result = {
+            "path": path,
+            "bytes": os.path.getsize(path),
+            "pages": stats["pages"],
+            "steps": stats["steps"],
+            "restarts": stats["restarts"],
+            "compressed": compress,
+            "integrity": integrity,
+            "copy_seconds": round(copied - started, 3),
+            "seconds": round(finished - started, 3),
+            "removed": removed,
+        }
+        logger.info("Backup written to %s in %.1fs (%d pages, %d restarts)",
+                    path, result["seconds"], stats["pages"], stats["restarts"])
+        return result
+    finally:
+        _backup_lock.release()
+
+def restore_backup(path: str, snapshot_current: bool = True) -> Dict:
+    """Replace the live database with a backup after verifying the backup.
+
+    The backup (decompressed first if gzipped) must pass PRAGMA
+    integrity_check; the current database is snapshotted beforehand
+    unless `snapshot_current` is off. The copy goes in through the backup
+    API as one step, so other connections see either the old or the new
+    database. Restart the server afterwards: it caches derived data.
+    """
+    if not os.path.exists(path):
+        raise BackupError(f"No such backup: {path}")
+    target = database_path()
+    staged = None
+    try:
+        if path.endswith(".gz"):
+            staged = f"{target}.restore"
+            _decompress(path, staged)
+        source_path = staged or path
+        integrity = check_integrity(source_path)
+        if integrity != "ok":
+            raise BackupError(f"Backup failed verification: {integrity}")
+
+        snapshot = create_backup(keep=0)["path"] if snapshot_current and os.path.exists(target) else None
+        started = time.perf_counter()
+        source = sqlite3.connect(source_path)
+        destination = sqlite3.connect(target, timeout=30)
+        try:
+            source.backup(destination, pages=-1)
+        finally:
+            destination.close()
+            source.close()
+        return {
+            "restored_from": path,
+            "database": target,
+            "integrity": integrity,
+            "previous_database_snapshot": snapshot,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+    finally:
+        if staged and os.path.exists(staged):
+            os.remove(staged)
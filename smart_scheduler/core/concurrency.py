@@ -0,0 +1,66 @@
+# smart_scheduler/core/concurrency.py - Optimistic concurrency for versioned rows
+#
+# Task, Deadline and Project carry a `version` column that the ORM checks
+# and bumps on every UPDATE/DELETE ("... WHERE id = ? AND version = ?").
+# Clients read the version from the ETag header or the `version` field and
+# send it back in If-Match; a write based on an older version gets a 409.
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+T = TypeVar("T")
+
+# Attempts for a write without an expected version before it gives up
+WRITE_ATTEMPTS = 3
+
+class VersionConflict(ValueError):
+    """Raised when a row changed after the version a write was based on"""
+
+    def __init__(self, message: str, current_version: Optional[int] = None):
+        super().__init__(message)
+        self.current_version = current_version
+
+def check_version(row, expected_version: Optional[int]):
+    """Reject a write based on an older version up front, before any work is staged"""
+    if expected_version is not None and row.version != expected_version:
+        raise VersionConflict(
+            f"{type(row).__name__} {row.id} is at version {row.version}, not {expected_version}",
+            row.version,
+        )
+
+def versioned_write(db: Session, expected_version: Optional[int], write: Callable[[], T]) -> T:
+    """Run `write` (read, change, commit) under optimistic locking.
+
+    A concurrent commit between our read and our UPDATE makes the UPDATE
+    match no row and the ORM raises StaleDataError. With an expected version
+    that is the caller's conflict; without one the write is simply re-run
+    on fresh data, so concurrent edits are serialized instead of lost.
+    """
+    for _ in range(1 if expected_version is not None else WRITE_ATTEMPTS):
+        try:
+            return write()
+        except StaleDataError:
+            db.rollback()
+    raise VersionConflict("The row was modified concurrently; reload it and try again")
+
+def parse_if_match(value: Optional[str]) -> Optional[int]:
+    """Expected version from an If-Match header: 3, "3" or W/"3"; None when absent or *"""
+    if value is None or value.strip() in ("", "*"):
+        return None
+    value = value.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="If-Match must be a row version, as sent in ETag")
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+def conflict(error: VersionConflict) -> HTTPException:
+    """409 for a VersionConflict, with the current version as ETag when known"""
+    headers = {"ETag": etag(error.current_version)} if error.current_version is not None else None
+    return HTTPException(status_code=409, detail=str(error), headers=headers)
@@ -22,6 +22,60 @@ class Settings(BaseSettings):
     host: str = "127.0.0.1"
     port: int = 8000
     
+    # Production profile (ENVIRONMENT=production or `startup.py --production`)
+    # 0 means one per CPU. More than one is only safe once the ranking heap
+    # and forecast cache are shared; see server_options()
+    workers: int = 1
+    keep_alive_seconds: int = 5
+    backlog: int = 2048
+    limit_concurrency: Optional[int] = None  # 503 beyond this many open connections per worker
+    graceful_shutdown_seconds: int = 30  # after SIGTERM, for in-flight requests to finish
+    access_log: str = "on"  # on, off, or async (written by a background thread)
+    
+    # Admission control: concurrent requests and queue slots per route
+    # class (see core/admission.py). The limits add up to uvicorn's
+    # threadpool size (40), so every admitted sync request gets a thread.
+    admission_control: bool = True
+    admission_critical_limit: int = 8
+    admission_critical_queue: int = 64
+    admission_default_limit: int = 24
+    admission_default_queue: int = 64
+    admission_heavy_limit: int = 8
+    admission_heavy_queue: int = 16
+    admission_queue_timeout_seconds: float = 5.0
+    admission_retry_after_seconds: int = 2
+    
+    # Identical concurrent schedule/stats reads share one computation
+    single_flight: bool = True
+    
+    # Background jobs (seconds between runs; 0 disables)
+    time_rollup_interval_seconds: int = 300
+    # Progress and start/pause updates are buffered and written this often;
+    # 0 writes each one through immediately
+    progress_flush_seconds: float = 2.0
+    
+    # Delta sync: tombstones older than this are compacted away
+    change_log_retention_days: int = 30
+    
+    # Archival (`scheduler archive`): finished tasks and deadlines older
+    # than this move to the archive tables, this many per transaction
+    archive_after_days: int = 90
+    archive_batch_size: int = 500
+    
+    # Online backups (`scheduler backup`, POST /api/admin/backup)
+    backup_dir: str = "backups"
+    backup_keep: int = 7  # newest backups kept; 0 keeps all
+    backup_step_pages: int = 4096  # pages per step without WAL, holding the read lock
+    backup_step_sleep_seconds: float = 0.005  # pause between steps, for writers
+    backup_compress_level: int = 1  # gzip level: 1 is ~4x faster than 6 for ~the same size
+    # Required in X-Admin-Token by /api/admin endpoints when set
+    admin_token: Optional[str] = None
+    
+    # SQLite write serialization: mutating requests share one writer
+    # connection and are committed in groups of up to write_batch_max
+    write_serialization: bool = False
+    write_batch_max: int = 32
+    
     class Config:
         env_file = ".env"
 
@@ -1,8 +1,22 @@
-from sqlalchemy import create_engine
+import logging
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from smart_scheduler.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Alembic revision the models in this tree correspond to.
+# Bump this together with every new file under alembic/versions/.
+SCHEMA_VERSION = "e7a2d4c9b615"
+# The schema the old import-time create_tables() built, which never
+# stamped alembic_version: databases from before the lifespan check
+BASELINE_SCHEMA_VERSION = "c1191529db54"
+
+class SchemaOutOfDate(RuntimeError):
+    """Raised at startup when the database needs `alembic upgrade head` first"""
+
 # Create database engine
 engine = create_engine(
     settings.database_url,
@@ -15,6 +29,8 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base class for models
 Base = declarative_base()
 
+_schema_checked = False
+
 def get_db():
     """Get database session"""
     db = SessionLocal()
@@ -25,4 +41,63 @@ def get_db():
 
 def create_tables():
     """Create all database tables"""
+    # Models register themselves on Base.metadata when imported
+    import smart_scheduler.models  # noqa: F401
     Base.metadata.create_all(bind=engine)
+
+def get_schema_version():
+    """Return the stamped Alembic revision, or None for an unstamped database"""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except OperationalError:
+        # alembic_version doesn't exist yet (fresh database)
+        return None
+
+def stamp_schema_version(version: str = SCHEMA_VERSION):
+    """Record `version` in alembic_version, creating the table if needed"""
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE IF NOT EXISTS alembic_version ("
+            "version_num VARCHAR(32) NOT NULL, "
+            "CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num))"
+        ))
+        connection.execute(text("DELETE FROM alembic_version"))
+        connection.execute(
+            text("INSERT INTO alembic_version (version_num) VALUES (:version)"),
+            {"version": version},
+        )
+
+def ensure_schema():
+    """Make sure the database matches the models.
+
+    A single-row read of alembic_version is enough when the schema is
+    current. Only an empty database gets create_all() and a head stamp;
+    anything older is left to Alembic, since create_all() would add new
+    tables but not new columns, and the revisions creating those tables
+    would then fail. An unstamped database with tables predates the
+    check and is stamped at the baseline revision first.
+    Safe to call repeatedly - the check runs once per process.
+    """
+    global _schema_checked
+    if _schema_checked:
+        return
+
+    version = get_schema_version()
+    if version is None:
+        if not inspect(engine).get_table_names():
+            logger.info("Initializing fresh database schema")
+            create_tables()
+            stamp_schema_version()
+            version = SCHEMA_VERSION
+        else:
+            logger.warning(f"Unversioned database, stamping baseline revision {BASELINE_SCHEMA_VERSION}")
+            stamp_schema_version(BASELINE_SCHEMA_VERSION)
+            version = BASELINE_SCHEMA_VERSION
+    if version != SCHEMA_VERSION:
+        raise SchemaOutOfDate(
+            f"Database schema is at revision {version}, this version of the app needs {SCHEMA_VERSION}: "
+            "run 'alembic upgrade head' before starting it"
+        )
+
+    _schema_checked = True
@@ -0,0 +1,296 @@
+# smart_scheduler/core/online_migration.py - Batched, resumable migrations for large tables
+#
+# A backfill or table rebuild done as one statement holds SQLite's write
+# lock until it has touched every row - minutes on millions of rows, with
+# every writer waiting (and, without WAL, readers too once it spills). The
+# helpers here walk the table in primary-key batches instead, each its own
+# short transaction together with a checkpoint row in online_migrations:
+#
+#   * backfill_column() runs UPDATE ... SET column = expression per batch.
+#   * rebuild_table() is copy-and-swap: triggers mirror live writes into
+#     a new table while batches copy the existing rows, then one short
+#     transaction drops the old table, renames the new one and recreates
+#     its indexes and triggers. It covers what ALTER TABLE can't do in
+#     SQLite (changing types, constraints or column order).
+#
+# An interrupted run picks up after its last committed batch when it is
+# started again under the same name (or, for a rebuild, is dropped with
+# cancel_rebuild()); a finished one is a no-op. Batches can be
+# rate-limited so a live server keeps most of the I/O.
+#
+# From an Alembic revision, run them in autocommit mode so each batch can
+# commit on its own:
+#
+#     with op.get_context().autocommit_block():
+#         backfill_column(op.get_bind(), "tasks", "effort", "coalesce(estimated_duration, 0) * 2")
+#
+# Elsewhere pass an Engine; the helpers open their own connection.
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Union
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+# Idle time after each batch. A writer waiting on the lock polls it every
+# few tens of milliseconds (SQLite's busy handler backs off to 100ms), so
+# a batch loop that re-takes the lock right away can starve it for the
+# whole migration.
+DEFAULT_PAUSE_SECONDS = 0.05
+# Suffix of the table being built by rebuild_table()
+NEW_TABLE_SUFFIX = "__rebuild"
+# Prefix of the change-capture triggers rebuild_table() adds (and removes)
+TRIGGER_PREFIX = "online_migration_"
+
+Bind = Union[Engine, Connection]
+ProgressCallback = Callable[[Dict], None]
+
+class MigrationError(RuntimeError):
+    """Raised when a migration can't run as requested"""
+
+@contextmanager
+def _autocommit(bind: Bind):
+    """A connection on which the helpers issue BEGIN/COMMIT themselves"""
+    if isinstance(bind, Engine):
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            yield connection
+        return
+    if bind.connection.dbapi_connection.isolation_level is not None:
+        raise MigrationError(
+            "Batched migrations commit per batch: run them inside op.get_context().autocommit_block() "
+            "or pass an Engine"
+        )
+    yield bind
+
+@contextmanager
+def _transaction(connection: Connection):
+    # IMMEDIATE takes the write lock up front rather than failing half-way
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.exec_driver_sql("ROLLBACK")
+        raise
+    connection.exec_driver_sql("COMMIT")
+
+def _ensure_state_table(connection: Connection):
+    connection.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS online_migrations ("
+        "name VARCHAR PRIMARY KEY, phase VARCHAR NOT NULL, last_key INTEGER, "
+        "rows_done INTEGER NOT NULL DEFAULT 0, updated_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+    )
+
+def _load_state(connection: Connection, name: str) -> Optional[Dict]:
+    row = connection.execute(
+        text("SELECT phase, last_key, rows_done FROM online_migrations WHERE name = :name"), {"name": name}
+    ).first()
+    return dict(row._mapping) if row else None
+
+def _save_state(connection: Connection, name: str, phase: str, last_key: Optional[int], rows_done: int):
+    connection.execute(
+        text(
+            "INSERT INTO online_migrations (name, phase, last_key, rows_done, updated_at) "
+            "VALUES (:name, :phase, :last_key, :rows_done, CURRENT_TIMESTAMP) "
+            "ON CONFLICT (name) DO UPDATE SET phase = excluded.phase, last_key = excluded.last_key, "
+            "rows_done = excluded.rows_done, updated_at = excluded.updated_at"
+        ),
+        {"name": name, "phase": phase, "last_key": last_key, "rows_done": rows_done},
+    )
+
+class _Pacer:
+    """Rate limiting and progress reporting across batches"""
+
+    def __init__(self, name: str, total: int, done: int, max_rows_per_second: Optional[float],
+                 pause_seconds: float, on_progress: Optional[ProgressCallback]):
+        self.name = name
+        self.total = total
+        self.done = done
+        self.max_rows_per_second = max_rows_per_second
+        self.pause_seconds = pause_seconds
+        self.on_progress = on_progress or self._log
+        self.started = time.perf_counter()
+        self.resumed_at = done
+        self.last_logged = 0.0
+
+    def batch_done(self, rows: int, batch_started: float):
+        self.done += rows
+        pause = self.pause_seconds
+        if self.max_rows_per_second:
+            # Sleep off whatever the batch finished ahead of the allowed rate
+            pause = max(pause, rows / self.max_rows_per_second - (time.perf_counter() - batch_started))
+        time.sleep(pause)
+        elapsed = time.perf_counter() - self.started
+        rate = (self.done - self.resumed_at) / elapsed if elapsed else 0.0
+        self.on_progress({
+            "name": self.name,
+            "rows_done": self.done,
+            "rows_total": self.total,
+            "rows_per_second": round(rate),
+            "eta_seconds": round((self.total - self.done) / rate, 1) if rate and self.total >= self.done else None,
+        })
+
+    def _log(self, progress: Dict):
+        if time.perf_counter() - self.last_logged >= 5:
+            self.last_logged = time.perf_counter()
+            logger.info("%s: %d/%d rows (%d rows/s)", progress["name"], progress["rows_done"],
+                        progress["rows_total"], progress["rows_per_second"])
+
+def _batches(connection: Connection, name: str, table: str, key: str, statement: str, phase: str,
+             batch_size: int, max_rows_per_second: Optional[float], pause_seconds: float,
+             on_progress: Optional[ProgressCallback], state: Optional[Dict]) -> int:
+    """Run `statement` over consecutive key ranges (:low, :high], checkpointing each batch"""
+    done = state["rows_done"] if state else 0
+    last_key = state["last_key"] if state else None
+    if last_key is None:
+        last_key = connection.exec_driver_sql(f"SELECT min({key}) - 1 FROM {table}").scalar()
+    if last_key is None:
+        return done  # empty table
+    total = connection.exec_driver_sql(f"SELECT count(*) FROM {table}").scalar()
+    pacer = _Pacer(name, total, done, max_rows_per_second, pause_seconds, on_progress)
+    next_high = text(
+        f"SELECT max({key}), count(*) FROM (SELECT {key} FROM {table} WHERE {key} > :low ORDER BY {key} LIMIT :n)"
+    )
+    while True:
+        batch_started = time.perf_counter()
+        with _transaction(connection):
+            high, rows = connection.execute(next_high, {"low": last_key, "n": batch_size}).first()
+            if not rows:
+                break
+            connection.execute(text(statement), {"low": last_key, "high": high})
+            _save_state(connection, name, phase, high, done + rows)
+        last_key, done = high, done + rows
+        pacer.batch_done(rows, batch_started)
+    return done
+
+def backfill_column(bind: Bind, table: str, column: str, expression: str, where: Optional[str] = None,
+                    name: Optional[str] = None, key: str = "id", batch_size: int = DEFAULT_BATCH_SIZE,
+                    max_rows_per_second: Optional[float] = None, pause_seconds: float = DEFAULT_PAUSE_SECONDS,
+                    on_progress: Optional[ProgressCallback] = None) -> int:
+    """Set `column` to the SQL `expression` on every row (matching `where`), batch by batch.
+
+    The column must exist already (op.add_column() is instant in SQLite).
+    `expression` is evaluated per row against its current values, so rows
+    written while the backfill runs still get it right. Returns the rows
+    scanned; `name` (default "backfill:<table>.<column>") is the resume key.
+    """
+    name = name or f"backfill:{table}.{column}"
+    condition = f" AND ({where})" if where else ""
+    statement = (
+        f"UPDATE {table} SET {column} = {expression} "
+        f"WHERE {key} > :low AND {key} <= :high{condition}"
+    )
+    with _autocommit(bind) as connection:
+        _ensure_state_table(connection)
+        state = _load_state(connection, name)
+        if state and state["phase"] == "done":
+            return state["rows_done"]
+        done = _batches(connection, name, table, key, statement, "backfill", batch_size,
+                        max_rows_per_second, pause_seconds, on_progress, state)
+        with _transaction(connection):
+            _save_state(connection, name, "done", None, done)
+        return done
+
+def _schema_objects(connection: Connection, table: str, kind: str) -> List[str]:
+    """CREATE statements of `table`'s explicit indexes or triggers (not ours)"""
+    rows = connection.execute(
+        text("SELECT name, sql FROM sqlite_master WHERE type = :kind AND tbl_name = :table AND sql IS NOT NULL"),
+        {"kind": kind, "table": table},
+    )
+    return [sql for object_name, sql in rows if not object_name.startswith(TRIGGER_PREFIX)]
+
+def rebuild_table(bind: Bind, table: str, create_sql: str, columns: Optional[Dict[str, str]] = None,
+                  indexes: Optional[List[str]] = None, name: Optional[str] = None, key: str = "id",
+                  batch_size: int = DEFAULT_BATCH_SIZE, max_rows_per_second: Optional[float] = None,
+                  pause_seconds: float = DEFAULT_PAUSE_SECONDS, on_progress: Optional[ProgressCallback] = None) -> int:
+    """Rebuild `table` with a new definition without holding the write lock for the copy.
+
+    `create_sql` is the new CREATE TABLE statement with "{table}" where
+    the table name goes. `columns` maps each new column to the SQL
+    expression (over the old row) that fills it; by default every column
+    the old and new definitions share is copied as is. `indexes` are the
+    CREATE INDEX statements for the new table - by default the old
+    table's own. The table's triggers (search index, change log) are
+    recreated as they were. Returns the rows copied.
+    """
+    name = name or f"rebuild:{table}"
+    new_table = f"{table}{NEW_TABLE_SUFFIX}"
+    with _autocommit(bind) as connection:
+        _ensure_state_table(connection)
+        state = _load_state(connection, name)
+        if state and state["phase"] == "done":
+            return state["rows_done"]
+
+        if state is None:
+            with _transaction(connection):
+                connection.exec_driver_sql(f"DROP TABLE IF EXISTS {new_table}")
+                connection.exec_driver_sql(create_sql.format(table=new_table))
+                _save_state(connection, name, "copy", None, 0)
+                state = {"phase": "copy", "last_key": None, "rows_done": 0}
+
+        old_columns = [row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({table})")]
+        new_columns = [row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({new_table})")]
+        if columns is None:
+            columns = {column: column for column in new_columns if column in old_columns}
+        targets = ", ".join(columns)
+        values = ", ".join(columns.values())
+
+        # Live writes land in the new table as they happen; the batches
+        # only have to bring over rows nobody touches meanwhile
+        with _transaction(connection):
+            for event, row in (("INSERT", "new"), ("UPDATE", "new")):
+                connection.exec_driver_sql(
+                    f"CREATE TRIGGER IF NOT EXISTS {TRIGGER_PREFIX}{table}_{event.lower()} "
+                    f"AFTER {event} ON {table} BEGIN "
+                    f"INSERT OR REPLACE INTO {new_table} ({targets}) "
+                    f"SELECT {values} FROM {table} WHERE {key} = {row}.{key}; END"
+                )
+            connection.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {TRIGGER_PREFIX}{table}_delete AFTER DELETE ON {table} BEGIN "
+                f"DELETE FROM {new_table} WHERE {key} = old.{key}; END"
+            )
+
+        copy = (
+            f"INSERT OR REPLACE INTO {new_table} ({targets}) SELECT {values} FROM {table} "
+            f"WHERE {key} > :low AND {key} <= :high"
+        )
+        done = _batches(connection, name, table, key, copy, "copy", batch_size,
+                        max_rows_per_second, pause_seconds, on_progress, state)
+
+        # The swap: one short transaction. Index builds are the only part
+        # proportional to the table size.
+        index_sql = indexes if indexes is not None else _schema_objects(connection, table, "index")
+        trigger_sql = _schema_objects(connection, table, "trigger")
+        # With foreign keys enforced, DROP TABLE would cascade into the
+        # tables referencing this one; the pragma only applies outside a transaction
+        foreign_keys = connection.exec_driver_sql("PRAGMA foreign_keys").scalar()
+        if foreign_keys:
+            connection.exec_driver_sql("PRAGMA foreign_keys = OFF")
+        started = time.perf_counter()
+        try:
+            with _transaction(connection):
+                connection.exec_driver_sql(f"DROP TABLE {table}")
+                connection.exec_driver_sql(f"ALTER TABLE {new_table} RENAME TO {table}")
+                for statement in index_sql + trigger_sql:
+                    connection.exec_driver_sql(statement)
+                _save_state(connection, name, "done", None, done)
+        finally:
+            if foreign_keys:
+                connection.exec_driver_sql("PRAGMA foreign_keys = ON")
+        logger.info("%s: swapped in %.2fs", name, time.perf_counter() - started)
+        return done
+
+def cancel_rebuild(bind: Bind, table: str, name: Optional[str] = None):
+    """Abandon an unfinished rebuild_table(): drop its triggers, the new table and its checkpoint"""
+    name = name or f"rebuild:{table}"
+    with _autocommit(bind) as connection:
+        _ensure_state_table(connection)
+        with _transaction(connection):
+            for event in ("insert", "update", "delete"):
+                connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {TRIGGER_PREFIX}{table}_{event}")
+            connection.exec_driver_sql(f"DROP TABLE IF EXISTS {table}{NEW_TABLE_SUFFIX}")
+            connection.execute(text("DELETE FROM online_migrations WHERE name = :name AND phase != 'done'"),
+                               {"name": name})
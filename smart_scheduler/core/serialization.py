@@ -0,0 +1,88 @@
+# smart_scheduler/core/serialization.py - Fast JSON path for API responses
+import enum
+import json
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _default(value: Any):
+    """Fallback encoder for types the stdlib json module can't handle"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes; enums and datetimes are handled natively"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when it is installed.
+
+    Used as the app's default response class. Routes that return one of
+    these directly bypass response_model validation, so only hand it
+    data that is already in the documented shape (e.g. from row_dicts()).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def row_dicts(db: Session, fields: Sequence[str], model, stmt=None) -> List[Dict]:
+    """Fetch only `fields` of `model` as plain dicts, without hydrating ORM objects.
+
+    `stmt` is an optional select() to apply filters/ordering to; when given
+    its column list is replaced by `fields`.
+    """
+    columns = [getattr(model, field) for field in fields]
+    stmt = select(*columns) if stmt is None else stmt.with_only_columns(*columns)
+    return [dict(zip(fields, row)) for row in db.execute(stmt)]
+
+def object_dict(obj, fields: Iterable[str]) -> Dict:
+    """Plain dict of `fields` read off an already-loaded object"""
+    return {field: getattr(obj, field) for field in fields}
+
+# Most ids one batch fetch (?ids=) may ask for
+MAX_BATCH_IDS = 1000
+
+def parse_ids(ids: str) -> List[int]:
+    """Comma-separated ids as ints, in the order given, repeats dropped"""
+    try:
+        parsed = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise ValueError(f"ids must be comma-separated integers: {ids}")
+    if not parsed:
+        raise ValueError("ids is empty")
+    if len(parsed) > MAX_BATCH_IDS:
+        raise ValueError(f"At most {MAX_BATCH_IDS} ids per request")
+    return parsed
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """Sparse fieldset: the comma-separated `fields` (id always included), or all of `allowed`"""
+    if not fields:
+        return list(allowed)
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return [field for field in allowed if field in requested]
+
+def in_request_order(rows: List[Dict], ids: Sequence[int]) -> Dict:
+    """Batch fetch response: one entry per requested id, in order, null where it wasn't found"""
+    found = {row["id"]: row for row in rows}
+    return {
+        "items": [found.get(row_id) for row_id in ids],
+        "missing": [row_id for row_id in ids if row_id not in found],
+    }
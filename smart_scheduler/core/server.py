@@ -0,0 +1,92 @@
+# smart_scheduler/core/server.py - uvicorn settings for the dev and production profiles
+import importlib.util
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Dict, Optional
+
+from smart_scheduler.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def is_production() -> bool:
+    return settings.environment.lower() == "production"
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+def server_options(production: bool) -> Dict:
+    """uvicorn.run() keyword arguments for a profile.
+
+    Development is one auto-reloading process. Production runs `workers`
+    processes on uvloop and httptools (both part of uvicorn[standard];
+    the pure-Python loop and parser are the fallback), without reload.
+
+    One worker by default: the ranking heap, the forecast model and the
+    write-behind buffer live in each process, and a write only updates the
+    copies of the worker that handled it. With more workers, the others
+    rank and forecast from stale data until their next rebuild.
+    """
+    options = {
+        "host": settings.host,
+        "port": settings.port,
+        "log_level": settings.log_level.lower(),
+        "access_log": settings.access_log != "off",
+    }
+    if not production:
+        return {**options, "reload": settings.debug}
+
+    for module in ("uvloop", "httptools"):
+        if not _available(module):
+            logger.warning(f"{module} is not installed - falling back to the pure-Python implementation")
+    workers = settings.workers or os.cpu_count() or 1
+    if workers > 1:
+        # Imported here: both modules load the models
+        from smart_scheduler.services.forecast_service import MODEL_MAX_AGE
+        from smart_scheduler.services.ranking_service import RANKING_MAX_AGE
+
+        logger.warning(
+            f"{workers} workers: each keeps its own ranking heap and forecast model, so writes handled by one "
+            f"reach the others only at their next rebuild (up to {RANKING_MAX_AGE} and {MODEL_MAX_AGE} later), "
+            f"and buffered progress is only shown by the worker that received it"
+        )
+        if settings.write_serialization:
+            logger.warning("write_serialization serializes writes per worker; workers still share SQLite's lock")
+    return {
+        **options,
+        "workers": workers,
+        "loop": "uvloop" if _available("uvloop") else "asyncio",
+        "http": "httptools" if _available("httptools") else "h11",
+        "timeout_keep_alive": settings.keep_alive_seconds,
+        "backlog": settings.backlog,
+        "limit_concurrency": settings.limit_concurrency,
+        "timeout_graceful_shutdown": settings.graceful_shutdown_seconds,
+        "server_header": False,
+    }
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """Queue the record untouched: uvicorn's access formatter needs its args"""
+
+    def prepare(self, record):
+        return record
+
+def start_async_access_log() -> Optional[logging.handlers.QueueListener]:
+    """Move uvicorn's access log writes to a background thread (access_log=async).
+
+    Requests only put the record on a queue; the listener formats and
+    writes it with the handlers uvicorn configured. Call once per worker.
+    """
+    if settings.access_log != "async":
+        return None
+    access_logger = logging.getLogger("uvicorn.access")
+    handlers = access_logger.handlers[:]
+    if not handlers:
+        return None
+    records = queue.SimpleQueue()
+    for handler in handlers:
+        access_logger.removeHandler(handler)
+    access_logger.addHandler(_RecordQueueHandler(records))
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,99 @@
+# smart_scheduler/core/single_flight.py - Coalesce identical concurrent reads
+#
+# When many dashboards refresh at once they send the same schedule/stats
+# requests. The first such request (the leader) runs normally; identical
+# requests arriving while it is in flight wait for it and get a replay of
+# its response - status, headers and the already serialized body - without
+# touching a worker thread or the database. Nothing is cached: once the
+# leader has answered, the next request computes afresh. A follower can
+# therefore see data as of the moment the leader started, never older -
+# and never older than a write this process has answered: a request
+# arriving after one does not join a leader that started before it.
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+# Requests that can't change anything
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# GET routes whose responses depend only on path and query string (as routed:
+# /api/schedule without the slash is only a redirect)
+COALESCED_PATHS = {
+    "/api/schedule/",
+    "/api/schedule/heatmap",
+    "/api/stats",
+    "/api/deadlines/analytics",
+}
+
+def flight_key(scope) -> Optional[Tuple[str, str]]:
+    """(path, sorted query) for a coalescable request, else None"""
+    if scope["type"] != "http" or scope["method"] != "GET":
+        return None
+    path = scope["path"]
+    if path not in COALESCED_PATHS:
+        return None
+    query = sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+    return path, urlencode(query)
+
+class SingleFlightMiddleware:
+    """Pure ASGI middleware sharing one in-flight response among identical GETs"""
+
+    def __init__(self, app):
+        self.app = app
+        self.flights: Dict[Tuple[str, str], Tuple[asyncio.Future, int]] = {}
+        # Bumped as each write request finishes; flights are only joined within one generation
+        self.generation = 0
+        # Metrics
+        self.leaders = 0
+        self.followers = 0
+
+    def stats(self) -> Dict:
+        return {"in_flight": len(self.flights), "leaders": self.leaders, "coalesced": self.followers}
+
+    async def __call__(self, scope, receive, send):
+        key = flight_key(scope)
+        if key is None:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                if scope["type"] == "http" and scope["method"] not in READ_METHODS:
+                    self.generation += 1
+            return
+
+        flight, generation = self.flights.get(key, (None, None))
+        if flight is not None and generation == self.generation:
+            messages = await asyncio.shield(flight)
+            if messages is not None:
+                self.followers += 1
+                for message in messages:
+                    await send(message)
+                return
+            # The leader failed; answer this one on its own
+            await self.app(scope, receive, send)
+            return
+
+        # No flight, or one that started before a write: lead a fresh one
+        flight = asyncio.get_running_loop().create_future()
+        self.flights[key] = flight, self.generation
+        self.leaders += 1
+        messages: List[Dict] = []
+
+        async def capture(message):
+            messages.append(message)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            if self.flights.get(key, (None,))[0] is flight:
+                del self.flights[key]
+            complete = bool(messages) and not messages[-1].get("more_body", False)
+            flight.set_result(messages if complete else None)
+
+single_flight: Optional[SingleFlightMiddleware] = None
+
+def single_flight_middleware(app) -> SingleFlightMiddleware:
+    """Middleware factory that remembers the instance, for the metrics in /api/health"""
+    global single_flight
+    single_flight = SingleFlightMiddleware(app)
+    return single_flight
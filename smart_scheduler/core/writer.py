@@ -0,0 +1,231 @@
+# smart_scheduler/core/writer.py - Optional single-writer mode for SQLite
+#
+# SQLite allows one writer at a time. With many threadpool requests
+# committing at once, each fights for the lock on its own connection and
+# some fail with "database is locked". In write-serialization mode every
+# mutating request instead queues for one dedicated writer connection and
+# runs inside its open transaction, one request at a time (each in its own
+# SAVEPOINT, so a failed request only rolls back itself). The queued
+# requests are committed together - one fsync for the whole batch. Reads
+# keep their own pooled connections and, with the database in WAL mode,
+# never wait for the writer.
+#
+# Jobs that commit on their own session (bulk imports, the background
+# progress flush and time rollup) run with the writer paused instead: the
+# open batch is committed first and no new one starts until they finish.
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from anyio import CancelScope
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from smart_scheduler.core.config import settings
+from smart_scheduler.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Methods that never write go straight to a pooled session
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+def _writer_engine(url: str):
+    """Engine for the writer connection, with explicit BEGIN IMMEDIATE.
+
+    pysqlite starts transactions lazily and doesn't know about SAVEPOINTs;
+    turning its handling off and emitting BEGIN ourselves is the documented
+    SQLAlchemy recipe for working savepoints. IMMEDIATE takes the write
+    lock up front, so the batch can't fail half-way on a lock upgrade.
+    """
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        # Readers see committed data while the writer works
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
+
+class WriteQueue:
+    """The writer connection, the requests queued for it and the open batch.
+
+    Requests take an asyncio lock in arrival order - waiting costs no worker
+    thread. The holder runs in the batch transaction; when it is done and
+    nobody else is waiting (or the batch is full), it commits the batch on
+    behalf of everyone in it. Requests arriving during that commit queue up
+    and form the next batch.
+    """
+
+    def __init__(self, url: str, max_batch: int = 32):
+        self.engine = _writer_engine(url)
+        self.max_batch = max_batch
+        self.connection = None
+        self.transaction = None
+        self.batch: List[asyncio.Future] = []  # members of the open transaction, waiting for its commit
+        self.lock: Optional[asyncio.Lock] = None
+        self.waiting = 0
+        # Metrics
+        self.batches = 0
+        self.writes = 0
+        self.failed_batches = 0
+        self.last_batch_size = 0
+        self.max_batch_seen = 0
+        self.max_depth_seen = 0
+
+    def start(self):
+        """Open the writer connection; call from the event loop that serves requests"""
+        self.connection = self.engine.connect()
+        self.lock = asyncio.Lock()
+
+    def stop(self):
+        if self.transaction is not None:
+            self._commit()
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        self.engine.dispose()
+
+    def stats(self) -> Dict:
+        return {
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_depth_seen,
+            "batches": self.batches,
+            "writes": self.writes,
+            "failed_batches": self.failed_batches,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_seen,
+            "average_batch_size": round(self.writes / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def _commit(self) -> Optional[Exception]:
+        """Commit the open batch (in a worker thread); the error, if any, goes to every member"""
+        transaction, self.transaction = self.transaction, None
+        size, self.last_batch_size = len(self.batch), len(self.batch)
+        try:
+            transaction.commit()
+            error = None
+        except Exception as e:
+            logger.exception("Writer batch of %d failed to commit", size)
+            self.failed_batches += 1
+            error = e
+        self.batches += 1
+        self.writes += size
+        self.max_batch_seen = max(self.max_batch_seen, size)
+        return error
+
+    async def _commit_batch(self):
+        """Commit the open batch and release its members; call holding the lock"""
+        # Shielded: the lock must not pass on mid-commit
+        with CancelScope(shield=True):
+            error = await run_in_threadpool(self._commit)
+        batch, self.batch = self.batch, []
+        for member in batch:
+            if not member.done():
+                member.set_result(error)
+
+    @asynccontextmanager
+    async def session(self):
+        """A Session inside the writer's open transaction, for one request.
+
+        Exits only after the batch holding the request's writes has
+        committed, so the response is sent once they are durable. commit()
+        in request code just releases the request's savepoint; close() rolls
+        back whatever it left uncommitted, exactly like a normal session.
+        """
+        committed = asyncio.get_running_loop().create_future()
+        self.waiting += 1
+        self.max_depth_seen = max(self.max_depth_seen, self.waiting)
+        try:
+            await self.lock.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            if self.transaction is None:
+                # BEGIN IMMEDIATE can wait on a writer outside the queue
+                self.transaction = await run_in_threadpool(self.connection.begin)
+            db = Session(bind=self.connection, join_transaction_mode="create_savepoint", autoflush=False)
+            try:
+                yield db
+            finally:
+                db.close()
+                self.batch.append(committed)
+                if not self.waiting or len(self.batch) >= self.max_batch:
+                    await self._commit_batch()
+        finally:
+            self.lock.release()
+        error = await committed
+        if error is not None:
+            raise error
+
+    @asynccontextmanager
+    async def paused(self):
+        """Hold the writer, with no batch open, while a job commits on its own connection.
+
+        Queues like a request; the batch left open by the requests before
+        it is committed first, so the job never waits on the writer's
+        BEGIN IMMEDIATE (or fails with "database is locked" behind it).
+        """
+        self.waiting += 1
+        self.max_depth_seen = max(self.max_depth_seen, self.waiting)
+        try:
+            await self.lock.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            if self.transaction is not None:
+                await self._commit_batch()
+            yield
+        finally:
+            self.lock.release()
+
+_writer: Optional[WriteQueue] = None
+
+def get_writer() -> Optional[WriteQueue]:
+    """The running writer, or None when write serialization is off"""
+    return _writer
+
+def start_writer() -> WriteQueue:
+    global _writer
+    if _writer is None:
+        _writer = WriteQueue(settings.database_url, settings.write_batch_max)
+        _writer.start()
+        logger.info("Write serialization on: one writer connection, batches of up to %d", _writer.max_batch)
+    return _writer
+
+def stop_writer():
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+async def run_exclusive(job: Callable[..., T], *args) -> T:
+    """Run a blocking job that opens and commits its own session, in a worker thread.
+
+    With write serialization on, the writer is paused around it.
+    """
+    if _writer is None:
+        return await run_in_threadpool(job, *args)
+    async with _writer.paused():
+        return await run_in_threadpool(job, *args)
+
+async def get_serialized_db(request: Request):
+    """get_db() for write-serialization mode: writes queue for the writer, reads don't"""
+    if _writer is None or request.method in READ_METHODS:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+        return
+    async with _writer.session() as db:
+        yield db
@@ -1,48 +1,110 @@
 # smart_scheduler/main.py - ENHANCED VERSION (compatible with existing)
-from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
-import uvicorn
+from fastapi.responses import HTMLResponse, JSONResponse
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from importlib.util import find_spec
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime, date
+import asyncio
 import logging
 
 # EXISTING IMPORTS
+# Services, routers, templates and the optional middleware are imported where
+# they are first used (handlers, the lifespan), so importing the app stays cheap
+from smart_scheduler.core.concurrency import VersionConflict, conflict, etag, parse_if_match
 from smart_scheduler.core.config import settings
-from smart_scheduler.core.database import get_db, create_tables
-from smart_scheduler.services.task_service import TaskService
+from smart_scheduler.core.database import get_db, ensure_schema, SessionLocal
+from smart_scheduler.core.server import is_production, server_options, start_async_access_log
 from smart_scheduler.models.task import TaskPriority, TaskStatus
 
 # NEW IMPORTS (safe - they won't break existing code)
-try:
-    from smart_scheduler.services.project_service import ProjectService
-    from smart_scheduler.models.project import Project, ProjectStatus
-    PROJECT_FEATURES_ENABLED = True
-except ImportError:
-    PROJECT_FEATURES_ENABLED = False
+PROJECT_FEATURES_ENABLED = find_spec("smart_scheduler.services.project_service") is not None
+if not PROJECT_FEATURES_ENABLED:
     print("Project features not available yet - continuing with basic features")
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by run_server(); importing this module has no side effects
 logger = logging.getLogger(__name__)
 
-logger.info("✅ Config imported successfully")
-
-# Initialize database tables
-create_tables()
-logger.info("✅ Database components imported and initialized")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks"""
+    from smart_scheduler.services.progress_service import flush_once, flush_periodically
+
+    # Cheap alembic_version check instead of a create_all() on every import
+    ensure_schema()
+    logger.info("✅ Database schema verified")
+    include_routers()
+    access_log_listener = start_async_access_log()
+    if is_production():
+        # Runs before this worker accepts connections
+        prewarm()
+    if settings.write_serialization:
+        from smart_scheduler.core.writer import get_serialized_db, start_writer
+        start_writer()
+        app.dependency_overrides[get_db] = get_serialized_db
+    rollup_job = None
+    if settings.time_rollup_interval_seconds > 0:
+        from smart_scheduler.services.work_session_service import rollup_periodically
+        rollup_job = asyncio.create_task(rollup_periodically(settings.time_rollup_interval_seconds))
+    flush_job = None
+    if settings.progress_flush_seconds > 0:
+        flush_job = asyncio.create_task(flush_periodically(settings.progress_flush_seconds))
+    yield
+    if rollup_job is not None:
+        rollup_job.cancel()
+    if flush_job is not None:
+        flush_job.cancel()
+    # Buffered progress/start/pause updates must not die with the process
+    from smart_scheduler.core.writer import run_exclusive
+    await run_exclusive(flush_once)
+    if settings.write_serialization:
+        from smart_scheduler.core.writer import stop_writer
+        app.dependency_overrides.pop(get_db, None)
+        stop_writer()
+    if access_log_listener is not None:
+        access_log_listener.stop()
+
+class AppJSONResponse(JSONResponse):
+    """The app's default response class: FastJSONResponse, with the encoder loaded on first use"""
+
+    def render(self, content) -> bytes:
+        from smart_scheduler.core.serialization import dumps
+        return dumps(content)
+
+async def pending_progress_written():
+    """Dependency: buffered progress and start/pause updates are written before the read"""
+    from smart_scheduler.services.progress_service import write_pending
+    await write_pending()
+
+def admission_middleware(app):
+    from smart_scheduler.core.admission import AdmissionMiddleware
+    return AdmissionMiddleware(app)
+
+def single_flight_middleware(app):
+    from smart_scheduler.core import single_flight
+    return single_flight.single_flight_middleware(app)
 
 app = FastAPI(
     title="Jarvis AI Assistant",
     description="Just A Rather Very Intelligent System and assistant",
     version="0.1.0",
     docs_url="/docs" if settings.debug else None,
+    lifespan=lifespan,
+    default_response_class=AppJSONResponse,
 )
 
+# Load shedding per route class; added first so CORS also covers its 503s.
+# Both are built with the middleware stack, when the server starts
+if settings.admission_control:
+    app.add_middleware(admission_middleware)
+# Outside admission control: coalesced followers don't take queue slots
+if settings.single_flight:
+    app.add_middleware(single_flight_middleware)
+
 # CORS middleware for development
 app.add_middleware(
     CORSMiddleware,
@@ -52,12 +114,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Static files and templates
-app.mount("/static", StaticFiles(directory="smart_scheduler/static"), name="static")
-templates = Jinja2Templates(directory="smart_scheduler/templates")
+# Static files and templates: mounted and loaded at startup or on first use
+@lru_cache(maxsize=None)
+def get_templates():
+    """The page templates, with the helper functions below as globals"""
+    from fastapi.templating import Jinja2Templates
 
-logger.info("✅ Static files mounted")
-logger.info("✅ Templates initialized")
+    templates = Jinja2Templates(directory="smart_scheduler/templates")
+    templates.env.globals['get_status_icon'] = get_status_icon
+    templates.env.globals['format_duration'] = format_duration
+    templates.env.globals['format_datetime'] = format_datetime
+    return templates
 
 # ENHANCED Pydantic models (backward compatible)
 class TaskCreate(BaseModel):
@@ -74,6 +141,7 @@ class TaskCreate(BaseModel):
     energy_level_required: Optional[int] = 3
     focus_level_required: Optional[int] = 3
     tags: Optional[str] = None
+    parent_id: Optional[int] = None  # create as a subtask
 
 class TaskResponse(BaseModel):
     id: int
@@ -93,6 +161,8 @@ class TaskResponse(BaseModel):
     project_id: Optional[int] = None
     energy_level_required: Optional[int] = 3
     focus_level_required: Optional[int] = 3
+    parent_id: Optional[int] = None
+    version: Optional[int] = None  # echo back in If-Match to guard updates
     
     class Config:
         from_attributes = True
@@ -115,10 +185,14 @@ if PROJECT_FEATURES_ENABLED:
         deadline: str
         progress_percentage: float
         color: str
+        estimated_completion: Optional[str] = None
+        version: Optional[int] = None
         
         class Config:
             from_attributes = True
 
+    PROJECT_FIELDS = list(ProjectResponse.model_fields)
+
 # Template helper functions (EXISTING + ENHANCED)
 def get_status_icon(status):
     icons = {
@@ -148,20 +222,45 @@ def format_datetime(dt):
         return dt
     return dt.strftime("%Y-%m-%d %H:%M:%S")
 
-# Add helper functions to templates
-templates.env.globals['get_status_icon'] = get_status_icon
-templates.env.globals['format_duration'] = format_duration
-templates.env.globals['format_datetime'] = format_datetime
+def task_response(task):
+    """TaskResponse-shaped JSON for a freshly written task, without re-validation"""
+    from smart_scheduler.core.serialization import FastJSONResponse
+
+    created_at = task.created_at
+    return FastJSONResponse({
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "status": task.status,
+        "priority": task.priority,
+        "category": task.category,
+        "estimated_duration": task.estimated_duration,
+        "progress_percentage": task.progress_percentage,
+        # TaskResponse has always sent space-separated timestamps
+        "created_at": created_at.strftime("%Y-%m-%d %H:%M:%S") if created_at else None,
+        "actual_duration": task.actual_duration,
+        "scheduled_start_time": format_datetime(task.scheduled_start_time),
+        "scheduled_end_time": format_datetime(task.scheduled_end_time),
+        "due_date": format_datetime(task.due_date),
+        "project_id": task.project_id,
+        "energy_level_required": task.energy_level_required,
+        "focus_level_required": task.focus_level_required,
+        "parent_id": task.parent_id,
+        "version": task.version,
+    }, headers={"ETag": etag(task.version)})
 
 # EXISTING API Routes (enhanced but compatible)
-@app.get("/", response_class=HTMLResponse)
+@app.get("/", response_class=HTMLResponse, dependencies=[Depends(pending_progress_written)])
 def dashboard(request: Request, db: Session = Depends(get_db)):
     """Main dashboard page"""
+    from smart_scheduler.services.ranking_service import RankingService
+    from smart_scheduler.services.task_service import TaskService
     
     task_service = TaskService(db)
     
-    # Get recent tasks and stats
-    recent_tasks = task_service.get_tasks(limit=6)
+    # What to work on next; the newest tasks when nothing is open
+    next_ids = [item["id"] for item in RankingService(db).next_tasks(limit=6)]
+    recent_tasks = task_service.get_task_records_by_ids(next_ids) or task_service.get_task_records(limit=6)
     stats = task_service.get_task_stats()
     
     # NEW: Get projects if available
@@ -170,13 +269,15 @@ def dashboard(request: Request, db: Session = Depends(get_db)):
     
     if PROJECT_FEATURES_ENABLED:
         try:
+            from smart_scheduler.models.project import ProjectStatus
+            from smart_scheduler.services.project_service import ProjectService
             project_service = ProjectService(db)
-            active_projects = project_service.get_projects(status=ProjectStatus.ACTIVE)
-            upcoming_deadlines = project_service.get_upcoming_deadlines(days_ahead=7)
+            active_projects = project_service.get_project_records(status=ProjectStatus.ACTIVE)
+            upcoming_deadlines = project_service.get_upcoming_deadline_records(days_ahead=7)
         except Exception as e:
             logger.warning(f"Project features not available: {e}")
     
-    return templates.TemplateResponse("dashboard.html", {
+    return get_templates().TemplateResponse("dashboard.html", {
         "request": request,
         "recent_tasks": recent_tasks,
         "stats": stats,
@@ -186,14 +287,21 @@ def dashboard(request: Request, db: Session = Depends(get_db)):
     })
 
 @app.get("/tasks", response_class=HTMLResponse)
-def tasks_page(request: Request, db: Session = Depends(get_db)):
+def tasks_page(
+    request: Request,
+    tag: Optional[List[str]] = Query(None),
+    tag_mode: str = "any",
+    db: Session = Depends(get_db)
+):
     """Tasks management page"""
+    from smart_scheduler.services.progress_service import overlay
+    from smart_scheduler.services.task_service import TaskService
     
     task_service = TaskService(db)
-    tasks = task_service.get_tasks()
-    tasks_dicts = [task.to_dict() for task in tasks]
+    tasks = task_service.get_task_records(tags=tag, tag_mode="all" if tag_mode == "all" else "any")
+    tasks_dicts = overlay([task.to_dict() for task in tasks])
     
-    return templates.TemplateResponse("tasks.html", {
+    return get_templates().TemplateResponse("tasks.html", {
         "request": request,
         "tasks": tasks_dicts,
         "page_title": "Tasks"
@@ -202,7 +310,7 @@ def tasks_page(request: Request, db: Session = Depends(get_db)):
 @app.get("/schedule", response_class=HTMLResponse)
 def schedule_page(request: Request):
     """Schedule/calendar page"""
-    return templates.TemplateResponse("schedule.html", {
+    return get_templates().TemplateResponse("schedule.html", {
         "request": request,
         "page_title": "Schedule"
     })
@@ -210,16 +318,31 @@ def schedule_page(request: Request):
 @app.get("/api/health")
 def health_check():
     """Health check endpoint"""
+    writer = admission = flight = None
+    if settings.write_serialization:
+        from smart_scheduler.core.writer import get_writer
+        writer = get_writer()
+    if settings.admission_control:
+        from smart_scheduler.core.admission import admission
+    if settings.single_flight:
+        from smart_scheduler.core.single_flight import single_flight as flight
     return {
         "status": "healthy", 
         "service": "Jarvis AI Assistant",
-        "project_features": PROJECT_FEATURES_ENABLED
+        "project_features": PROJECT_FEATURES_ENABLED,
+        # Queue depth and batch sizes of the single writer, when enabled
+        "writer": writer.stats() if writer is not None else None,
+        # Per route class: limits, in flight, queued, shed
+        "admission": admission.stats() if admission is not None else None,
+        "single_flight": flight.stats() if flight is not None else None
     }
 
 # ENHANCED task creation (backward compatible)
 @app.post("/api/tasks", response_model=TaskResponse)
 def create_task(task_data: TaskCreate, db: Session = Depends(get_db)):
     """Create a new task"""
+    from smart_scheduler.services.subtask_service import HierarchyError
+    from smart_scheduler.services.task_service import TaskService
     
     # Convert string priority to enum
     try:
@@ -228,48 +351,39 @@ def create_task(task_data: TaskCreate, db: Session = Depends(get_db)):
         priority_enum = TaskPriority.MEDIUM
     
     task_service = TaskService(db)
-    task = task_service.create_task(
-        title=task_data.title,
-        description=task_data.description,
-        priority=priority_enum,
-        category=task_data.category,
-        estimated_duration=task_data.estimated_duration,
-        # NEW ENHANCED FIELDS (safe - have defaults)
-        due_date=task_data.due_date,
-        scheduled_start_time=task_data.scheduled_start_time,
-        scheduled_end_time=task_data.scheduled_end_time,
-        project_id=task_data.project_id,
-        energy_level_required=task_data.energy_level_required or 3,
-        focus_level_required=task_data.focus_level_required or 3,
-        tags=task_data.tags
-    )
+    try:
+        task = task_service.create_task(
+            title=task_data.title,
+            description=task_data.description,
+            priority=priority_enum,
+            category=task_data.category,
+            estimated_duration=task_data.estimated_duration,
+            # NEW ENHANCED FIELDS (safe - have defaults)
+            due_date=task_data.due_date,
+            scheduled_start_time=task_data.scheduled_start_time,
+            scheduled_end_time=task_data.scheduled_end_time,
+            project_id=task_data.project_id,
+            energy_level_required=task_data.energy_level_required or 3,
+            focus_level_required=task_data.focus_level_required or 3,
+            tags=task_data.tags,
+            parent_id=task_data.parent_id
+        )
+    except HierarchyError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return TaskResponse(
-        id=task.id,
-        title=task.title,
-        description=task.description,
-        status=task.status.value,
-        priority=task.priority.value,
-        category=task.category,
-        estimated_duration=task.estimated_duration,
-        progress_percentage=task.progress_percentage,
-        created_at=task.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-        # NEW ENHANCED FIELDS
-        actual_duration=getattr(task, 'actual_duration', None),
-        scheduled_start_time=format_datetime(getattr(task, 'scheduled_start_time', None)),
-        scheduled_end_time=format_datetime(getattr(task, 'scheduled_end_time', None)),
-        due_date=format_datetime(getattr(task, 'due_date', None)),
-        project_id=getattr(task, 'project_id', None),
-        energy_level_required=getattr(task, 'energy_level_required', 3),
-        focus_level_required=getattr(task, 'focus_level_required', 3)
-    )
+    return task_response(task)
 
 @app.patch("/api/tasks/{task_id}/complete")
-def complete_task(task_id: int, db: Session = Depends(get_db)):
+def complete_task(task_id: int, if_match: Optional[str] = Header(None), db: Session = Depends(get_db)):
     """Mark a task as completed"""
+    from smart_scheduler.services.task_service import TaskService
     
     task_service = TaskService(db)
-    task = task_service.update_task_status(task_id, TaskStatus.COMPLETED)
+    try:
+        task = task_service.update_task_status(task_id, TaskStatus.COMPLETED,
+                                               expected_version=parse_if_match(if_match))
+    except VersionConflict as e:
+        raise conflict(e)
     
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -277,29 +391,36 @@ def complete_task(task_id: int, db: Session = Depends(get_db)):
     return {"message": f"Task {task_id} marked as completed", "task_id": task_id}
 
 @app.delete("/api/tasks/{task_id}")
-def delete_task(task_id: int, db: Session = Depends(get_db)):
+def delete_task(task_id: int, if_match: Optional[str] = Header(None), db: Session = Depends(get_db)):
     """Delete a task"""
+    from smart_scheduler.services.task_service import TaskService
     
     task_service = TaskService(db)
-    success = task_service.delete_task(task_id)
+    try:
+        success = task_service.delete_task(task_id, expected_version=parse_if_match(if_match))
+    except VersionConflict as e:
+        raise conflict(e)
     
     if not success:
         raise HTTPException(status_code=404, detail="Task not found")
     
     return {"message": f"Task {task_id} deleted successfully", "task_id": task_id}
 
-@app.get("/api/stats")
-def get_stats(db: Session = Depends(get_db)):
-    """Get task statistics"""
+@app.get("/api/stats", dependencies=[Depends(pending_progress_written)])
+def get_stats(include_archived: bool = False, db: Session = Depends(get_db)):
+    """Get task statistics; include_archived also counts archived tasks"""
+    from smart_scheduler.services.task_service import TaskService
     
     task_service = TaskService(db)
-    stats = task_service.get_task_stats()
+    stats = task_service.get_task_stats(include_archived)
     
     return stats
 
 @app.put("/api/tasks/{task_id}", response_model=TaskResponse)
-def update_task(task_id: int, task_data: TaskCreate, db: Session = Depends(get_db)):
-    """Update an existing task"""
+def update_task(task_id: int, task_data: TaskCreate, if_match: Optional[str] = Header(None),
+                db: Session = Depends(get_db)):
+    """Update an existing task; with If-Match, only if it is still at that version"""
+    from smart_scheduler.services.task_service import TaskService
     
     # Convert string priority to enum
     try:
@@ -308,49 +429,37 @@ def update_task(task_id: int, task_data: TaskCreate, db: Session = Depends(get_d
         priority_enum = TaskPriority.MEDIUM
     
     task_service = TaskService(db)
-    task = task_service.update_task(
-        task_id=task_id,
-        title=task_data.title,
-        description=task_data.description,
-        priority=priority_enum,
-        category=task_data.category,
-        estimated_duration=task_data.estimated_duration,
-        # NEW ENHANCED FIELDS
-        due_date=task_data.due_date,
-        scheduled_start_time=task_data.scheduled_start_time,
-        scheduled_end_time=task_data.scheduled_end_time,
-        project_id=task_data.project_id,
-        tags=task_data.tags
-    )
+    try:
+        task = task_service.update_task(
+            task_id=task_id,
+            expected_version=parse_if_match(if_match),
+            title=task_data.title,
+            description=task_data.description,
+            priority=priority_enum,
+            category=task_data.category,
+            estimated_duration=task_data.estimated_duration,
+            # NEW ENHANCED FIELDS
+            due_date=task_data.due_date,
+            scheduled_start_time=task_data.scheduled_start_time,
+            scheduled_end_time=task_data.scheduled_end_time,
+            project_id=task_data.project_id,
+            tags=task_data.tags
+        )
+    except VersionConflict as e:
+        raise conflict(e)
     
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return TaskResponse(
-        id=task.id,
-        title=task.title,
-        description=task.description,
-        status=task.status.value,
-        priority=task.priority.value,
-        category=task.category,
-        estimated_duration=task.estimated_duration,
-        progress_percentage=task.progress_percentage,
-        created_at=task.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-        # NEW ENHANCED FIELDS
-        actual_duration=getattr(task, 'actual_duration', None),
-        scheduled_start_time=format_datetime(getattr(task, 'scheduled_start_time', None)),
-        scheduled_end_time=format_datetime(getattr(task, 'scheduled_end_time', None)),
-        due_date=format_datetime(getattr(task, 'due_date', None)),
-        project_id=getattr(task, 'project_id', None),
-        energy_level_required=getattr(task, 'energy_level_required', 3),
-        focus_level_required=getattr(task, 'focus_level_required', 3)
-    )
+    return task_response(task)
 
 # NEW PROJECT API ROUTES (only if enabled)
 if PROJECT_FEATURES_ENABLED:
     @app.post("/api/projects", response_model=ProjectResponse)
     def create_project(project_data: ProjectCreate, db: Session = Depends(get_db)):
         """Create a new project"""
+        from smart_scheduler.core.serialization import FastJSONResponse, object_dict
+        from smart_scheduler.services.project_service import ProjectService
         
         project_service = ProjectService(db)
         project = project_service.create_project(
@@ -361,16 +470,7 @@ if PROJECT_FEATURES_ENABLED:
             color=project_data.color
         )
         
-        return ProjectResponse(
-            id=project.id,
-            name=project.name,
-            description=project.description,
-            status=project.status.value,
-            start_date=project.start_date.isoformat() if project.start_date else None,
-            deadline=project.deadline.isoformat(),
-            progress_percentage=project.progress_percentage,
-            color=project.color
-        )
+        return FastJSONResponse(object_dict(project, PROJECT_FIELDS))
 
     @app.get("/api/projects", response_model=List[ProjectResponse])
     def get_projects(
@@ -379,6 +479,9 @@ if PROJECT_FEATURES_ENABLED:
         db: Session = Depends(get_db)
     ):
         """Get all projects"""
+        from smart_scheduler.core.serialization import FastJSONResponse, row_dicts
+        from smart_scheduler.models.project import Project, ProjectStatus
+        from smart_scheduler.services.project_service import ProjectService
         
         project_service = ProjectService(db)
         
@@ -389,51 +492,59 @@ if PROJECT_FEATURES_ENABLED:
             except ValueError:
                 raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
         
-        projects = project_service.get_projects(status=status_filter, include_completed=include_completed)
+        stmt = project_service.projects_statement(status=status_filter, include_completed=include_completed)
         
-        return [
-            ProjectResponse(
-                id=project.id,
-                name=project.name,
-                description=project.description,
-                status=project.status.value,
-                start_date=project.start_date.isoformat() if project.start_date else None,
-                deadline=project.deadline.isoformat(),
-                progress_percentage=project.progress_percentage,
-                color=project.color
-            )
-            for project in projects
-        ]
+        # Column-only read; dates/enums are rendered by the JSON encoder
+        return FastJSONResponse(row_dicts(db, PROJECT_FIELDS, Project, stmt))
 
     @app.get("/api/projects/deadlines", response_model=List[ProjectResponse])
     def get_upcoming_deadlines(days_ahead: int = 7, db: Session = Depends(get_db)):
         """Get projects with upcoming deadlines"""
+        from smart_scheduler.core.serialization import FastJSONResponse, row_dicts
+        from smart_scheduler.models.project import Project
+        from smart_scheduler.services.project_service import ProjectService
         
         project_service = ProjectService(db)
-        projects = project_service.get_upcoming_deadlines(days_ahead=days_ahead)
+        stmt = project_service.upcoming_deadlines_statement(days_ahead=days_ahead)
+        
+        return FastJSONResponse(row_dicts(db, PROJECT_FIELDS, Project, stmt))
+
+    @app.post("/api/projects/forecast")
+    def forecast_projects(db: Session = Depends(get_db)):
+        """Batch job: re-forecast estimated_completion for every open project"""
+        from smart_scheduler.core.serialization import FastJSONResponse
+        from smart_scheduler.services.forecast_service import ForecastService, reset_model
         
-        return [
-            ProjectResponse(
-                id=project.id,
-                name=project.name,
-                description=project.description,
-                status=project.status.value,
-                start_date=project.start_date.isoformat() if project.start_date else None,
-                deadline=project.deadline.isoformat(),
-                progress_percentage=project.progress_percentage,
-                color=project.color
-            )
-            for project in projects
-        ]
+        reset_model()  # relearn ratios and throughput from the full history
+        service = ForecastService(db)
+        forecasts = service.forecast()
+        db.commit()
+        
+        return FastJSONResponse({
+            "model": service.get_model_summary(),
+            "forecasts": [
+                {"project_id": project_id, "estimated_completion": when}
+                for project_id, when in forecasts.items()
+            ],
+        })
+
+    @app.get("/api/projects/forecast/model")
+    def forecast_model(db: Session = Depends(get_db)):
+        """The cached forecast parameters"""
+        from smart_scheduler.core.serialization import FastJSONResponse
+        from smart_scheduler.services.forecast_service import ForecastService
+        
+        return FastJSONResponse(ForecastService(db).get_model_summary())
 
     @app.get("/projects", response_class=HTMLResponse)
     def projects_page(request: Request, db: Session = Depends(get_db)):
         """Projects management page"""
+        from smart_scheduler.services.project_service import ProjectService
         
         project_service = ProjectService(db)
-        projects = project_service.get_projects()
+        projects = project_service.get_project_records()
         
-        return templates.TemplateResponse("projects.html", {
+        return get_templates().TemplateResponse("projects.html", {
             "request": request,
             "projects": projects,
             "page_title": "Projects"
@@ -444,9 +555,11 @@ if PROJECT_FEATURES_ENABLED:
 def reschedule_task(
     task_id: int,
     new_start_time: datetime,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
     """Reschedule a task to a new time"""
+    from smart_scheduler.services.task_service import TaskService
     
     task_service = TaskService(db)
     
@@ -460,29 +573,31 @@ def reschedule_task(
     new_end_time = new_start_time + timedelta(minutes=duration)
     
     # Update the task
-    updated_task = task_service.update_task(
-        task_id,
-        scheduled_start_time=new_start_time,
-        scheduled_end_time=new_end_time
-    )
-    
-    if not updated_task:
-        raise HTTPException(status_code=400, detail="Failed to reschedule task")
-    
-    # Update status to scheduled if it was pending
-    if updated_task.status == TaskStatus.PENDING:
-        task_service.update_task_status(task_id, TaskStatus.SCHEDULED)
+    try:
+        updated_task = task_service.update_task(
+            task_id,
+            expected_version=parse_if_match(if_match),
+            scheduled_start_time=new_start_time,
+            scheduled_end_time=new_end_time
+        )
+        if not updated_task:
+            raise HTTPException(status_code=400, detail="Failed to reschedule task")
+        
+        # Update status to scheduled if it was pending
+        if updated_task.status == TaskStatus.PENDING:
+            task_service.update_task_status(task_id, TaskStatus.SCHEDULED, expected_version=updated_task.version)
+    except VersionConflict as e:
+        raise conflict(e)
     
     return {"message": "Task rescheduled successfully", "task_id": task_id}
 
 @app.post("/api/tasks/{task_id}/start")
 def start_task(task_id: int, db: Session = Depends(get_db)):
     """Start working on a task"""
+    from smart_scheduler.services.progress_service import ProgressService
     
-    task_service = TaskService(db)
-    task = task_service.update_task_status(task_id, TaskStatus.IN_PROGRESS)
-    
-    if not task:
+    # Written behind, with other start/pause/progress updates
+    if not ProgressService(db).set_running(task_id, True):
         raise HTTPException(status_code=404, detail="Task not found")
     
     return {
@@ -494,11 +609,9 @@ def start_task(task_id: int, db: Session = Depends(get_db)):
 @app.post("/api/tasks/{task_id}/pause")
 def pause_task(task_id: int, db: Session = Depends(get_db)):
     """Pause the current task"""
+    from smart_scheduler.services.progress_service import ProgressService
     
-    task_service = TaskService(db)
-    task = task_service.update_task_status(task_id, TaskStatus.PENDING)
-    
-    if not task:
+    if not ProgressService(db).set_running(task_id, False):
         raise HTTPException(status_code=404, detail="Task not found")
     
     return {
@@ -506,15 +619,56 @@ def pause_task(task_id: int, db: Session = Depends(get_db)):
         "task_id": task_id
     }
 
-# Import the deadline router
-from smart_scheduler.api.routes import deadline_router, schedule_router, notification_router, task_router
-app.include_router(deadline_router)
-app.include_router(schedule_router)
-app.include_router(notification_router)
-app.include_router(task_router)
-
-def run_server():
-    """Run the FastAPI server with proper import string for reload"""
+@lru_cache(maxsize=None)
+def include_routers():
+    """Mount the static files and the API routers, once; called from the lifespan, after the routes above"""
+    from fastapi.staticfiles import StaticFiles
+    from smart_scheduler.api.routes import deadline_router, schedule_router, notification_router, task_router, search_router, dependency_router, report_router, sync_router, admin_router
+
+    app.mount("/static", StaticFiles(directory="smart_scheduler/static"), name="static")
+    app.include_router(deadline_router)
+    app.include_router(schedule_router)
+    app.include_router(notification_router)
+    app.include_router(task_router)
+    app.include_router(search_router)
+    app.include_router(dependency_router)
+    app.include_router(report_router)
+    app.include_router(sync_router)
+    app.include_router(admin_router)
+
+def prewarm():
+    """Pay the first-request costs up front: NumPy and the ranking heap, templates, a pooled connection"""
+    from smart_scheduler.services.ranking_service import RankingService
+    from smart_scheduler.services.task_service import TaskService
+
+    db = SessionLocal()
+    try:
+        RankingService(db).next_tasks(limit=1)
+        TaskService(db).get_task_stats()
+    finally:
+        db.close()
+    for name in ("dashboard.html", "tasks.html", "schedule.html"):
+        get_templates().get_template(name)
+    logger.info("✅ Worker pre-warmed")
+
+def run_server(production: Optional[bool] = None):
+    """Run the FastAPI server with proper import string for reload.
+
+    `production` defaults to ENVIRONMENT=production: WORKERS processes, no
+    reload, uvloop/httptools and the tuning from Settings. uvicorn stops
+    gracefully on SIGTERM - no new connections, in-flight requests get
+    graceful_shutdown_seconds, then each worker's shutdown hooks run.
+    """
+    import os
+    import uvicorn
+
+    if production is None:
+        production = is_production()
+    elif production:
+        # Workers are fresh processes that read their settings from the environment
+        os.environ["ENVIRONMENT"] = settings.environment = "production"
+
+    logging.basicConfig(level=logging.INFO)
     logger.info("🚀 Starting Jarvis AI Assistant server...")
     logger.info(f"📍 Dashboard: http://{settings.host}:{settings.port}/")
     logger.info(f"📋 Tasks: http://{settings.host}:{settings.port}/tasks")
@@ -523,13 +677,15 @@ def run_server():
         logger.info(f"📊 Projects: http://{settings.host}:{settings.port}/projects")
     logger.info("🎉 Enhanced features: Time scheduling, project management!")
     
+    options = server_options(production)
+    if production:
+        logger.info(f"🏭 Production profile: {options['workers']} workers, {options['loop']} + {options['http']}")
+        # Check (or create) the schema once here, not in every worker at the same time
+        ensure_schema()
+    
     uvicorn.run(
-        "smart_scheduler.main:app",  # Use import string for reload
-        host=settings.host,
-        port=settings.port,
-        reload=settings.debug,
-        log_level=settings.log_level.lower(),
-        access_log=True
+        "smart_scheduler.main:app",  # Use import string for reload and workers
+        **options
     )
 
 if __name__ == "__main__":
@@ -2,14 +2,22 @@ from .task import Task, TaskStatus, TaskPriority
 from .user import User
 from .deadline import Deadline, DeadlineType, DeadlineRecurrence
 from .notification import Notification
+from .task_tag import TaskTag
+from .task_closure import TaskClosure
+from .task_dependency import TaskDependency
+from .work_session import WorkSession, DailyTimeTotal
+from .daily_load import DailyLoad
+from .change_log import ChangeLog, ChangeLogHorizon
+from .archive import TaskArchive, TaskArchiveTag, DeadlineArchive
+from . import search  # registers the FTS5 index with Base.metadata
 
 __all__ = [
-    "Task", "TaskStatus", "TaskPriority", "User", "Deadline", "DeadlineType", "DeadlineRecurrence"
+    "Task", "TaskStatus", "TaskPriority", "User", "Deadline", "DeadlineType", "DeadlineRecurrence", "TaskTag", "TaskClosure", "TaskDependency", "WorkSession", "DailyTimeTotal", "DailyLoad", "ChangeLog", "ChangeLogHorizon", "TaskArchive", "TaskArchiveTag", "DeadlineArchive"
 ]
 try:
     from .project import Project, ProjectStatus
     __all__ = [
-        "Task", "TaskStatus", "TaskPriority", "User", "Project", "ProjectStatus", "Deadline", "DeadlineType", "DeadlineRecurrence"
+        "Task", "TaskStatus", "TaskPriority", "User", "Project", "ProjectStatus", "Deadline", "DeadlineType", "DeadlineRecurrence", "TaskTag", "TaskClosure", "TaskDependency", "WorkSession", "DailyTimeTotal", "DailyLoad", "ChangeLog", "ChangeLogHorizon", "TaskArchive", "TaskArchiveTag", "DeadlineArchive"
     ]
 except ImportError:
     pass
\ No newline at end of file
@@ -0,0 +1,60 @@
+# smart_scheduler/models/archive.py - Cold storage for finished tasks and deadlines
+#
+# ArchiveService moves long-finished tasks and deadlines out of the live
+# tables into these. They have the live tables' columns and types, plus
+# archived_at, so rows move with one INSERT ... SELECT and are read with
+# the same statements. There are no search or change-log triggers on them:
+# archived rows are only read when a request asks for them. The tags of
+# archived tasks move along into task_tags_archive.
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Table
+
+from smart_scheduler.core.database import Base
+from smart_scheduler.models.deadline import Deadline
+from smart_scheduler.models.task import Task
+
+def _archive_table(source: Table, name: str, *indexes) -> Table:
+    """`source`'s columns without their defaults and indexes, plus archived_at"""
+    columns = [
+        Column(column.name, column.type.copy(), primary_key=column.primary_key, nullable=column.nullable)
+        for column in source.columns
+    ]
+    archived_at = Column("archived_at", DateTime, nullable=False, default=datetime.utcnow)
+    return Table(name, Base.metadata, *columns, archived_at, *indexes)
+
+class TaskArchive(Base):
+    """Archived tasks; ids are the ids they had in tasks"""
+    __table__ = _archive_table(
+        Task.__table__, "tasks_archive",
+        # Newest-first listings and per-project progress counts
+        Index("ix_tasks_archive_created_at", "created_at"),
+        Index("ix_tasks_archive_project_id", "project_id"),
+    )
+
+    def __repr__(self):
+        return f"<TaskArchive(id={self.id}, title='{self.title}', status='{self.status}')>"
+
+class TaskArchiveTag(Base):
+    """task_tags rows of archived tasks, for tag filters over the archive"""
+    __tablename__ = "task_tags_archive"
+
+    task_id = Column(Integer, primary_key=True)
+    tag = Column(String, primary_key=True)
+
+    __table_args__ = (
+        Index("ix_task_tags_archive_tag_task_id", "tag", "task_id"),
+    )
+
+    def __repr__(self):
+        return f"<TaskArchiveTag(task_id={self.task_id}, tag='{self.tag}')>"
+
+class DeadlineArchive(Base):
+    """Archived deadlines; ids are the ids they had in deadlines"""
+    __table__ = _archive_table(
+        Deadline.__table__, "deadlines_archive",
+        Index("ix_deadlines_archive_due_date", "due_date"),
+    )
+
+    def __repr__(self):
+        return f"<DeadlineArchive(id={self.id}, title='{self.title}', due_date='{self.due_date}')>"
@@ -0,0 +1,89 @@
+# smart_scheduler/models/change_log.py - Change feed for delta sync
+#
+# Triggers on the synced tables record every insert, update and delete in
+# change_log, inside the same transaction as the write itself - including
+# bulk Core statements and raw SQL that never pass through a service. Each
+# entity keeps only its latest row (older ones are replaced), so the log is
+# bounded by the number of entities; deletes leave a tombstone until
+# compaction removes it.
+from sqlalchemy import Column, DateTime, Index, Integer, String, event, text
+from smart_scheduler.core.database import Base
+
+# table -> entity name used in the log and in /api/sync responses
+SYNCED_TABLES = {
+    "tasks": "task",
+    "deadlines": "deadline",
+    "projects": "project",
+    "notifications": "notification",
+}
+
+class ChangeLog(Base):
+    """Latest change per entity, ordered by a sequence that never goes back"""
+    __tablename__ = "change_log"
+
+    # AUTOINCREMENT: a replaced row's seq is never handed out again, so a
+    # client that has seen seq N can't miss a change stamped N later
+    seq = Column(Integer, primary_key=True)
+    entity = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String, nullable=False)  # 'upsert' or 'delete' (tombstone)
+    changed_at = Column(DateTime, nullable=False, server_default=text("CURRENT_TIMESTAMP"))
+
+    __table_args__ = (
+        Index("ix_change_log_entity", "entity_id", "entity", unique=True),
+        {"sqlite_autoincrement": True},
+    )
+
+    def __repr__(self):
+        return f"<ChangeLog(seq={self.seq}, entity='{self.entity}', entity_id={self.entity_id}, op='{self.op}')>"
+
+class ChangeLogHorizon(Base):
+    """Single row: the highest seq removed by compaction.
+
+    Clients that last synced before it may have missed a tombstone and
+    have to start over from seq 0.
+    """
+    __tablename__ = "change_log_horizon"
+
+    id = Column(Integer, primary_key=True)
+    seq = Column(Integer, nullable=False, default=0)
+
+def _log_statement(entity: str, row: str, op: str) -> str:
+    return (
+        f"DELETE FROM change_log WHERE entity = '{entity}' AND entity_id = {row}.id; "
+        f"INSERT INTO change_log (entity, entity_id, op, changed_at) "
+        f"VALUES ('{entity}', {row}.id, '{op}', CURRENT_TIMESTAMP);"
+    )
+
+def _trigger_statements(table: str, entity: str) -> list:
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_log_ai AFTER INSERT ON {table} BEGIN "
+        f"{_log_statement(entity, 'new', 'upsert')} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_log_au AFTER UPDATE ON {table} BEGIN "
+        f"{_log_statement(entity, 'new', 'upsert')} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_log_ad AFTER DELETE ON {table} BEGIN "
+        f"{_log_statement(entity, 'old', 'delete')} END",
+    ]
+
+def install_change_log(connection, backfill: bool = False):
+    """Create the change-log triggers; `backfill` logs every existing row as an upsert"""
+    for table, entity in SYNCED_TABLES.items():
+        for statement in _trigger_statements(table, entity):
+            connection.execute(text(statement))
+        if backfill:
+            connection.execute(text(
+                f"INSERT OR IGNORE INTO change_log (entity, entity_id, op, changed_at) "
+                f"SELECT '{entity}', id, 'upsert', CURRENT_TIMESTAMP FROM {table} ORDER BY id"
+            ))
+
+def drop_change_log(connection):
+    for table in SYNCED_TABLES:
+        for suffix in ("ai", "au", "ad"):
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {table}_log_{suffix}"))
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_change_log_triggers(target, connection, **kw):
+    # Triggers are SQLite syntax. Backfilling is idempotent, and it covers
+    # rows written before the log existed when create_all() upgrades a database
+    if connection.dialect.name == "sqlite":
+        install_change_log(connection, backfill=True)
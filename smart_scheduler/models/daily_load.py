@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Date
+from smart_scheduler.core.database import Base
+
+class DailyLoad(Base):
+    """Precomputed workload per day, project and task category.
+
+    Maintained incrementally by WorkloadService on task and deadline
+    writes, so the calendar heatmap is a single range read on the primary
+    key, which leads with the day.
+    """
+    __tablename__ = "daily_load"
+
+    day = Column(Date, primary_key=True)
+    project_id = Column(Integer, primary_key=True, default=0)  # 0 = no project
+    category = Column(String, primary_key=True, default="")  # "" = uncategorized (and all deadlines)
+    scheduled_minutes = Column(Integer, nullable=False, default=0)
+    due_count = Column(Integer, nullable=False, default=0)  # tasks due that day
+    deadline_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DailyLoad(day={self.day}, project_id={self.project_id}, category='{self.category}', scheduled_minutes={self.scheduled_minutes})>"
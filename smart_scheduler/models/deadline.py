@@ -40,5 +40,11 @@ class Deadline(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Optimistic concurrency, as on Task
+    version = Column(Integer, default=1, server_default="1", nullable=False)
+    # Ids are never handed out twice, as on Task
+    __table_args__ = {"sqlite_autoincrement": True}
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self):
         return f"<Deadline(id={self.id}, title='{self.title}', due_date='{self.due_date}', completed={self.completed})>" 
\ No newline at end of file
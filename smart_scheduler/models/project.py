@@ -37,5 +37,9 @@ class Project(Base):
     # Color coding for calendar
     color = Column(String, default="#3B82F6")
     
+    # Optimistic concurrency, as on Task
+    version = Column(Integer, default=1, server_default="1", nullable=False)
+    __mapper_args__ = {"version_id_col": version}
+    
     def __repr__(self):
         return f"<Project(id={self.id}, name='{self.name}', deadline='{self.deadline}')>"
\ No newline at end of file
@@ -0,0 +1,110 @@
+# smart_scheduler/models/records.py - Read-only row records for list pages
+#
+# Listing pages only read a handful of attributes, so they don't need ORM
+# instances with identity-map tracking, change detection and lazy loading.
+# These NamedTuples are filled straight from column-only select()s. They
+# are immutable, have no per-instance __dict__, and expose the same
+# attribute names as the models, so templates work with either.
+# Writes still go through the ORM models.
+from datetime import date, datetime
+from typing import List, NamedTuple, Optional, Type, TypeVar
+
+from sqlalchemy.orm import Session
+
+from smart_scheduler.models.task import Task, TaskStatus, TaskPriority, TaskRecurrence
+from smart_scheduler.models.project import Project, ProjectStatus
+from smart_scheduler.models.deadline import Deadline, DeadlineType, DeadlineRecurrence
+
+R = TypeVar("R")
+
+def load_records(db: Session, record_cls: Type[R], model, stmt) -> List[R]:
+    """Run `stmt` selecting only record_cls's fields and wrap each row"""
+    columns = [getattr(model, field) for field in record_cls._fields]
+    make = record_cls._make
+    return [make(row) for row in db.execute(stmt.with_only_columns(*columns))]
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+class TaskRecord(NamedTuple):
+    id: int
+    title: str
+    description: Optional[str]
+    status: TaskStatus
+    priority: TaskPriority
+    category: Optional[str]
+    tags: Optional[str]
+    estimated_duration: Optional[int]
+    actual_duration: Optional[int]
+    progress_percentage: float
+    created_at: datetime
+    updated_at: Optional[datetime]
+    due_date: Optional[datetime]
+    completed_at: Optional[datetime]
+    scheduled_start_time: Optional[datetime]
+    scheduled_end_time: Optional[datetime]
+    project_id: Optional[int]
+    recurrence: TaskRecurrence
+    recurrence_end_date: Optional[date]
+    energy_level_required: Optional[int]
+    focus_level_required: Optional[int]
+    parent_id: Optional[int]
+
+    def to_dict(self):
+        """Same shape as Task.to_dict()"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "priority": self.priority.value if self.priority is not None else None,
+            "category": self.category,
+            "estimated_duration": self.estimated_duration,
+            "due_date": _isoformat(self.due_date),
+            "status": self.status.value if self.status is not None else None,
+            "progress_percentage": self.progress_percentage,
+            "created_at": _isoformat(self.created_at),
+            "actual_duration": self.actual_duration,
+            "completed_at": _isoformat(self.completed_at),
+            "tags": self.tags,
+            "updated_at": _isoformat(self.updated_at),
+            "scheduled_start_time": _isoformat(self.scheduled_start_time),
+            "scheduled_end_time": _isoformat(self.scheduled_end_time),
+            "project_id": self.project_id,
+            "recurrence": self.recurrence.value if self.recurrence is not None else None,
+            "recurrence_end_date": _isoformat(self.recurrence_end_date),
+            "energy_level_required": self.energy_level_required,
+            "focus_level_required": self.focus_level_required,
+            "parent_id": self.parent_id
+        }
+
+class TaskCalendarRecord(NamedTuple):
+    """Just what the schedule view needs for a task"""
+    id: int
+    title: str
+    due_date: datetime
+    status: TaskStatus
+    category: Optional[str]
+    project_id: Optional[int]
+    recurrence: TaskRecurrence
+
+class ProjectRecord(NamedTuple):
+    id: int
+    name: str
+    description: Optional[str]
+    status: ProjectStatus
+    start_date: Optional[date]
+    deadline: datetime
+    estimated_completion: Optional[datetime]
+    progress_percentage: float
+    color: Optional[str]
+
+class DeadlineRecord(NamedTuple):
+    """Just what the schedule view and analytics need for a deadline"""
+    id: int
+    title: str
+    type: DeadlineType
+    due_date: datetime
+    completed: bool
+    color: Optional[str]
+    project_id: Optional[int]
+    recurrence: DeadlineRecurrence
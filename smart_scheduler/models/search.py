@@ -0,0 +1,60 @@
+# smart_scheduler/models/search.py - SQLite FTS5 full-text index
+#
+# External-content FTS5 tables mirror the searchable text columns of
+# tasks, deadlines and projects. The text itself stays in the base tables;
+# the FTS tables only hold the inverted index, kept in sync by triggers.
+from sqlalchemy import event, text
+from smart_scheduler.core.database import Base
+
+# table -> (fts table, indexed columns)
+SEARCH_INDEXES = {
+    "tasks": ("tasks_fts", ("title", "description", "tags", "category")),
+    "deadlines": ("deadlines_fts", ("title", "description")),
+    "projects": ("projects_fts", ("name", "description")),
+}
+
+def _index_statements(table: str, fts: str, columns) -> list:
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END",
+        # Only text edits touch the index - status/progress updates skip it
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+    ]
+
+def install_search_index(connection, rebuild: bool = False):
+    """Create the FTS tables and sync triggers.
+
+    Newly created indexes are filled from the existing rows; `rebuild`
+    forces that for indexes that already exist too.
+    """
+    for table, (fts, columns) in SEARCH_INDEXES.items():
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": fts},
+        ).first()
+        for statement in _index_statements(table, fts, columns):
+            connection.execute(text(statement))
+        if rebuild or not exists:
+            connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+def drop_search_index(connection):
+    for fts, _ in SEARCH_INDEXES.values():
+        for suffix in ("ai", "ad", "au"):
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {fts}_{suffix}"))
+        connection.execute(text(f"DROP TABLE IF EXISTS {fts}"))
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection, **kw):
+    # FTS5 is SQLite-only; other backends simply have no search index
+    if connection.dialect.name == "sqlite":
+        install_search_index(connection)
@@ -1,5 +1,5 @@
 # smart_scheduler/models/task.py - ENHANCED VERSION
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, Time, Date
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, Time, Date, Index
 from sqlalchemy.orm import relationship
 from smart_scheduler.core.database import Base
 from datetime import datetime, time, date
@@ -67,30 +67,71 @@ class Task(Base):
     energy_level_required = Column(Integer, default=3)  # 1-5 scale
     focus_level_required = Column(Integer, default=3)   # 1-5 scale
     
+    # Subtasks (hierarchy is mirrored in task_closure)
+    parent_id = Column(Integer, nullable=True)
+    
+    # Rollups over all descendants, excluding the task itself.
+    # Maintained incrementally by SubtaskService.
+    descendant_count = Column(Integer, default=0, server_default="0", nullable=False)
+    descendant_completed_count = Column(Integer, default=0, server_default="0", nullable=False)
+    descendant_estimated_duration = Column(Integer, default=0, server_default="0", nullable=False)
+    descendant_actual_duration = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    # Dependency graph: minutes of remaining work that must finish before
+    # this task can start (longest predecessor chain). 0 without open
+    # predecessors; maintained incrementally by DependencyService.
+    earliest_start = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    # Optimistic concurrency: the ORM bumps this on every UPDATE and adds
+    # "AND version = ?" to the WHERE clause (and to DELETEs), so a write
+    # based on a stale read matches no row instead of overwriting.
+    # Bulk Core updates of derived columns (rollups, earliest_start) leave it alone.
+    version = Column(Integer, default=1, server_default="1", nullable=False)
+    
+    __table_args__ = (
+        # Same name migrate_database.py has always used for this index
+        Index("idx_tasks_parent_id", "parent_id"),
+        # Per-project makespan (critical path length) aggregates
+        Index("idx_tasks_project_id", "project_id"),
+        # Ids are never handed out twice, even after the newest task is
+        # deleted or archived: task_tags, the archive and clients key on them
+        {"sqlite_autoincrement": True},
+    )
+    __mapper_args__ = {"version_id_col": version}
+    
     def __repr__(self):
         return f"<Task(id={self.id}, title='{self.title}', status='{self.status}')>"
 
     def to_dict(self):
+        # Plain attribute reads: every column is loaded, so the getattr()
+        # fallbacks and per-field conditionals only cost time
         return {
-            "id": getattr(self, "id", None),
-            "title": getattr(self, "title", None),
-            "description": getattr(self, "description", None),
-            "priority": self.priority.value if getattr(self, "priority", None) is not None else None,
-            "category": getattr(self, "category", None),
-            "estimated_duration": getattr(self, "estimated_duration", None),
-            "due_date": self.due_date.isoformat() if getattr(self, "due_date", None) is not None else None,
-            "status": self.status.value if getattr(self, "status", None) is not None else None,
-            "progress_percentage": getattr(self, "progress_percentage", None),
-            "created_at": self.created_at.isoformat() if getattr(self, "created_at", None) is not None else None,
-            "actual_duration": getattr(self, "actual_duration", None),
-            "completed_at": self.completed_at.isoformat() if getattr(self, "completed_at", None) is not None else None,
-            "tags": getattr(self, "tags", None),
-            "updated_at": self.updated_at.isoformat() if getattr(self, "updated_at", None) is not None else None,
-            "scheduled_start_time": self.scheduled_start_time.isoformat() if getattr(self, "scheduled_start_time", None) is not None else None,
-            "scheduled_end_time": self.scheduled_end_time.isoformat() if getattr(self, "scheduled_end_time", None) is not None else None,
-            "project_id": getattr(self, "project_id", None),
-            "recurrence": self.recurrence.value if getattr(self, "recurrence", None) is not None else None,
-            "recurrence_end_date": self.recurrence_end_date.isoformat() if getattr(self, "recurrence_end_date", None) is not None else None,
-            "energy_level_required": getattr(self, "energy_level_required", None),
-            "focus_level_required": getattr(self, "focus_level_required", None)
-        }
\ No newline at end of file
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "priority": _enum_value(self.priority),
+            "category": self.category,
+            "estimated_duration": self.estimated_duration,
+            "due_date": _isoformat(self.due_date),
+            "status": _enum_value(self.status),
+            "progress_percentage": self.progress_percentage,
+            "created_at": _isoformat(self.created_at),
+            "actual_duration": self.actual_duration,
+            "completed_at": _isoformat(self.completed_at),
+            "tags": self.tags,
+            "updated_at": _isoformat(self.updated_at),
+            "scheduled_start_time": _isoformat(self.scheduled_start_time),
+            "scheduled_end_time": _isoformat(self.scheduled_end_time),
+            "project_id": self.project_id,
+            "recurrence": _enum_value(self.recurrence),
+            "recurrence_end_date": _isoformat(self.recurrence_end_date),
+            "energy_level_required": self.energy_level_required,
+            "focus_level_required": self.focus_level_required,
+            "parent_id": self.parent_id
+        }
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+def _enum_value(value):
+    return value.value if value is not None else None
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, Index
+from smart_scheduler.core.database import Base
+
+class TaskClosure(Base):
+    """Closure table for the subtask hierarchy.
+
+    One row for every (ancestor, descendant) pair with depth >= 1, so a
+    whole subtree or ancestor chain is a single indexed lookup. Tasks
+    without parents or children have no rows at all.
+    """
+    __tablename__ = "task_closure"
+
+    ancestor_id = Column(Integer, primary_key=True)
+    descendant_id = Column(Integer, primary_key=True)
+    depth = Column(Integer, nullable=False)  # 1 = direct child
+
+    __table_args__ = (
+        # Ancestor chain lookups (rollup propagation, moves)
+        Index("ix_task_closure_descendant_ancestor", "descendant_id", "ancestor_id"),
+    )
+
+    def __repr__(self):
+        return f"<TaskClosure(ancestor_id={self.ancestor_id}, descendant_id={self.descendant_id}, depth={self.depth})>"
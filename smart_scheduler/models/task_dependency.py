@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, DateTime, Index
+from smart_scheduler.core.database import Base
+from datetime import datetime
+
+class TaskDependency(Base):
+    """Edge predecessor -> successor: the successor can't start before the predecessor is done"""
+    __tablename__ = "task_dependencies"
+
+    predecessor_id = Column(Integer, primary_key=True)  # No FK, matching Task.project_id
+    successor_id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # The primary key serves successor lookups; this serves predecessor lookups
+        Index("ix_task_dependencies_successor_predecessor", "successor_id", "predecessor_id"),
+    )
+
+    def __repr__(self):
+        return f"<TaskDependency(predecessor_id={self.predecessor_id}, successor_id={self.successor_id})>"
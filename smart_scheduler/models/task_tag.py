@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, Index
+from smart_scheduler.core.database import Base
+
+class TaskTag(Base):
+    """One row per (task, tag) - the queryable form of Task.tags"""
+    __tablename__ = "task_tags"
+
+    task_id = Column(Integer, primary_key=True)  # No FK, matching Task.project_id
+    tag = Column(String, primary_key=True)
+
+    __table_args__ = (
+        # Serves tag filters (tag -> task ids) and the GROUP BY tag cloud
+        Index("ix_task_tags_tag_task_id", "tag", "task_id"),
+    )
+
+    def __repr__(self):
+        return f"<TaskTag(task_id={self.task_id}, tag='{self.tag}')>"
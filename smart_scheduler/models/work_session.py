@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, DateTime, Date, Boolean, Index, text
+from smart_scheduler.core.database import Base
+from datetime import datetime
+
+class WorkSession(Base):
+    """One stretch of work on a task.
+
+    Append-only: a row is inserted when work starts and closed exactly
+    once (stopped_at) when it stops. Time reports never scan this table;
+    the rollup job folds closed sessions into Task.actual_duration and
+    DailyTimeTotal and flags them as rolled up.
+    """
+    __tablename__ = "work_sessions"
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False)  # No FK: history outlives deleted tasks
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    stopped_at = Column(DateTime, nullable=True)  # NULL while the session is running
+    rolled_up = Column(Boolean, nullable=False, default=False, server_default="0")
+
+    __table_args__ = (
+        Index("ix_work_sessions_task_id", "task_id"),
+        # Partial index: the rollup job only ever looks at the small
+        # unprocessed tail, however many millions of rows are behind it
+        Index("ix_work_sessions_pending", "id", sqlite_where=text("rolled_up = 0")),
+    )
+
+    def __repr__(self):
+        return f"<WorkSession(id={self.id}, task_id={self.task_id}, started_at={self.started_at}, stopped_at={self.stopped_at})>"
+
+class DailyTimeTotal(Base):
+    """Rolled-up tracked time per day and task category"""
+    __tablename__ = "daily_time_totals"
+
+    day = Column(Date, primary_key=True)
+    category = Column(String, primary_key=True, default="")  # "" = uncategorized
+    seconds = Column(Integer, nullable=False, default=0)
+    sessions = Column(Integer, nullable=False, default=0)  # sessions (or parts of them) that day
+
+    def __repr__(self):
+        return f"<DailyTimeTotal(day={self.day}, category='{self.category}', seconds={self.seconds})>"
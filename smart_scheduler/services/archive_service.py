@@ -0,0 +1,174 @@
+# smart_scheduler/services/archive_service.py - Hot/cold archival of finished work
+#
+# Tasks COMPLETED or CANCELLED, and deadlines completed, more than N days
+# ago move to tasks_archive / deadlines_archive in bounded batches, one
+# transaction each: INSERT ... SELECT into the archive, the bookkeeping a
+# delete does (workload buckets, dependency edges, closure rows), then
+# DELETE from the live table. Tasks move a whole finished subtree at a
+# time, starting from a top-level task, so no live task has an archived
+# parent or subtask and the rollup columns stay exact. Aggregates over
+# history - project progress, the forecast model - also read the archive.
+# Ids come from AUTOINCREMENT sequences, so an archived id is never handed
+# to a new row.
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import delete, exists, func, insert, literal, select
+from sqlalchemy.orm import Session, aliased
+
+from smart_scheduler.models.archive import DeadlineArchive, TaskArchive, TaskArchiveTag
+from smart_scheduler.models.deadline import Deadline
+from smart_scheduler.models.task import Task, TaskStatus
+from smart_scheduler.models.task_closure import TaskClosure
+from smart_scheduler.models.task_dependency import TaskDependency
+from smart_scheduler.models.task_tag import TaskTag
+from smart_scheduler.services.dependency_service import DONE_STATUSES
+from smart_scheduler.services.progress_service import flush_pending
+from smart_scheduler.services.ranking_service import tasks_changed
+from smart_scheduler.services.workload_service import WorkloadService, deadline_load_of, task_load_of
+
+TASK_COLUMNS = [column.name for column in Task.__table__.columns]
+DEADLINE_COLUMNS = [column.name for column in Deadline.__table__.columns]
+
+def _finished_before(model, cutoff: datetime):
+    """Task rows that are done, and were last changed before `cutoff`"""
+    return model.status.in_(DONE_STATUSES) & (func.coalesce(model.completed_at, model.updated_at) < cutoff)
+
+class ArchiveService:
+    """Moves finished tasks and deadlines to the archive tables and reads them back"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _task_roots(self, cutoff: datetime, limit: int, among: Optional[List[int]] = None) -> List[int]:
+        """Top-level tasks whose whole subtree finished before `cutoff`"""
+        descendant = aliased(Task)
+        stays = exists().where(
+            TaskClosure.ancestor_id == Task.id,
+            descendant.id == TaskClosure.descendant_id,
+            ~_finished_before(descendant, cutoff),
+        )
+        stmt = select(Task.id).where(Task.parent_id.is_(None), _finished_before(Task, cutoff), ~stays)
+        if among is not None:
+            stmt = stmt.where(Task.id.in_(among))
+        return list(self.db.execute(stmt.order_by(Task.id).limit(limit)).scalars())
+
+    def _subtree_ids(self, roots: List[int]) -> List[int]:
+        below = select(TaskClosure.descendant_id).where(TaskClosure.ancestor_id.in_(roots))
+        return roots + list(self.db.execute(below).scalars())
+
+    def _archive_task_batch(self, cutoff: datetime, batch_size: int) -> List[int]:
+        roots = self._task_roots(cutoff, batch_size)
+        if not roots:
+            return []
+        # Buffered progress/start/pause of this process land first and may
+        # reopen a task, so eligibility is checked again after them
+        flush_pending(self.db, self._subtree_ids(roots))
+        roots = self._task_roots(cutoff, batch_size, among=roots)
+        if not roots:
+            self.db.commit()
+            return []
+        ids = self._subtree_ids(roots)
+
+        load = Counter()
+        for row in self.db.execute(select(*[getattr(Task, c) for c in TASK_COLUMNS]).where(Task.id.in_(ids))):
+            load.update(task_load_of(row))
+        WorkloadService(self.db).apply(load, Counter())
+        # Done tasks add no remaining work downstream, so dropping their edges moves no earliest_start
+        self.db.execute(
+            delete(TaskDependency)
+            .where(TaskDependency.predecessor_id.in_(ids) | TaskDependency.successor_id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        # The subtrees hang from top-level tasks: no closure row reaches outside them
+        self.db.execute(
+            delete(TaskClosure)
+            .where(TaskClosure.descendant_id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        # Tags move along, so tag filters keep working on archived tasks
+        self._move(TaskTag, TaskArchiveTag, ["task_id", "tag"], ids, key="task_id", stamp=False)
+        self._move(Task, TaskArchive, TASK_COLUMNS, ids)
+        self.db.commit()
+        tasks_changed(self.db, ids)
+        return ids
+
+    def _archive_deadline_batch(self, cutoff: datetime, batch_size: int) -> List[int]:
+        finished = Deadline.completed.is_(True) & (func.coalesce(Deadline.completed_at, Deadline.due_date) < cutoff)
+        deadlines = self.db.execute(
+            select(Deadline.id, Deadline.due_date, Deadline.project_id)
+            .where(finished)
+            .order_by(Deadline.id)
+            .limit(batch_size)
+        ).all()
+        if not deadlines:
+            return []
+        ids = [deadline.id for deadline in deadlines]
+
+        load = Counter()
+        for deadline in deadlines:
+            load.update(deadline_load_of(deadline))
+        WorkloadService(self.db).apply(load, Counter())
+        self._move(Deadline, DeadlineArchive, DEADLINE_COLUMNS, ids)
+        self.db.commit()
+        return ids
+
+    def _move(self, model, archive, columns: List[str], ids: List[int], key: str = "id", stamp: bool = True):
+        """Copy rows to the archive table and delete them from the live one"""
+        key_column = getattr(model, key)
+        selected = [getattr(model, c) for c in columns]
+        if stamp:
+            selected.append(literal(datetime.utcnow()))
+            columns = [*columns, "archived_at"]
+        self.db.execute(insert(archive).from_select(columns, select(*selected).where(key_column.in_(ids))))
+        self.db.execute(delete(model).where(key_column.in_(ids)).execution_options(synchronize_session=False))
+
+    def archive(self, older_than_days: int, batch_size: int = 500,
+                on_batch: Optional[Callable[[Dict[str, int]], None]] = None) -> Dict[str, int]:
+        """Archive everything finished more than `older_than_days` ago.
+
+        Each batch - up to `batch_size` top-level tasks with their subtasks,
+        or `batch_size` deadlines - is its own transaction, so the write lock
+        is only held briefly and an interrupted run keeps what it moved.
+        Returns the number of tasks and deadlines archived.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        totals = {"tasks": 0, "deadlines": 0}
+        for kind, batch in (("tasks", self._archive_task_batch), ("deadlines", self._archive_deadline_batch)):
+            while True:
+                moved = batch(cutoff, batch_size)
+                if not moved:
+                    break
+                totals[kind] += len(moved)
+                if on_batch:
+                    on_batch(totals)
+        return totals
+
+    def get_archive_counts(self) -> Dict[str, int]:
+        return {
+            "tasks": self.db.execute(select(func.count()).select_from(TaskArchive)).scalar(),
+            "deadlines": self.db.execute(select(func.count()).select_from(DeadlineArchive)).scalar(),
+        }
+
+    def task_status_counts(self, project_id: Optional[int] = None) -> Dict[TaskStatus, int]:
+        """Archived tasks per status (COMPLETED and CANCELLED only)"""
+        stmt = select(TaskArchive.status, func.count()).group_by(TaskArchive.status)
+        if project_id is not None:
+            stmt = stmt.where(TaskArchive.project_id == project_id)
+        return dict(self.db.execute(stmt).all())
+
+    def deadline_type_counts(self) -> Dict:
+        """Archived deadlines per DeadlineType (all of them completed)"""
+        stmt = select(DeadlineArchive.type, func.count()).group_by(DeadlineArchive.type)
+        return dict(self.db.execute(stmt).all())
+
+def with_archived(live: List[Dict], archived: List[Dict], order_by: str, descending: bool = False,
+                  limit: Optional[int] = None) -> List[Dict]:
+    """Merge live and archived row dicts of one listing, flagging each with `archived`"""
+    for row in live:
+        row["archived"] = False
+    for row in archived:
+        row["archived"] = True
+    rows = sorted(live + archived, key=lambda row: row[order_by] or datetime.min, reverse=descending)
+    return rows[:limit] if limit is not None else rows
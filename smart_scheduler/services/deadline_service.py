@@ -1,5 +1,12 @@
+from collections import Counter
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from smart_scheduler.core.concurrency import check_version, versioned_write
 from smart_scheduler.models import Deadline, DeadlineType, DeadlineRecurrence
+from smart_scheduler.models.records import DeadlineRecord, load_records
+from smart_scheduler.services.task_service import to_naive_utc
+from smart_scheduler.services.workload_service import WorkloadService, deadline_load_of
 from datetime import datetime, timedelta
 from typing import List, Optional
 
@@ -10,53 +17,51 @@ class DeadlineService:
     def get_deadline(self, deadline_id: int) -> Optional[Deadline]:
         return self.db.query(Deadline).filter(Deadline.id == deadline_id).first()
 
-    def get_deadlines(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, completed: Optional[bool] = None) -> List[Deadline]:
-        query = self.db.query(Deadline)
+    def deadlines_statement(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, completed: Optional[bool] = None, model=Deadline):
+        """select() behind get_deadlines, reusable for column-only reads (model=DeadlineArchive for archived ones)"""
+        stmt = select(model)
         if start_date:
-            query = query.filter(Deadline.due_date >= start_date)
+            stmt = stmt.where(model.due_date >= start_date)
         if end_date:
-            query = query.filter(Deadline.due_date <= end_date)
+            stmt = stmt.where(model.due_date <= end_date)
         if completed is not None:
-            query = query.filter(Deadline.completed == completed)
-        return query.order_by(Deadline.due_date).all()
+            stmt = stmt.where(model.completed == completed)
+        return stmt.order_by(model.due_date)
+
+    def get_deadlines(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, completed: Optional[bool] = None) -> List[Deadline]:
+        return self.db.execute(self.deadlines_statement(start_date, end_date, completed)).scalars().all()
+
+    def get_deadline_records(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, completed: Optional[bool] = None) -> List[DeadlineRecord]:
+        """Read-only version of get_deadlines (no ORM hydration)"""
+        stmt = self.deadlines_statement(to_naive_utc(start_date), to_naive_utc(end_date), completed)
+        return load_records(self.db, DeadlineRecord, Deadline, stmt)
 
     def get_deadlines_plain(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, completed: Optional[bool] = None):
         # Returns list of dicts for analytics
-        deadlines = self.get_deadlines(start_date, end_date, completed)
         return [
             {
                 "id": d.id,
                 "completed": bool(d.completed),
                 "due_date": d.due_date,
-                "type": d.type.value if hasattr(d.type, 'value') else str(d.type)
+                "type": d.type.value if d.type is not None else None
             }
-            for d in deadlines
+            for d in self.get_deadline_records(start_date, end_date, completed)
         ]
 
     def get_deadlines_plain_range(self, start_date=None, end_date=None):
-        from datetime import timezone
-        deadlines = self.get_deadlines()
-        result = []
-        # Ensure start_date and end_date are offset-aware (UTC)
-        if start_date and start_date.tzinfo is None:
-            start_date = start_date.replace(tzinfo=timezone.utc)
-        if end_date and end_date.tzinfo is None:
-            end_date = end_date.replace(tzinfo=timezone.utc)
-        for d in deadlines:
-            due_date = getattr(d, 'due_date', None)
-            if due_date is not None and due_date.tzinfo is None:
-                due_date = due_date.replace(tzinfo=timezone.utc)
-            if due_date is not None and (not start_date or due_date >= start_date) and (not end_date or due_date <= end_date):
-                result.append({
-                    "id": d.id,
-                    "title": d.title,
-                    "due_date": d.due_date,
-                    "color": d.color,
-                    "completed": bool(d.completed),
-                    "project_id": d.project_id,
-                    "recurrence": d.recurrence.value if hasattr(d.recurrence, 'value') else str(d.recurrence)
-                })
-        return result
+        # Range filtering happens in SQL on the due_date column
+        return [
+            {
+                "id": d.id,
+                "title": d.title,
+                "due_date": d.due_date,
+                "color": d.color,
+                "completed": bool(d.completed),
+                "project_id": d.project_id,
+                "recurrence": d.recurrence.value if d.recurrence is not None else None
+            }
+            for d in self.get_deadline_records(start_date, end_date)
+        ]
 
     def create_deadline(self, title: str, due_date: datetime, description: Optional[str] = None, type: DeadlineType = DeadlineType.GENERAL, color: Optional[str] = None, recurrence: DeadlineRecurrence = DeadlineRecurrence.NONE, recurrence_end_date: Optional[datetime] = None, task_id: Optional[int] = None, project_id: Optional[int] = None) -> Deadline:
         deadline = Deadline(
@@ -73,46 +78,72 @@ class DeadlineService:
             updated_at=datetime.utcnow(),
         )
         self.db.add(deadline)
+        WorkloadService(self.db).apply(Counter(), deadline_load_of(deadline))
         self.db.commit()
         self.db.refresh(deadline)
         return deadline
 
-    def update_deadline(self, deadline_id: int, **kwargs) -> Optional[Deadline]:
+    def update_deadline(self, deadline_id: int, expected_version: Optional[int] = None, **kwargs) -> Optional[Deadline]:
+        return versioned_write(self.db, expected_version,
+                               lambda: self._update_deadline(deadline_id, expected_version, kwargs))
+
+    def _update_deadline(self, deadline_id: int, expected_version: Optional[int], kwargs) -> Optional[Deadline]:
         deadline = self.get_deadline(deadline_id)
         if not deadline:
             return None
+        check_version(deadline, expected_version)
+        load_before = deadline_load_of(deadline)
         for key, value in kwargs.items():
             if hasattr(deadline, key):
                 setattr(deadline, key, value)
         deadline.updated_at = datetime.utcnow()
+        WorkloadService(self.db).apply(load_before, deadline_load_of(deadline))
         self.db.commit()
         self.db.refresh(deadline)
         return deadline
 
-    def delete_deadline(self, deadline_id: int) -> bool:
+    def delete_deadline(self, deadline_id: int, expected_version: Optional[int] = None) -> bool:
+        return versioned_write(self.db, expected_version, lambda: self._delete_deadline(deadline_id, expected_version))
+
+    def _delete_deadline(self, deadline_id: int, expected_version: Optional[int]) -> bool:
         deadline = self.get_deadline(deadline_id)
         if not deadline:
             return False
+        check_version(deadline, expected_version)
+        WorkloadService(self.db).apply(deadline_load_of(deadline), Counter())
         self.db.delete(deadline)
         self.db.commit()
         return True
 
-    def mark_complete(self, deadline_id: int) -> Optional[Deadline]:
+    def mark_complete(self, deadline_id: int, expected_version: Optional[int] = None) -> Optional[Deadline]:
+        return versioned_write(self.db, expected_version, lambda: self._mark_complete(deadline_id, expected_version))
+
+    def _mark_complete(self, deadline_id: int, expected_version: Optional[int]) -> Optional[Deadline]:
         deadline = self.get_deadline(deadline_id)
         if not deadline:
             return None
+        check_version(deadline, expected_version)
         deadline.completed = True
         deadline.completed_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(deadline)
         return deadline
 
-    def extend_deadline(self, deadline_id: int, new_due_date: datetime) -> Optional[Deadline]:
+    def extend_deadline(self, deadline_id: int, new_due_date: datetime,
+                        expected_version: Optional[int] = None) -> Optional[Deadline]:
+        return versioned_write(self.db, expected_version,
+                               lambda: self._extend_deadline(deadline_id, new_due_date, expected_version))
+
+    def _extend_deadline(self, deadline_id: int, new_due_date: datetime,
+                         expected_version: Optional[int]) -> Optional[Deadline]:
         deadline = self.get_deadline(deadline_id)
         if not deadline:
             return None
+        check_version(deadline, expected_version)
+        load_before = deadline_load_of(deadline)
         deadline.due_date = new_due_date
         deadline.updated_at = datetime.utcnow()
+        WorkloadService(self.db).apply(load_before, deadline_load_of(deadline))
         self.db.commit()
         self.db.refresh(deadline)
         return deadline
@@ -0,0 +1,319 @@
+# smart_scheduler/services/dependency_service.py - Task dependency graph and critical path
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import bindparam, case, delete, exists, func, select, update
+from sqlalchemy.orm import Session, aliased
+
+from smart_scheduler.models.task import Task, TaskStatus
+from smart_scheduler.models.task_dependency import TaskDependency
+
+# Finished tasks no longer hold anything up
+DONE_STATUSES = (TaskStatus.COMPLETED, TaskStatus.CANCELLED)
+
+# Only tasks nobody has started yet get (un)blocked automatically
+BLOCKABLE_STATUSES = (TaskStatus.PENDING, TaskStatus.SCHEDULED)
+
+class DependencyError(ValueError):
+    """Raised for edges that can't be added (unknown task, self-loop, cycle)"""
+
+def remaining_minutes(task) -> int:
+    """Minutes of work a task still adds to everything downstream of it"""
+    return 0 if task.status in DONE_STATUSES else (task.estimated_duration or 0)
+
+def _remaining_expr(model):
+    return case((model.status.in_(DONE_STATUSES), 0), else_=func.coalesce(model.estimated_duration, 0))
+
+def _topological_order(nodes: Iterable[int], edges: Iterable[tuple]) -> List[int]:
+    """Kahn's algorithm over the edges whose endpoints are both in `nodes`"""
+    nodes = list(nodes)
+    members = set(nodes)
+    successors = defaultdict(list)
+    in_degree = dict.fromkeys(nodes, 0)
+    for predecessor, successor in edges:
+        if predecessor in members and successor in members:
+            successors[predecessor].append(successor)
+            in_degree[successor] += 1
+
+    queue = deque(node for node in nodes if in_degree[node] == 0)
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for successor in successors[node]:
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                queue.append(successor)
+    return order
+
+class DependencyService:
+    """Dependency edges, blocking and incrementally maintained earliest starts.
+
+    Task.earliest_start is the length (in minutes of remaining work) of the
+    longest predecessor chain in front of a task. A change to one task can
+    only move the earliest starts of tasks downstream of it, so updates load
+    just that cone with one recursive CTE and re-run the forward pass over it.
+    Methods only stage changes; callers (TaskService, routes) commit.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _cone(self, start_ids):
+        """start_ids plus every task reachable from them along dependency edges"""
+        cone = select(Task.id.label("id")).where(Task.id.in_(start_ids)).cte("cone", recursive=True)
+        return cone.union(
+            select(TaskDependency.successor_id).join(cone, TaskDependency.predecessor_id == cone.c.id)
+        )
+
+    def _successor_ids(self, task_id: int) -> List[int]:
+        return self.db.execute(
+            select(TaskDependency.successor_id).where(TaskDependency.predecessor_id == task_id)
+        ).scalars().all()
+
+    def _propagate(self, start_ids) -> Set[int]:
+        """Recompute earliest_start over the downstream cone of start_ids.
+
+        Returns the project ids of the tasks whose earliest_start moved.
+        """
+        start_ids = list(start_ids)
+        if not start_ids:
+            return set()
+        self.db.flush()
+
+        cone = self._cone(start_ids)
+        stored, remaining, projects = {}, {}, {}
+        for task_id, earliest_start, task_remaining, project_id in self.db.execute(
+            select(Task.id, Task.earliest_start, _remaining_expr(Task), Task.project_id)
+            .join(cone, cone.c.id == Task.id)
+        ):
+            stored[task_id] = earliest_start
+            remaining[task_id] = task_remaining
+            projects[task_id] = project_id
+
+        predecessor = aliased(Task)
+        edges = self.db.execute(
+            select(
+                TaskDependency.predecessor_id, TaskDependency.successor_id,
+                predecessor.earliest_start + _remaining_expr(predecessor),
+            )
+            .join(cone, cone.c.id == TaskDependency.successor_id)
+            .join(predecessor, predecessor.id == TaskDependency.predecessor_id)
+        ).all()
+
+        # Predecessors outside the cone keep their stored finish; edges inside
+        # it are walked in topological order (Kahn) as part of the forward pass
+        earliest = dict.fromkeys(stored, 0)
+        successors = defaultdict(list)
+        in_degree = dict.fromkeys(stored, 0)
+        for predecessor_id, successor_id, finish in edges:
+            if predecessor_id in stored:
+                successors[predecessor_id].append(successor_id)
+                in_degree[successor_id] += 1
+            elif finish > earliest[successor_id]:
+                earliest[successor_id] = finish
+
+        queue = deque(task_id for task_id, degree in in_degree.items() if degree == 0)
+        while queue:
+            task_id = queue.popleft()
+            finish = earliest[task_id] + remaining[task_id]
+            for successor_id in successors[task_id]:
+                if finish > earliest[successor_id]:
+                    earliest[successor_id] = finish
+                in_degree[successor_id] -= 1
+                if in_degree[successor_id] == 0:
+                    queue.append(successor_id)
+
+        changed = [
+            {"task_id": node, "earliest_start": start}
+            for node, start in earliest.items() if start != stored[node]
+        ]
+        if changed:
+            # One executemany; rows are plain values, not ORM state
+            tasks = Task.__table__
+            self.db.execute(
+                tasks.update().where(tasks.c.id == bindparam("task_id"))
+                .values(earliest_start=bindparam("earliest_start")),
+                changed,
+            )
+        return {projects[row["task_id"]] for row in changed} - {None}
+
+    def refresh_project_estimates(self, project_ids: Iterable[Optional[int]]):
+        """Re-forecast Project.estimated_completion; the critical path is its lower bound"""
+        from smart_scheduler.services.forecast_service import ForecastService
+
+        ForecastService(self.db).forecast(project_ids)
+
+    def _unblock(self, candidates) -> List[int]:
+        """Move BLOCKED tasks among `candidates` whose predecessors are all done back to PENDING"""
+        predecessor = aliased(Task)
+        open_predecessor = exists().where(
+            TaskDependency.successor_id == Task.id,
+            predecessor.id == TaskDependency.predecessor_id,
+            predecessor.status.not_in(DONE_STATUSES),
+        )
+        return self.db.execute(
+            update(Task)
+            .where(Task.status == TaskStatus.BLOCKED, Task.id.in_(candidates), ~open_predecessor)
+            # A status change clients see, so it moves the row version like an ORM write
+            .values(status=TaskStatus.PENDING, updated_at=datetime.utcnow(), version=Task.version + 1)
+            .returning(Task.id)
+            .execution_options(synchronize_session="fetch")
+        ).scalars().all()
+
+    def _reaches(self, source_id: int, target_id: int) -> bool:
+        cone = self._cone([source_id])
+        return self.db.execute(select(cone.c.id).where(cone.c.id == target_id).limit(1)).first() is not None
+
+    def add_dependency(self, predecessor_id: int, successor_id: int) -> TaskDependency:
+        """Make successor wait for predecessor, rejecting edges that would close a cycle"""
+        if predecessor_id == successor_id:
+            raise DependencyError("A task cannot depend on itself")
+        tasks = {
+            task.id: task for task in
+            self.db.execute(select(Task).where(Task.id.in_([predecessor_id, successor_id]))).scalars()
+        }
+        for task_id in (predecessor_id, successor_id):
+            if task_id not in tasks:
+                raise DependencyError(f"Task {task_id} not found")
+
+        existing = self.db.get(TaskDependency, (predecessor_id, successor_id))
+        if existing:
+            return existing
+        # predecessor -> successor closes a cycle iff predecessor is already downstream of successor
+        if self._reaches(successor_id, predecessor_id):
+            raise DependencyError(
+                f"Task {successor_id} already (transitively) blocks task {predecessor_id}; "
+                "adding this dependency would create a cycle"
+            )
+
+        edge = TaskDependency(predecessor_id=predecessor_id, successor_id=successor_id)
+        self.db.add(edge)
+        successor = tasks[successor_id]
+        if tasks[predecessor_id].status not in DONE_STATUSES and successor.status in BLOCKABLE_STATUSES:
+            successor.status = TaskStatus.BLOCKED
+            successor.updated_at = datetime.utcnow()
+        projects = self._propagate([successor_id])
+        self.refresh_project_estimates(projects | {successor.project_id})
+        return edge
+
+    def remove_dependency(self, predecessor_id: int, successor_id: int) -> bool:
+        deleted = self.db.execute(
+            delete(TaskDependency)
+            .where(TaskDependency.predecessor_id == predecessor_id, TaskDependency.successor_id == successor_id)
+            .execution_options(synchronize_session="fetch")
+        ).rowcount
+        if not deleted:
+            return False
+        self._unblock([successor_id])
+        successor = self.db.get(Task, successor_id)
+        projects = self._propagate([successor_id])
+        self.refresh_project_estimates(projects | {successor.project_id if successor else None})
+        return True
+
+    def task_changed(self, task: Task, remaining_before: int) -> List[int]:
+        """Follow up a status/duration change of `task`.
+
+        Propagates a change in its remaining work downstream and, once the
+        task is done, unblocks successors with no other open predecessors.
+        Returns the ids of the unblocked tasks.
+        """
+        remaining = remaining_minutes(task)
+        if remaining != remaining_before:
+            projects = self._propagate(self._successor_ids(task.id))
+            self.refresh_project_estimates(projects | {task.project_id})
+        if task.status in DONE_STATUSES:
+            return self._unblock(select(TaskDependency.successor_id).where(TaskDependency.predecessor_id == task.id))
+        return []
+
+    def detach_for_delete(self, task: Task) -> List[int]:
+        """Drop a task's edges; its successors lose a predecessor.
+
+        Returns the ids of the successors this unblocked.
+        """
+        successors = self._successor_ids(task.id)
+        self.db.execute(
+            delete(TaskDependency)
+            .where((TaskDependency.predecessor_id == task.id) | (TaskDependency.successor_id == task.id))
+            .execution_options(synchronize_session=False)
+        )
+        unblocked = self._unblock(successors) if successors else []
+        projects = self._propagate(successors)
+        self.refresh_project_estimates(projects)
+        return unblocked
+
+    def get_dependencies(self, task_id: int) -> Dict[str, List[Dict]]:
+        """Direct predecessors and successors of a task"""
+        def neighbours(join_column, where_column):
+            rows = self.db.execute(
+                select(Task.id, Task.title, Task.status)
+                .join(TaskDependency, join_column == Task.id)
+                .where(where_column == task_id)
+                .order_by(Task.id)
+            )
+            return [{"id": row.id, "title": row.title, "status": row.status.value} for row in rows]
+
+        return {
+            "task_id": task_id,
+            "predecessors": neighbours(TaskDependency.predecessor_id, TaskDependency.successor_id),
+            "successors": neighbours(TaskDependency.successor_id, TaskDependency.predecessor_id),
+        }
+
+    def critical_path(self, project_id: int) -> Dict:
+        """Topological schedule of a project with slack and its critical path.
+
+        The forward pass is the maintained earliest_start column (which
+        already accounts for predecessors in other projects); the backward
+        pass runs here over the project's own edges, from the makespan.
+        """
+        remaining = _remaining_expr(Task).label("remaining")
+        tasks = {
+            row.id: row for row in self.db.execute(
+                select(Task.id, Task.title, Task.status, Task.earliest_start, remaining)
+                .where(Task.project_id == project_id)
+            )
+        }
+        successor = aliased(Task)
+        predecessor = aliased(Task)
+        edges = self.db.execute(
+            select(TaskDependency.predecessor_id, TaskDependency.successor_id)
+            .join(successor, successor.id == TaskDependency.successor_id)
+            .join(predecessor, predecessor.id == TaskDependency.predecessor_id)
+            .where(successor.project_id == project_id, predecessor.project_id == project_id)
+        ).all()
+
+        order = _topological_order(sorted(tasks, key=lambda tid: (tasks[tid].earliest_start, tid)), edges)
+        makespan = max((t.earliest_start + t.remaining for t in tasks.values()), default=0)
+
+        outgoing = defaultdict(list)
+        for pred_id, succ_id in edges:
+            outgoing[pred_id].append(succ_id)
+        latest_start = {}
+        for node in reversed(order):
+            latest_finish = min((latest_start[s] for s in outgoing[node]), default=makespan)
+            latest_start[node] = latest_finish - tasks[node].remaining
+
+        schedule = []
+        for node in order:
+            task = tasks[node]
+            slack = latest_start[node] - task.earliest_start
+            schedule.append({
+                "id": node,
+                "title": task.title,
+                "status": task.status.value,
+                "remaining_minutes": task.remaining,
+                "earliest_start": task.earliest_start,
+                "earliest_finish": task.earliest_start + task.remaining,
+                "latest_start": latest_start[node],
+                "latest_finish": latest_start[node] + task.remaining,
+                "slack": slack,
+                "critical": slack == 0 and task.remaining > 0,
+            })
+
+        return {
+            "project_id": project_id,
+            "makespan_minutes": makespan,
+            "critical_path": [entry["id"] for entry in schedule if entry["critical"]],
+            "tasks": schedule,
+        }
@@ -0,0 +1,203 @@
+# smart_scheduler/services/forecast_service.py - Project completion forecasting
+#
+# The model has two parts, both learned from completed tasks:
+#   * per-category ratios of actual_duration to estimated_duration
+#     ("writing tasks take 1.4x what I estimate"), and
+#   * the user's daily throughput: minutes of work finished per day.
+# A project's remaining estimates are scaled by the ratios and projected
+# onto the throughput. The database does the per-row work as GROUP BYs;
+# the grouped columns are combined as NumPy arrays, never row by row.
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from sqlalchemy import bindparam, case, func, select
+from sqlalchemy.orm import Session
+
+from smart_scheduler.models.archive import TaskArchive
+from smart_scheduler.models.project import Project, ProjectStatus
+from smart_scheduler.models.task import Task, TaskStatus
+
+# Categories with little history are pulled towards the global ratio, as
+# if they had this many minutes of estimates at the global ratio already
+PRIOR_MINUTES = 240.0
+# Throughput is averaged over this many recent days
+THROUGHPUT_WINDOW_DAYS = 28
+# Fallbacks without history / without an estimate
+DEFAULT_DAILY_MINUTES = 240.0
+DEFAULT_TASK_MINUTES = 60.0
+# The cached model is rebuilt from scratch after this long, which also
+# picks up edits the incremental updates don't see (reopened tasks etc.)
+MODEL_MAX_AGE = timedelta(hours=6)
+
+FORECAST_PROJECT_STATUSES = (ProjectStatus.PLANNING, ProjectStatus.ACTIVE, ProjectStatus.ON_HOLD)
+_DONE_STATUSES = (TaskStatus.COMPLETED, TaskStatus.CANCELLED)
+
+class ForecastModel:
+    """Sufficient statistics for the forecast; cheap to update one task at a time"""
+
+    def __init__(self, estimated: Dict[Optional[str], float], actual: Dict[Optional[str], float],
+                 daily_minutes: Dict[date, float]):
+        self.estimated = estimated          # category -> sum of estimated_duration
+        self.actual = actual                # category -> sum of actual_duration
+        self.daily_minutes = daily_minutes  # completion day -> minutes of work finished
+        self.loaded_at = datetime.utcnow()
+
+    @property
+    def global_ratio(self) -> float:
+        estimated = sum(self.estimated.values())
+        return sum(self.actual.values()) / estimated if estimated else 1.0
+
+    def ratios(self, categories: Iterable[Optional[str]]) -> np.ndarray:
+        """Smoothed actual/estimated ratio for each category"""
+        categories = list(categories)
+        prior = self.global_ratio
+        estimated = np.array([self.estimated.get(c, 0.0) for c in categories], dtype=float)
+        actual = np.array([self.actual.get(c, 0.0) for c in categories], dtype=float)
+        return (actual + PRIOR_MINUTES * prior) / (estimated + PRIOR_MINUTES)
+
+    def daily_throughput(self, today: Optional[date] = None) -> float:
+        """Average minutes finished per day over the recent window"""
+        today = today or datetime.utcnow().date()
+        start = today - timedelta(days=THROUGHPUT_WINDOW_DAYS - 1)
+        recent = {day: minutes for day, minutes in self.daily_minutes.items() if day >= start}
+        if not recent:
+            return DEFAULT_DAILY_MINUTES
+        # Don't dilute a short history with days before the first completion
+        days = (today - min(recent)).days + 1
+        return max(sum(recent.values()) / days, 1.0)
+
+    def record(self, category: Optional[str], estimated: Optional[int], actual: Optional[int], day: date):
+        if estimated and actual:
+            self.estimated[category] = self.estimated.get(category, 0.0) + estimated
+            self.actual[category] = self.actual.get(category, 0.0) + actual
+        minutes = actual or estimated
+        if minutes:
+            self.daily_minutes[day] = self.daily_minutes.get(day, 0.0) + minutes
+
+_model: Optional[ForecastModel] = None
+_model_lock = threading.Lock()
+
+def record_completion(task: Task):
+    """Fold a newly completed task into the cached model (no-op before first use)"""
+    with _model_lock:
+        if _model is not None:
+            _model.record(task.category, task.estimated_duration, task.actual_duration,
+                          (task.completed_at or datetime.utcnow()).date())
+
+def reset_model():
+    global _model
+    with _model_lock:
+        _model = None
+
+def learn_model(db: Session) -> ForecastModel:
+    """Build the model from completed tasks, live and archived.
+
+    SQLite does the grouping, so only one row per category and per recent
+    day comes back from each table however long the history is.
+    """
+    estimated, actual, throughput = defaultdict(float), defaultdict(float), defaultdict(float)
+    window_start = datetime.utcnow() - timedelta(days=THROUGHPUT_WINDOW_DAYS)
+    for model in (Task, TaskArchive):
+        completed = model.status == TaskStatus.COMPLETED
+        ratio_rows = db.execute(
+            select(model.category, func.sum(model.estimated_duration), func.sum(model.actual_duration))
+            .where(completed, model.estimated_duration > 0, model.actual_duration > 0)
+            .group_by(model.category)
+        ).all()
+        for category, category_estimated, category_actual in ratio_rows:
+            estimated[category] += float(category_estimated)
+            actual[category] += float(category_actual)
+
+        # Throughput counts whatever is known about the work that was done
+        worked = case((model.actual_duration > 0, model.actual_duration),
+                      else_=func.coalesce(model.estimated_duration, 0))
+        day = func.date(model.completed_at)
+        day_rows = db.execute(
+            select(day, func.sum(worked))
+            .where(completed, model.completed_at >= window_start)
+            .group_by(day)
+        ).all()
+        for day, minutes in day_rows:
+            if day and minutes:
+                throughput[date.fromisoformat(day)] += float(minutes)
+
+    return ForecastModel(dict(estimated), dict(actual), dict(throughput))
+
+def get_model(db: Session) -> ForecastModel:
+    """The cached model, (re)learned on first use and once it is MODEL_MAX_AGE old"""
+    global _model
+    with _model_lock:
+        if _model is None or datetime.utcnow() - _model.loaded_at > MODEL_MAX_AGE:
+            _model = learn_model(db)
+        return _model
+
+class ForecastService:
+    """Writes Project.estimated_completion from remaining work and throughput"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def forecast(self, project_ids: Optional[Iterable[int]] = None) -> Dict[int, datetime]:
+        """Forecast and store estimated_completion for open projects.
+
+        All open projects by default (the batch job), or just `project_ids`.
+        Each project is projected onto the full daily throughput and never
+        finishes before its critical path (Task.earliest_start) allows.
+        """
+        projects = select(Project.id).where(Project.status.in_(FORECAST_PROJECT_STATUSES))
+        if project_ids is not None:
+            project_ids = [pid for pid in set(project_ids) if pid is not None]
+            if not project_ids:
+                return {}
+            projects = projects.where(Project.id.in_(project_ids))
+        self.db.flush()
+
+        # Remaining work per (project, category); the rest is array math
+        estimate = func.coalesce(Task.estimated_duration, DEFAULT_TASK_MINUTES)
+        left = estimate * (100.0 - func.coalesce(Task.progress_percentage, 0.0)) / 100.0
+        groups = self.db.execute(
+            select(Task.project_id, Task.category, func.sum(left), func.max(Task.earliest_start + left))
+            .where(Task.project_id.in_(projects), Task.status.not_in(_DONE_STATUSES))
+            .group_by(Task.project_id, Task.category)
+        ).all()
+        if not groups:
+            return {}
+        model = get_model(self.db)
+
+        project_column, categories, work, chain = zip(*groups)
+        project_ids, project_codes = np.unique(np.array(project_column), return_inverse=True)
+        ratios = model.ratios(categories)
+
+        # Total work, scaled by how long each category really takes
+        work = np.bincount(project_codes, weights=np.array(work, dtype=float) * ratios, minlength=len(project_ids))
+        # Longest dependency chain, also in scaled minutes
+        longest = np.zeros(len(project_ids))
+        np.maximum.at(longest, project_codes, np.array(chain, dtype=float) * model.global_ratio)
+
+        days = np.maximum(work, longest) / model.daily_throughput()
+        now = datetime.utcnow()
+        forecasts = {
+            int(pid): now + timedelta(days=float(d)) for pid, d in zip(project_ids, days)
+        }
+
+        table = Project.__table__
+        self.db.execute(
+            table.update().where(table.c.id == bindparam("project_id"))
+            .values(estimated_completion=bindparam("estimated_completion")),
+            [{"project_id": pid, "estimated_completion": when} for pid, when in forecasts.items()],
+        )
+        return forecasts
+
+    def get_model_summary(self) -> Dict:
+        model = get_model(self.db)
+        categories = sorted(model.estimated, key=lambda c: (c is None, c or ""))
+        ratios = model.ratios(categories)
+        return {
+            "global_ratio": round(model.global_ratio, 3),
+            "category_ratios": {str(c): round(float(r), 3) for c, r in zip(categories, ratios)},
+            "daily_throughput_minutes": round(model.daily_throughput(), 1),
+            "learned_at": model.loaded_at.isoformat(),
+        }
@@ -1,3 +1,4 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from smart_scheduler.models import Notification
 from datetime import datetime, timedelta
@@ -10,18 +11,22 @@ class NotificationService:
     def get_notification(self, notification_id: int) -> Optional[Notification]:
         return self.db.query(Notification).filter(Notification.id == notification_id).first()
 
-    def get_notifications(self, user_id: Optional[int] = None, sent: Optional[bool] = None, read: Optional[bool] = None, upcoming: Optional[bool] = None) -> List[Notification]:
-        query = self.db.query(Notification)
+    def notifications_statement(self, user_id: Optional[int] = None, sent: Optional[bool] = None, read: Optional[bool] = None, upcoming: Optional[bool] = None):
+        """select() behind get_notifications, reusable for column-only reads"""
+        stmt = select(Notification)
         if user_id is not None:
-            query = query.filter(Notification.user_id == user_id)
+            stmt = stmt.where(Notification.user_id == user_id)
         if sent is not None:
-            query = query.filter(Notification.sent == sent)
+            stmt = stmt.where(Notification.sent == sent)
         if read is not None:
-            query = query.filter(Notification.read == read)
+            stmt = stmt.where(Notification.read == read)
         if upcoming:
             now = datetime.utcnow()
-            query = query.filter(Notification.scheduled_time > now)
-        return query.order_by(Notification.scheduled_time).all()
+            stmt = stmt.where(Notification.scheduled_time > now)
+        return stmt.order_by(Notification.scheduled_time)
+
+    def get_notifications(self, user_id: Optional[int] = None, sent: Optional[bool] = None, read: Optional[bool] = None, upcoming: Optional[bool] = None) -> List[Notification]:
+        return self.db.execute(self.notifications_statement(user_id, sent, read, upcoming)).scalars().all()
 
     def create_notification(self, type: str, target_id: int, message: str, scheduled_time: datetime, user_id: Optional[int] = None) -> Notification:
         notification = Notification(
@@ -0,0 +1,238 @@
+# smart_scheduler/services/progress_service.py - Write-behind for progress and start/pause
+#
+# Progress updates and start/pause toggles are the chattiest task writes,
+# and only their last value matters. They are held in memory and written
+# every few seconds: all updates to a task inside the window become one
+# row of a single executemany UPDATE, in one commit for all tasks. Reads
+# of task rows overlay the pending values, reads that count or page through
+# tasks (stats, the dashboard, the change feed) write them first, and every
+# other task write flushes the task first, so nothing observable changes order.
+#
+# Only the cheap transitions are buffered: start/pause between the open
+# statuses, which no rollup, dependency or daily_load depends on. Anything
+# else goes through TaskService.update_task_status, and a flush never
+# touches a task another worker has completed or cancelled meanwhile.
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, case, func, or_, select
+from sqlalchemy.orm import Session
+
+from smart_scheduler.core.config import settings
+from smart_scheduler.models.task import Task, TaskStatus
+from smart_scheduler.services.dependency_service import DONE_STATUSES
+from smart_scheduler.services.ranking_service import tasks_changed
+from smart_scheduler.services.work_session_service import WorkSessionService
+
+logger = logging.getLogger(__name__)
+
+# Statuses a buffered start/pause may replace; BLOCKED is left to the dependencies
+BUFFERED_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.SCHEDULED)
+
+class PendingUpdate:
+    """Latest buffered values for one task, plus the start/pause history for its work sessions"""
+
+    __slots__ = ("progress", "status", "updated_at", "toggles")
+
+    def __init__(self):
+        self.progress: Optional[float] = None
+        self.status: Optional[TaskStatus] = None
+        self.updated_at: Optional[datetime] = None
+        self.toggles: List[Tuple[TaskStatus, datetime]] = []
+
+_pending: Dict[int, PendingUpdate] = {}
+_pending_lock = threading.Lock()
+
+def _take(task_ids: Optional[Iterable[int]] = None) -> Dict[int, PendingUpdate]:
+    """Remove and return the pending updates (of `task_ids`, or all)"""
+    global _pending
+    with _pending_lock:
+        if task_ids is None:
+            taken, _pending = _pending, {}
+            return taken
+        return {task_id: _pending.pop(task_id) for task_id in task_ids if task_id in _pending}
+
+def _restore(taken: Dict[int, PendingUpdate]):
+    """Put updates back after a failed write, under any newer ones that arrived meanwhile"""
+    with _pending_lock:
+        for task_id, older in taken.items():
+            newer = _pending.get(task_id)
+            if newer is not None:
+                older.progress = newer.progress if newer.progress is not None else older.progress
+                older.status = newer.status if newer.status is not None else older.status
+                older.updated_at = newer.updated_at
+                older.toggles.extend(newer.toggles)
+            _pending[task_id] = older
+
+def pending_count() -> int:
+    return len(_pending)
+
+def overlay(rows: List[Dict]) -> List[Dict]:
+    """Patch task row dicts with pending values, in place.
+
+    Values keep the row's shape: rows that carry status and updated_at as
+    strings (to_dict(), the schedule) get strings. `version` is reported
+    as it will be once the update is written (one bump per task per flush),
+    so an ETag read now still matches If-Match after the flush.
+    """
+    if not _pending:
+        return rows
+    with _pending_lock:
+        for row in rows:
+            update = _pending.get(row.get("id"))
+            if update is None:
+                continue
+            if update.progress is not None and "progress_percentage" in row:
+                row["progress_percentage"] = update.progress
+            if update.status is not None and "status" in row:
+                row["status"] = update.status.value if type(row["status"]) is str else update.status
+            if "updated_at" in row:
+                updated_at = row["updated_at"]
+                row["updated_at"] = update.updated_at.isoformat() if isinstance(updated_at, str) else update.updated_at
+            if row.get("version") is not None:
+                row["version"] += 1
+    return rows
+
+def flush_pending(db: Session, task_ids: Optional[Iterable[int]] = None) -> List[int]:
+    """Stage the pending updates (of `task_ids`, or all) in db's transaction; the caller commits.
+
+    Returns the ids of the tasks written.
+    """
+    taken = _take(task_ids)
+    try:
+        return _write(db, taken)
+    except Exception:
+        _restore(taken)
+        raise
+
+def _write(db: Session, taken: Dict[int, PendingUpdate]) -> List[int]:
+    if not taken:
+        return []
+
+    table = Task.__table__
+    new_status = bindparam("new_status", type_=table.c.status.type)
+    # Spelled out: executemany() can't expand IN lists
+    replaceable = or_(*(table.c.status == status for status in BUFFERED_STATUSES))
+    db.execute(
+        table.update()
+        # Done tasks keep what their completion wrote, even if it came from another worker
+        .where(table.c.id == bindparam("task_id"), and_(*(table.c.status != status for status in DONE_STATUSES)))
+        .values(
+            progress_percentage=func.coalesce(bindparam("progress", type_=table.c.progress_percentage.type),
+                                              table.c.progress_percentage),
+            status=func.coalesce(case((replaceable, new_status)), table.c.status),
+            updated_at=bindparam("changed_at", type_=table.c.updated_at.type),
+            # A change clients see, so it moves the row version like an ORM write
+            version=table.c.version + 1,
+        ),
+        [
+            {"task_id": task_id, "progress": update.progress, "new_status": update.status,
+             "changed_at": update.updated_at}
+            for task_id, update in taken.items()
+        ],
+    )
+
+    # Read back under the write lock: deleted and done tasks were skipped,
+    # and a status the guard kept (BLOCKED) gets no work sessions either
+    statuses = dict(db.execute(select(Task.id, Task.status).where(Task.id.in_(list(taken)))).all())
+    written = [task_id for task_id in taken if statuses.get(task_id) not in (None, *DONE_STATUSES)]
+
+    # Replay start/pause in order, so work sessions keep their real times
+    sessions = WorkSessionService(db)
+    for task_id in written:
+        update = taken[task_id]
+        if update.status is None or statuses[task_id] != update.status:
+            continue
+        for status, at in update.toggles:
+            if status == TaskStatus.IN_PROGRESS:
+                sessions.start(task_id, at)
+            else:
+                sessions.stop(task_id, at)
+            db.flush()
+    return written
+
+def flush_once() -> int:
+    """Write every pending update in its own session and transaction"""
+    from smart_scheduler.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return ProgressService(db).flush()
+    finally:
+        db.close()
+
+async def flush_periodically(interval_seconds: float):
+    """Background loop for the API process: write pending updates every interval"""
+    from smart_scheduler.core.writer import run_exclusive
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_exclusive(flush_once)
+        except Exception:
+            logger.exception("Progress write-behind flush failed")
+
+async def write_pending():
+    """Route dependency for reads that count or page through tasks: write pending updates first.
+
+    overlay() can patch rows, not aggregates; a no-op when nothing is pending.
+    """
+    if _pending:
+        from smart_scheduler.core.writer import run_exclusive
+        await run_exclusive(flush_once)
+
+class ProgressService:
+    """Buffered progress and start/pause updates"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _record(self, task_id: int, progress: Optional[float] = None,
+                status: Optional[TaskStatus] = None) -> bool:
+        current = self.db.execute(select(Task.status).where(Task.id == task_id)).scalar()
+        if current is None:
+            return False
+        if status is not None and current not in BUFFERED_STATUSES:
+            # Reopening a done task or starting a blocked one moves rollups,
+            # dependencies and daily_load: write it through, with the hooks.
+            # Imported here: TaskService itself flushes through this module
+            from smart_scheduler.services.task_service import TaskService
+            return TaskService(self.db).update_task_status(task_id, status) is not None
+        now = datetime.utcnow()
+        with _pending_lock:
+            update = _pending.setdefault(task_id, PendingUpdate())
+            if progress is not None:
+                update.progress = progress
+            if status is not None:
+                update.status = status
+                update.toggles.append((status, now))
+            update.updated_at = now
+        if settings.progress_flush_seconds <= 0:
+            # Write-behind off: write through, as before
+            self.flush([task_id])
+        return True
+
+    def set_progress(self, task_id: int, percentage: float) -> bool:
+        """Buffer a progress update; False when there is no such task"""
+        return self._record(task_id, progress=min(max(percentage, 0.0), 100.0))
+
+    def set_running(self, task_id: int, running: bool) -> bool:
+        """Buffer a start (IN_PROGRESS) or pause (PENDING); False when there is no such task"""
+        return self._record(task_id, status=TaskStatus.IN_PROGRESS if running else TaskStatus.PENDING)
+
+    def flush(self, task_ids: Optional[Iterable[int]] = None) -> int:
+        """Write pending updates now, in one commit; returns the number of tasks written"""
+        taken = _take(task_ids)
+        try:
+            written = _write(self.db, taken)
+            if written:
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            _restore(taken)
+            raise
+        tasks_changed(self.db, written)
+        return len(written)
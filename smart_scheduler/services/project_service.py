@@ -1,6 +1,9 @@
 # smart_scheduler/services/project_service.py - NEW FILE
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from smart_scheduler.core.concurrency import versioned_write
 from smart_scheduler.models.project import Project, ProjectStatus
+from smart_scheduler.models.records import ProjectRecord, load_records
 from typing import List, Optional
 from datetime import datetime, date
 
@@ -34,45 +37,71 @@ class ProjectService:
         
         return project
     
-    def get_projects(
+    def projects_statement(
         self,
         status: Optional[ProjectStatus] = None,
         include_completed: bool = True
-    ) -> List[Project]:
-        """Get all projects with optional filtering"""
+    ):
+        """select() behind get_projects, reusable for column-only reads"""
         
-        query = self.db.query(Project)
+        stmt = select(Project)
         
         if status:
-            query = query.filter(Project.status == status)
+            stmt = stmt.where(Project.status == status)
         elif not include_completed:
-            query = query.filter(Project.status != ProjectStatus.COMPLETED)
+            stmt = stmt.where(Project.status != ProjectStatus.COMPLETED)
         
-        return query.order_by(Project.deadline.asc()).all()
+        return stmt.order_by(Project.deadline.asc())
+    
+    def get_projects(
+        self,
+        status: Optional[ProjectStatus] = None,
+        include_completed: bool = True
+    ) -> List[Project]:
+        """Get all projects with optional filtering"""
+        return self.db.execute(self.projects_statement(status, include_completed)).scalars().all()
+    
+    def get_project_records(
+        self,
+        status: Optional[ProjectStatus] = None,
+        include_completed: bool = True
+    ) -> List[ProjectRecord]:
+        """Read-only version of get_projects for list pages (no ORM hydration)"""
+        return load_records(self.db, ProjectRecord, Project, self.projects_statement(status, include_completed))
+    
+    def get_upcoming_deadline_records(self, days_ahead: int = 7) -> List[ProjectRecord]:
+        """Read-only version of get_upcoming_deadlines"""
+        return load_records(self.db, ProjectRecord, Project, self.upcoming_deadlines_statement(days_ahead))
     
     def get_project_by_id(self, project_id: int) -> Optional[Project]:
         """Get a specific project by ID"""
         return self.db.query(Project).filter(Project.id == project_id).first()
     
-    def get_upcoming_deadlines(self, days_ahead: int = 7) -> List[Project]:
-        """Get projects with deadlines in the next X days"""
+    def upcoming_deadlines_statement(self, days_ahead: int = 7):
+        """select() behind get_upcoming_deadlines, reusable for column-only reads"""
         
         from datetime import timedelta
         cutoff_date = datetime.now() + timedelta(days=days_ahead)
         
         return (
-            self.db.query(Project)
-            .filter(
+            select(Project)
+            .where(
                 Project.deadline <= cutoff_date,
                 Project.status.in_([ProjectStatus.ACTIVE, ProjectStatus.PLANNING])
             )
             .order_by(Project.deadline.asc())
-            .all()
         )
     
+    def get_upcoming_deadlines(self, days_ahead: int = 7) -> List[Project]:
+        """Get projects with deadlines in the next X days"""
+        return self.db.execute(self.upcoming_deadlines_statement(days_ahead)).scalars().all()
+    
     def update_project_progress(self, project_id: int) -> Optional[Project]:
         """Auto-calculate project progress based on completed tasks"""
-        
+        # Recomputed from scratch, so a concurrent recompute is simply re-run
+        return versioned_write(self.db, None, lambda: self._update_project_progress(project_id))
+
+    def _update_project_progress(self, project_id: int) -> Optional[Project]:
         project = self.db.query(Project).filter(Project.id == project_id).first()
         if not project:
             return None
@@ -87,11 +116,16 @@ class ProjectService:
             .all()
         )
         
-        total_tasks = len(project_tasks)
+        # Archived tasks are finished ones that still belong to the project
+        from smart_scheduler.services.archive_service import ArchiveService
+        archived = ArchiveService(self.db).task_status_counts(project_id)
+        
+        total_tasks = len(project_tasks) + sum(archived.values())
         if total_tasks == 0:
             project.progress_percentage = 0.0
         else:
             completed_tasks = sum(1 for task in project_tasks if task.status == TaskStatus.COMPLETED)
+            completed_tasks += archived.get(TaskStatus.COMPLETED, 0)
             project.progress_percentage = (completed_tasks / total_tasks) * 100
         
         # Check if project should be marked as completed
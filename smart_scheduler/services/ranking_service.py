@@ -0,0 +1,229 @@
+# smart_scheduler/services/ranking_service.py - "What should I work on next?"
+#
+# Every open task gets an urgency score from its priority, the time left to
+# its due date, its remaining size and its project's deadline pressure. The
+# scores are computed as NumPy arrays over all open tasks at once and kept
+# in an in-memory heap; task writes re-score only the tasks they touch, so
+# /api/tasks/next walks the heap without a database round trip.
+import bisect
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.orm import Session
+
+from smart_scheduler.models.project import Project
+from smart_scheduler.models.task import Task, TaskPriority, TaskStatus
+
+RANKABLE_STATUSES = (TaskStatus.PENDING, TaskStatus.SCHEDULED, TaskStatus.IN_PROGRESS)
+PRIORITY_WEIGHTS = {
+    TaskPriority.LOW: 1.0,
+    TaskPriority.MEDIUM: 2.0,
+    TaskPriority.HIGH: 3.0,
+    TaskPriority.URGENT: 5.0,
+}
+# Due-date urgency: DUE_WEIGHT when due now, half of it DUE_HALF_LIFE_HOURS out
+DUE_WEIGHT = 4.0
+DUE_HALF_LIFE_HOURS = 48.0
+OVERDUE_BONUS = 2.0
+# Small tasks get a nudge ("quick wins"); work already started a bigger one
+QUICK_WIN_WEIGHT = 0.5
+IN_PROGRESS_BONUS = 1.0
+# Project pressure is 0 with PRESSURE_SLACK_DAYS of slack between forecast
+# and deadline, 1 with none, 2 when forecast to be that many days late
+PRESSURE_WEIGHT = 2.0
+PRESSURE_SLACK_DAYS = 14.0
+DEFAULT_TASK_MINUTES = 60.0
+DEFAULT_LEVEL = 3
+# Upper bounds (minutes of remaining work) of the heap size classes
+SIZE_CLASSES = (15, 30, 60, 120, 240, 480)
+# Scores depend on the clock (and on project forecasts that change under
+# other tasks' writes), so the heap is rebuilt from scratch after this long
+RANKING_MAX_AGE = timedelta(minutes=15)
+
+def _epoch(column):
+    return cast(func.strftime("%s", column), Integer)
+
+def _ranking_statement():
+    return (
+        select(
+            Task.id, Task.title, Task.status, Task.priority, Task.estimated_duration, Task.progress_percentage,
+            Task.due_date, _epoch(Task.due_date), Task.energy_level_required, Task.focus_level_required,
+            Task.project_id, _epoch(Project.deadline), _epoch(Project.estimated_completion),
+        )
+        .outerjoin(Project, Project.id == Task.project_id)
+        .where(Task.status.in_(RANKABLE_STATUSES))
+    )
+
+def _bucket(item: Dict) -> Tuple[int, int, int]:
+    """(energy, focus, size class) heap an item lives in"""
+    return (
+        min(max(item["energy_level_required"] or DEFAULT_LEVEL, 1), 5),
+        min(max(item["focus_level_required"] or DEFAULT_LEVEL, 1), 5),
+        bisect.bisect_left(SIZE_CLASSES, item["remaining_minutes"]),
+    )
+
+def remaining_work(estimated, progress):
+    """Minutes left per task (object arrays in, float array out): the estimate, or a default, less progress"""
+    import numpy as np
+
+    estimated = np.where(estimated == None, DEFAULT_TASK_MINUTES, estimated).astype(float)  # noqa: E711
+    progress = np.where(progress == None, 0.0, progress).astype(float)  # noqa: E711
+    return estimated * (100.0 - np.clip(progress, 0.0, 100.0)) / 100.0
+
+def score_tasks(rows: List, now: datetime):
+    """Urgency scores for rows of _ranking_statement(), as one array expression per factor"""
+    # Imported here: task writes import this module, NumPy only loads once the ranking is used
+    import numpy as np
+
+    (_, _, status, priority, estimated, progress, _, due, _, _, _,
+     project_deadline, project_forecast) = (np.array(column, dtype=object) for column in zip(*rows))
+    now_ts = (now - datetime(1970, 1, 1)).total_seconds()
+
+    def floats(values, default):
+        return np.where(values == None, default, values).astype(float)  # noqa: E711
+
+    score = np.array([PRIORITY_WEIGHTS.get(p, PRIORITY_WEIGHTS[TaskPriority.MEDIUM]) for p in priority])
+
+    hours_left = (floats(due, now_ts) - now_ts) / 3600.0
+    due_score = DUE_WEIGHT * DUE_HALF_LIFE_HOURS / (DUE_HALF_LIFE_HOURS + np.maximum(hours_left, 0.0))
+    due_score += np.where(hours_left < 0, OVERDUE_BONUS, 0.0)
+    score += np.where(due == None, 0.0, due_score)  # noqa: E711
+
+    remaining = remaining_work(estimated, progress)
+    score += QUICK_WIN_WEIGHT * DEFAULT_TASK_MINUTES / (DEFAULT_TASK_MINUTES + remaining)
+    score += np.where(status == TaskStatus.IN_PROGRESS, IN_PROGRESS_BONUS, 0.0)
+
+    # Slack between the project's forecast completion (or now) and its deadline
+    finish = np.where(project_forecast == None, now_ts, project_forecast).astype(float)  # noqa: E711
+    slack_days = (floats(project_deadline, 0.0) - finish) / 86400.0
+    pressure = np.clip(1.0 - slack_days / PRESSURE_SLACK_DAYS, 0.0, 2.0)
+    score += np.where(project_deadline == None, 0.0, PRESSURE_WEIGHT * pressure)  # noqa: E711
+    return score
+
+class TaskRanking:
+    """Heaps of open tasks by score, with lazy deletion for superseded entries.
+
+    There is one heap per (energy, focus, size class) bucket, so a query
+    only ever looks inside the buckets it can use: filtering by energy,
+    focus and free time costs nothing for the tasks that don't fit.
+    """
+
+    def __init__(self):
+        self.heaps: Dict[Tuple[int, int, int], List[list]] = {}
+        self.entries: Dict[int, list] = {}  # task_id -> its live entry: [-score, sequence, item or None]
+        self.sequence = itertools.count()   # tie-break, so items are never compared
+        self.stale = 0
+        self.loaded_at = datetime.utcnow()
+
+    def update(self, rows: List, task_ids: Iterable[int] = (), now: Optional[datetime] = None):
+        """Replace the entries of `task_ids` with the freshly scored `rows`.
+
+        Ids without a row (closed, blocked or deleted tasks) just drop out.
+        """
+        now = now or datetime.utcnow()
+        for task_id in set(task_ids) | {row[0] for row in rows}:
+            entry = self.entries.pop(task_id, None)
+            if entry is not None:
+                entry[2] = None
+                self.stale += 1
+        if rows:
+            import numpy as np
+
+            scores = score_tasks(rows, now)
+            remaining = remaining_work(np.array([row[4] for row in rows], dtype=object),
+                                       np.array([row[5] for row in rows], dtype=object))
+            for row, score, left in zip(rows, scores.tolist(), remaining.tolist()):
+                item = {
+                    "id": row[0],
+                    "title": row[1],
+                    "status": row[2],
+                    "priority": row[3],
+                    "estimated_duration": row[4],
+                    "remaining_minutes": round(left),
+                    "due_date": row[6],
+                    "energy_level_required": row[8],
+                    "focus_level_required": row[9],
+                    "project_id": row[10],
+                    "score": round(score, 3),
+                }
+                entry = [-score, next(self.sequence), item]
+                self.entries[row[0]] = entry
+                heapq.heappush(self.heaps.setdefault(_bucket(item), []), entry)
+        # Drop superseded entries once they outnumber the live ones
+        if self.stale > len(self.entries) + 64:
+            self.heaps = {}
+            for entry in self.entries.values():
+                self.heaps.setdefault(_bucket(entry[2]), []).append(entry)
+            for heap in self.heaps.values():
+                heapq.heapify(heap)
+            self.stale = 0
+
+    def best(self, energy: int = 5, focus: int = 5, minutes: Optional[float] = None, limit: int = 5) -> List[Dict]:
+        """Highest-scoring tasks that fit the current energy, focus and free time.
+
+        Walks the usable heaps best-first without popping them, so the cost
+        grows with the number of entries returned, not with the open tasks.
+        """
+        max_size = bisect.bisect_left(SIZE_CLASSES, minutes) if minutes is not None else len(SIZE_CLASSES)
+        frontier = [
+            (heap[0][0], heap[0][1], heap, 0)
+            for (task_energy, task_focus, size), heap in self.heaps.items()
+            if heap and task_energy <= energy and task_focus <= focus and size <= max_size
+        ]
+        heapq.heapify(frontier)
+        found = []
+        while frontier and len(found) < limit:
+            _, _, heap, index = heapq.heappop(frontier)
+            item = heap[index][2]
+            # Only the largest usable size class can hold tasks that don't fit
+            if item is not None and (minutes is None or item["remaining_minutes"] <= minutes):
+                found.append(item)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child][0], heap[child][1], heap, child))
+        return found
+
+_ranking: Optional[TaskRanking] = None
+_ranking_lock = threading.Lock()
+
+def reset_ranking():
+    """Forget the heap; the next request re-scores every open task"""
+    global _ranking
+    with _ranking_lock:
+        _ranking = None
+
+def get_ranking(db: Session) -> TaskRanking:
+    """The cached heap, built on first use and once it is RANKING_MAX_AGE old"""
+    global _ranking
+    with _ranking_lock:
+        if _ranking is None or datetime.utcnow() - _ranking.loaded_at > RANKING_MAX_AGE:
+            ranking = TaskRanking()
+            ranking.update(db.execute(_ranking_statement()).all())
+            _ranking = ranking
+        return _ranking
+
+def tasks_changed(db: Session, task_ids: Iterable[int]):
+    """Re-score just these tasks after a committed write (no-op before first use)"""
+    task_ids = [task_id for task_id in set(task_ids) if task_id is not None]
+    if _ranking is None or not task_ids:
+        return
+    rows = db.execute(_ranking_statement().where(Task.id.in_(task_ids))).all()
+    with _ranking_lock:
+        if _ranking is not None:
+            _ranking.update(rows, task_ids)
+
+class RankingService:
+    """Next-best-task suggestions from the cached ranking"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def next_tasks(self, energy: int = 5, focus: int = 5, minutes: Optional[float] = None,
+                   limit: int = 5) -> List[Dict]:
+        ranking = get_ranking(self.db)
+        with _ranking_lock:
+            return ranking.best(energy, focus, minutes, limit)
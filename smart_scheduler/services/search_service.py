@@ -0,0 +1,89 @@
+# smart_scheduler/services/search_service.py - Full-text search over the FTS5 index
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Each entity is ranked by FTS5 itself: `rank MATCH 'bm25(...)'` sets the
+# weights and `ORDER BY rank LIMIT :window` takes FTS5's top-N path, which
+# scores every match but keeps only `window` rows instead of sorting them
+# all (and only computes snippets for those). The window is the end of the
+# requested page plus one, so each entity's window holds every row of the
+# merged page and `has_more` is exact.
+def _entity_query(entity: str, fts: str, title_column: str, weights: str) -> str:
+    return (
+        f"SELECT * FROM (SELECT '{entity}' AS type, rowid AS id, {title_column} AS title, "
+        f"snippet({fts}, -1, '[', ']', '…', 12) AS snippet, rank "
+        f"FROM {fts} WHERE {fts} MATCH :query AND rank MATCH 'bm25({weights})' "
+        f"ORDER BY rank LIMIT :window)"
+    )
+
+# One ranked sub-query per searchable entity. bm25() weights follow the
+# FTS column order: titles/names count most, then tags/category, then
+# descriptions. Lower bm25 scores are better matches.
+_ENTITY_QUERIES = {
+    "task": _entity_query("task", "tasks_fts", "title", "10.0, 1.0, 4.0, 4.0"),
+    "deadline": _entity_query("deadline", "deadlines_fts", "title", "10.0, 1.0"),
+    "project": _entity_query("project", "projects_fts", "name", "10.0, 1.0"),
+}
+
+SEARCH_TYPES = tuple(_ENTITY_QUERIES)
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+def build_match_query(query: str) -> Optional[str]:
+    """Turn free text into a safe FTS5 MATCH expression.
+
+    Every word must match (implicit AND); the last word also matches as a
+    prefix so results appear while the user is still typing. Quoting each
+    term keeps FTS5 operators in user input from being interpreted.
+    """
+    terms = _TERM_RE.findall(query)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+class SearchService:
+    """Ranked full-text search across tasks, deadlines and projects"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search(
+        self,
+        query: str,
+        types: Optional[List[str]] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Dict:
+        """Return one page of results ordered by relevance.
+
+        Fetches one row beyond the page to report `has_more` without a
+        separate COUNT over every match.
+        """
+        match = build_match_query(query)
+        selected = [t for t in (types or SEARCH_TYPES) if t in _ENTITY_QUERIES]
+        if not match or not selected:
+            return {"query": query, "results": [], "limit": limit, "offset": offset, "has_more": False}
+
+        sql = " UNION ALL ".join(_ENTITY_QUERIES[t] for t in selected)
+        sql += " ORDER BY rank LIMIT :limit OFFSET :offset"
+        rows = self.db.execute(
+            text(sql),
+            {"query": match, "limit": limit + 1, "offset": offset, "window": offset + limit + 1}
+        ).all()
+
+        return {
+            "query": query,
+            "results": [
+                {"type": row.type, "id": row.id, "title": row.title,
+                 "snippet": row.snippet, "rank": row.rank}
+                for row in rows[:limit]
+            ],
+            "limit": limit,
+            "offset": offset,
+            "has_more": len(rows) > limit,
+        }
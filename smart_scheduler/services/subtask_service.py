@@ -0,0 +1,207 @@
+# smart_scheduler/services/subtask_service.py - Subtask hierarchy and rollups
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, insert, literal, select, text, union_all, update
+from sqlalchemy.orm import Session
+
+from smart_scheduler.models.task import Task, TaskStatus
+from smart_scheduler.models.task_closure import TaskClosure
+
+class HierarchyError(ValueError):
+    """Raised for moves that would break the tree (unknown parent, cycles)"""
+
+def own_contribution(task: Task) -> Dict[str, int]:
+    """What one task adds to each of its ancestors' descendant_* rollups"""
+    return {
+        "count": 1,
+        "completed": 1 if task.status == TaskStatus.COMPLETED else 0,
+        "estimated": task.estimated_duration or 0,
+        "actual": task.actual_duration or 0,
+    }
+
+def subtree_contribution(task: Task) -> Dict[str, int]:
+    """The task plus everything below it"""
+    own = own_contribution(task)
+    return {
+        "count": own["count"] + task.descendant_count,
+        "completed": own["completed"] + task.descendant_completed_count,
+        "estimated": own["estimated"] + task.descendant_estimated_duration,
+        "actual": own["actual"] + task.descendant_actual_duration,
+    }
+
+def rebuild_hierarchy(connection) -> None:
+    """Recompute task_closure and all rollups from tasks.parent_id.
+
+    Two set-based statements, usable from Alembic revisions. The depth
+    guard stops runaway recursion if parent_id data contains a cycle.
+    """
+    connection.execute(text("DELETE FROM task_closure"))
+    connection.execute(text(
+        "INSERT INTO task_closure (ancestor_id, descendant_id, depth) "
+        "WITH RECURSIVE chain(descendant_id, ancestor_id, depth) AS ("
+        "  SELECT id, parent_id, 1 FROM tasks WHERE parent_id IS NOT NULL"
+        "  UNION ALL"
+        "  SELECT chain.descendant_id, t.parent_id, chain.depth + 1"
+        "  FROM chain JOIN tasks t ON t.id = chain.ancestor_id"
+        "  WHERE t.parent_id IS NOT NULL AND chain.depth < 100"
+        ") SELECT ancestor_id, descendant_id, min(depth) FROM chain GROUP BY ancestor_id, descendant_id"
+    ))
+    connection.execute(text(
+        "UPDATE tasks SET "
+        "descendant_count = coalesce((SELECT count(*) FROM task_closure c "
+        "  WHERE c.ancestor_id = tasks.id), 0), "
+        "descendant_completed_count = coalesce((SELECT sum(d.status = 'COMPLETED') FROM task_closure c "
+        "  JOIN tasks d ON d.id = c.descendant_id WHERE c.ancestor_id = tasks.id), 0), "
+        "descendant_estimated_duration = coalesce((SELECT sum(coalesce(d.estimated_duration, 0)) FROM task_closure c "
+        "  JOIN tasks d ON d.id = c.descendant_id WHERE c.ancestor_id = tasks.id), 0), "
+        "descendant_actual_duration = coalesce((SELECT sum(coalesce(d.actual_duration, 0)) FROM task_closure c "
+        "  JOIN tasks d ON d.id = c.descendant_id WHERE c.ancestor_id = tasks.id), 0)"
+    ))
+
+class SubtaskService:
+    """Closure-table hierarchy with incrementally maintained subtree rollups.
+
+    Methods only stage changes; callers (TaskService, routes) commit.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _ancestor_ids(self, task_id: int):
+        return select(TaskClosure.ancestor_id).where(TaskClosure.descendant_id == task_id)
+
+    def _apply_to_ancestors(self, task_id: int, delta: Dict[str, int], sign: int = 1):
+        """Add `delta` to the descendant_* rollups of every ancestor in one UPDATE"""
+        if not any(delta.values()):
+            return
+        self.db.execute(
+            update(Task)
+            .where(Task.id.in_(self._ancestor_ids(task_id)))
+            .values(
+                descendant_count=Task.descendant_count + sign * delta["count"],
+                descendant_completed_count=Task.descendant_completed_count + sign * delta["completed"],
+                descendant_estimated_duration=Task.descendant_estimated_duration + sign * delta["estimated"],
+                descendant_actual_duration=Task.descendant_actual_duration + sign * delta["actual"],
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    def _link(self, task_id: int, parent_id: int):
+        """Connect task's subtree under parent: (parent + its ancestors) x (task + its descendants)"""
+        ancestors = union_all(
+            select(TaskClosure.ancestor_id, TaskClosure.depth).where(TaskClosure.descendant_id == parent_id),
+            select(literal(parent_id), literal(0)),
+        ).subquery("a")
+        descendants = union_all(
+            select(TaskClosure.descendant_id, TaskClosure.depth).where(TaskClosure.ancestor_id == task_id),
+            select(literal(task_id), literal(0)),
+        ).subquery("d")
+        a_id, a_depth = ancestors.c
+        d_id, d_depth = descendants.c
+        self.db.execute(
+            insert(TaskClosure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(a_id, d_id, a_depth + d_depth + 1).select_from(ancestors.join(descendants, literal(True))),
+            )
+        )
+
+    def _unlink(self, task_id: int):
+        """Detach task's subtree from all of its ancestors"""
+        subtree = union_all(
+            select(TaskClosure.descendant_id).where(TaskClosure.ancestor_id == task_id),
+            select(literal(task_id)),
+        )
+        self.db.execute(
+            delete(TaskClosure)
+            .where(TaskClosure.descendant_id.in_(subtree))
+            .where(TaskClosure.ancestor_id.in_(self._ancestor_ids(task_id)))
+            .execution_options(synchronize_session=False)
+        )
+
+    def attach_new_task(self, task: Task):
+        """Register a newly flushed task under task.parent_id"""
+        if task.parent_id is None:
+            return
+        if self.db.get(Task, task.parent_id) is None:
+            raise HierarchyError(f"Parent task {task.parent_id} not found")
+        self._link(task.id, task.parent_id)
+        self._apply_to_ancestors(task.id, own_contribution(task))
+
+    def apply_change(self, task_id: int, before: Dict[str, int], after: Dict[str, int]):
+        """Propagate a change in one task's own status/durations to its ancestors"""
+        delta = {key: after[key] - before[key] for key in after}
+        self._apply_to_ancestors(task_id, delta)
+
+    def move(self, task: Task, new_parent_id: Optional[int]):
+        """Move a task and its whole subtree under a new parent (None = top level).
+
+        Closure rows are rewritten with one DELETE and one INSERT ... SELECT,
+        and rollups shift with one UPDATE on each side, whatever the subtree size.
+        """
+        # Rollup columns may have moved under us through core UPDATEs
+        self.db.refresh(task)
+        if new_parent_id == task.parent_id:
+            return task
+        if new_parent_id is not None:
+            if new_parent_id == task.id:
+                raise HierarchyError("A task cannot be its own parent")
+            if self.db.get(Task, new_parent_id) is None:
+                raise HierarchyError(f"Parent task {new_parent_id} not found")
+            is_descendant = self.db.execute(
+                select(TaskClosure.depth).where(
+                    TaskClosure.ancestor_id == task.id, TaskClosure.descendant_id == new_parent_id
+                )
+            ).first()
+            if is_descendant:
+                raise HierarchyError("Cannot move a task under one of its own subtasks")
+
+        contribution = subtree_contribution(task)
+        self._apply_to_ancestors(task.id, contribution, sign=-1)
+        self._unlink(task.id)
+        if new_parent_id is not None:
+            self._link(task.id, new_parent_id)
+            self._apply_to_ancestors(task.id, contribution)
+        task.parent_id = new_parent_id
+        return task
+
+    def detach_for_delete(self, task: Task):
+        """Prepare a task for deletion: children move up to its parent, rollups shrink"""
+        children = self.db.execute(
+            select(Task).where(Task.parent_id == task.id).execution_options(populate_existing=True)
+        ).scalars().all()
+        for child in children:
+            self.move(child, task.parent_id)
+        self.db.flush()
+        self.db.refresh(task)
+        self._apply_to_ancestors(task.id, own_contribution(task), sign=-1)
+        self.db.execute(
+            delete(TaskClosure)
+            .where(TaskClosure.descendant_id == task.id)
+            .execution_options(synchronize_session=False)
+        )
+
+    def get_subtree(self, task_id: int) -> List[Dict]:
+        """The task and all its descendants in one statement, ordered by depth"""
+        fields = ["id", "parent_id", "title", "status", "priority", "estimated_duration",
+                  "actual_duration", "progress_percentage"]
+        columns = [getattr(Task, field) for field in fields]
+        below = (
+            select(*columns, TaskClosure.depth)
+            .join(TaskClosure, TaskClosure.descendant_id == Task.id)
+            .where(TaskClosure.ancestor_id == task_id)
+        )
+        root = select(*columns, literal(0).label("depth")).where(Task.id == task_id)
+        stmt = union_all(root, below).order_by(text("depth"), text("id"))
+        return [dict(zip(fields + ["depth"], row)) for row in self.db.execute(stmt)]
+
+    def get_rollup(self, task: Task) -> Dict:
+        """Subtree totals read straight from the maintained rollup columns"""
+        totals = subtree_contribution(task)
+        return {
+            "task_id": task.id,
+            "task_count": totals["count"],
+            "completed_count": totals["completed"],
+            "progress_percentage": round(totals["completed"] / totals["count"] * 100, 1),
+            "estimated_duration": totals["estimated"],
+            "actual_duration": totals["actual"],
+        }
@@ -0,0 +1,101 @@
+# smart_scheduler/services/sync_service.py - Delta sync from the change log
+from datetime import datetime, timedelta
+from typing import Dict
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from smart_scheduler.core.serialization import row_dicts
+from smart_scheduler.models.change_log import ChangeLog, ChangeLogHorizon
+from smart_scheduler.models.deadline import Deadline
+from smart_scheduler.models.notification import Notification
+from smart_scheduler.models.project import Project
+from smart_scheduler.models.task import Task
+
+# Changes per /api/sync page
+SYNC_PAGE_SIZE = 1000
+
+# entity -> (model, response key); rows go out with every column
+SYNC_MODELS = {
+    "task": (Task, "tasks"),
+    "deadline": (Deadline, "deadlines"),
+    "project": (Project, "projects"),
+    "notification": (Notification, "notifications"),
+}
+
+class SyncService:
+    """Reads the change feed for clients and compacts old tombstones"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def horizon(self) -> int:
+        """Highest seq ever compacted away; older cursors have to start over"""
+        return self.db.execute(select(ChangeLogHorizon.seq).where(ChangeLogHorizon.id == 1)).scalar() or 0
+
+    def changes(self, since: int = 0, limit: int = SYNC_PAGE_SIZE) -> Dict:
+        """Everything changed after `since`, as current rows plus tombstones.
+
+        Each entity appears at most once, with its row as of now. Callers
+        store `cursor` and pass it back as `since`; `more` means another page
+        is waiting. since=0 is a full download and is never paged: its
+        cursors could fall behind the compaction horizon part-way through.
+        `reset` tells a client its cursor predates compaction: it should drop
+        its local copy and apply this (full) response from scratch.
+        """
+        horizon = self.horizon()
+        reset = 0 < since < horizon
+        if reset:
+            since = 0
+
+        if since == 0:
+            upper = self.db.execute(select(func.max(ChangeLog.seq))).scalar() or 0
+            more = False
+        else:
+            seqs = self.db.execute(
+                select(ChangeLog.seq).where(ChangeLog.seq > since).order_by(ChangeLog.seq).limit(limit + 1)
+            ).scalars().all()
+            more = len(seqs) > limit
+            upper = seqs[:limit][-1] if seqs else since
+        window = (ChangeLog.seq > since, ChangeLog.seq <= upper)
+
+        # Rows are selected by subquery, not by an id list - a full download
+        # can name more ids than SQLite allows bound parameters
+        changed, deleted = {}, {}
+        for entity, (model, key) in SYNC_MODELS.items():
+            logged = select(ChangeLog.entity_id).where(ChangeLog.entity == entity, *window)
+            fields = [column.key for column in model.__table__.columns]
+            changed[key] = row_dicts(
+                self.db, fields, model, select(model).where(model.id.in_(logged.where(ChangeLog.op == "upsert")))
+            )
+            deleted[key] = self.db.execute(logged.where(ChangeLog.op == "delete")).scalars().all()
+
+        return {
+            "cursor": max(upper, horizon),
+            "more": more,
+            "reset": reset,
+            "changed": changed,
+            "deleted": deleted,
+        }
+
+    def compact(self, retention_days: int) -> int:
+        """Drop tombstones older than `retention_days` and move the horizon past them.
+
+        Live entities need no compaction - the triggers keep one row each.
+        Returns the number of tombstones removed.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        expired = (ChangeLog.op == "delete", ChangeLog.changed_at < cutoff)
+        newest = self.db.execute(select(func.max(ChangeLog.seq)).where(*expired)).scalar()
+        if newest is None:
+            return 0
+
+        removed = self.db.execute(
+            delete(ChangeLog).where(*expired, ChangeLog.seq <= newest).execution_options(synchronize_session=False)
+        ).rowcount
+        upsert = sqlite_insert(ChangeLogHorizon).values(id=1, seq=newest)
+        self.db.execute(upsert.on_conflict_do_update(
+            index_elements=["id"], set_={"seq": func.max(ChangeLogHorizon.seq, upsert.excluded.seq)}
+        ))
+        return removed
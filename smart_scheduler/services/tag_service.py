@@ -0,0 +1,103 @@
+# smart_scheduler/services/tag_service.py - Normalized task tags
+import json
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from smart_scheduler.models.task_tag import TaskTag
+
+TAG_MODES = ("any", "all")
+
+def parse_tags(value: Optional[str]) -> List[str]:
+    """Split a Task.tags string into normalized tags.
+
+    Accepts a JSON array ('["exam", "math"]') or a comma-separated list
+    ('exam, math'). Tags are trimmed, lower-cased and de-duplicated.
+    """
+    if not value:
+        return []
+    items = None
+    if value.lstrip().startswith("["):
+        try:
+            items = json.loads(value)
+        except ValueError:
+            items = None
+    if not isinstance(items, list):
+        items = value.split(",")
+
+    tags = []
+    for item in items:
+        tag = str(item).strip().lower()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+def tag_filter(task_id_column, tags: List[str], mode: str = "any", tag_model=TaskTag):
+    """WHERE clause matching tasks carrying any/all of `tags` via the (tag, task_id) index.
+
+    tag_model=TaskArchiveTag matches archived tasks instead.
+    """
+    tags = [t.strip().lower() for t in tags if t.strip()]
+    matching = select(tag_model.task_id).where(tag_model.tag.in_(tags))
+    if mode == "all":
+        matching = matching.group_by(tag_model.task_id).having(func.count(tag_model.tag) == len(set(tags)))
+    return task_id_column.in_(matching)
+
+def backfill_task_tags(connection, batch_size: int = 1000, on_batch=None) -> int:
+    """Fill task_tags from tasks.tags in id-ordered batches; returns tasks processed.
+
+    Uses plain SQL so Alembic revisions can call it with op.get_bind().
+    Existing rows for a batch are replaced, so re-running is safe.
+    """
+    last_id = 0
+    processed = 0
+    while True:
+        rows = connection.execute(
+            text("SELECT id, tags FROM tasks WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": batch_size},
+        ).all()
+        if not rows:
+            return processed
+
+        first_id, last_id = rows[0][0], rows[-1][0]
+        connection.execute(
+            text("DELETE FROM task_tags WHERE task_id BETWEEN :first AND :last"),
+            {"first": first_id, "last": last_id},
+        )
+        pairs = [{"task_id": task_id, "tag": tag} for task_id, tags in rows for tag in parse_tags(tags)]
+        if pairs:
+            connection.execute(text("INSERT INTO task_tags (task_id, tag) VALUES (:task_id, :tag)"), pairs)
+        processed += len(rows)
+        if on_batch:
+            on_batch(processed)
+
+class TagService:
+    """Keeps task_tags in step with Task.tags and answers tag queries"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def set_task_tags(self, task_id: int, tags: Optional[str]):
+        """Replace the normalized tags of one task (caller commits)"""
+        self.db.execute(delete(TaskTag).where(TaskTag.task_id == task_id))
+        rows = [{"task_id": task_id, "tag": tag} for tag in parse_tags(tags)]
+        if rows:
+            self.db.execute(insert(TaskTag), rows)
+
+    def set_many_task_tags(self, pairs: Iterable):
+        """Add tags for freshly inserted tasks given (task_id, tags) pairs (caller commits)"""
+        rows = [{"task_id": task_id, "tag": tag} for task_id, tags in pairs for tag in parse_tags(tags)]
+        if rows:
+            self.db.execute(insert(TaskTag), rows)
+
+    def clear_task_tags(self, task_id: int):
+        self.db.execute(delete(TaskTag).where(TaskTag.task_id == task_id))
+
+    def get_tag_cloud(self, limit: Optional[int] = None) -> List[Dict]:
+        """Tag usage counts, most used first, counted by the database"""
+        count = func.count(TaskTag.task_id).label("count")
+        stmt = select(TaskTag.tag, count).group_by(TaskTag.tag).order_by(count.desc(), TaskTag.tag)
+        if limit:
+            stmt = stmt.limit(limit)
+        return [{"tag": tag, "count": n} for tag, n in self.db.execute(stmt)]
@@ -1,8 +1,27 @@
 # smart_scheduler/services/task_service.py - ENHANCED VERSION
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from smart_scheduler.core.concurrency import check_version, versioned_write
+from smart_scheduler.models.archive import TaskArchive, TaskArchiveTag
 from smart_scheduler.models.task import Task, TaskStatus, TaskPriority
+from smart_scheduler.models.task_tag import TaskTag
+from smart_scheduler.models.records import TaskRecord, TaskCalendarRecord, load_records
+from smart_scheduler.services.tag_service import TagService, tag_filter
+from smart_scheduler.services.subtask_service import HierarchyError, SubtaskService, own_contribution
+from smart_scheduler.services.dependency_service import DependencyService, remaining_minutes
+from smart_scheduler.services.work_session_service import WorkSessionService
+from smart_scheduler.services.workload_service import WorkloadService, task_load_of
+from smart_scheduler.services.ranking_service import tasks_changed
+from smart_scheduler.services.progress_service import ProgressService
+from collections import Counter
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Stored datetimes are naive UTC; bring aware query bounds into that form"""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
 
 class TaskService:
     """Service layer for task operations"""
@@ -24,9 +43,10 @@ class TaskService:
         scheduled_end_time: Optional[datetime] = None,
         project_id: Optional[int] = None,
         energy_level_required: int = 3,
-        focus_level_required: int = 3
+        focus_level_required: int = 3,
+        parent_id: Optional[int] = None
     ) -> Task:
-        """Create a new task"""
+        """Create a new task (optionally as a subtask of `parent_id`)"""
         
         task = Task(
             title=title,
@@ -41,12 +61,25 @@ class TaskService:
             scheduled_end_time=scheduled_end_time,
             project_id=project_id,
             energy_level_required=energy_level_required,
-            focus_level_required=focus_level_required
+            focus_level_required=focus_level_required,
+            parent_id=parent_id
         )
         
         self.db.add(task)
+        if tags or parent_id is not None:
+            self.db.flush()  # assigns task.id
+        if tags:
+            TagService(self.db).set_task_tags(task.id, tags)
+        if parent_id is not None:
+            try:
+                SubtaskService(self.db).attach_new_task(task)
+            except HierarchyError:
+                self.db.rollback()
+                raise
+        WorkloadService(self.db).apply(Counter(), task_load_of(task))
         self.db.commit()
         self.db.refresh(task)
+        tasks_changed(self.db, [task.id])
         
         return task
     
@@ -56,63 +89,156 @@ class TaskService:
         category: Optional[str] = None,
         priority: Optional[TaskPriority] = None,
         project_id: Optional[int] = None,  # NEW
-        limit: int = 100
+        limit: int = 100,
+        tags: Optional[List[str]] = None,
+        tag_mode: str = "any"
     ) -> List[Task]:
         """Get tasks with optional filtering"""
+        stmt = self.tasks_statement(status, category, priority, project_id, limit, tags, tag_mode)
+        return self.db.execute(stmt).scalars().all()
+    
+    def tasks_statement(
+        self,
+        status: Optional[TaskStatus] = None,
+        category: Optional[str] = None,
+        priority: Optional[TaskPriority] = None,
+        project_id: Optional[int] = None,
+        limit: Optional[int] = 100,
+        tags: Optional[List[str]] = None,
+        tag_mode: str = "any",
+        model=Task
+    ):
+        """select() behind get_tasks, reusable for column-only reads.
+
+        `tags` keeps tasks carrying any (tag_mode="any") or all
+        (tag_mode="all") of the given tags. model=TaskArchive runs the
+        same query over archived tasks.
+        """
         
-        query = self.db.query(Task)
+        stmt = select(model)
         
         if status:
-            query = query.filter(Task.status == status)
+            stmt = stmt.where(model.status == status)
         
         if category:
-            query = query.filter(Task.category == category)
+            stmt = stmt.where(model.category == category)
         
         if priority:
-            query = query.filter(Task.priority == priority)
+            stmt = stmt.where(model.priority == priority)
             
         if project_id:  # NEW
-            query = query.filter(Task.project_id == project_id)
+            stmt = stmt.where(model.project_id == project_id)
+        
+        if tags:
+            tag_model = TaskArchiveTag if model is TaskArchive else TaskTag
+            stmt = stmt.where(tag_filter(model.id, tags, tag_mode, tag_model))
         
-        return query.order_by(Task.created_at.desc()).limit(limit).all()
+        stmt = stmt.order_by(model.created_at.desc())
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
+    
+    def get_task_records(
+        self,
+        status: Optional[TaskStatus] = None,
+        category: Optional[str] = None,
+        priority: Optional[TaskPriority] = None,
+        project_id: Optional[int] = None,
+        limit: Optional[int] = 100,
+        tags: Optional[List[str]] = None,
+        tag_mode: str = "any"
+    ) -> List[TaskRecord]:
+        """Read-only version of get_tasks for list pages (no ORM hydration)"""
+        stmt = self.tasks_statement(status, category, priority, project_id, limit, tags, tag_mode)
+        return load_records(self.db, TaskRecord, Task, stmt)
+    
+    def get_task_records_by_ids(self, task_ids: List[int]) -> List[TaskRecord]:
+        """Records for the given ids, in the order given (unknown ids are skipped)"""
+        records = {r.id: r for r in load_records(self.db, TaskRecord, Task, select(Task).where(Task.id.in_(task_ids)))}
+        return [records[task_id] for task_id in task_ids if task_id in records]
     
     def get_task_by_id(self, task_id: int) -> Optional[Task]:
         """Get a specific task by ID"""
         return self.db.query(Task).filter(Task.id == task_id).first()
     
-    def update_task_status(self, task_id: int, status: TaskStatus) -> Optional[Task]:
-        """Update task status"""
+    def update_task_status(self, task_id: int, status: TaskStatus,
+                           expected_version: Optional[int] = None) -> Optional[Task]:
+        """Update task status (optionally only if the task is still at `expected_version`)"""
+        # Buffered progress/start/pause of this task land first, in their own commit
+        ProgressService(self.db).flush([task_id])
+        return versioned_write(self.db, expected_version,
+                               lambda: self._update_task_status(task_id, status, expected_version))
+    
+    def _update_task_status(self, task_id: int, status: TaskStatus, expected_version: Optional[int]) -> Optional[Task]:
         task = self.get_task_by_id(task_id)
         if not task:
             return None
+        check_version(task, expected_version)
         
+        before = own_contribution(task)
+        remaining_before = remaining_minutes(task)
+        load_before = task_load_of(task)
+        was_running = task.status == TaskStatus.IN_PROGRESS
         task.status = status
         task.updated_at = datetime.utcnow()
         
+        # IN_PROGRESS <=> an open work session
+        if status == TaskStatus.IN_PROGRESS and not was_running:
+            WorkSessionService(self.db).start(task.id)
+        elif was_running and status != TaskStatus.IN_PROGRESS:
+            WorkSessionService(self.db).stop(task.id)
+        
         # NEW: If completing task, set completed_at
         if status == TaskStatus.COMPLETED:
             task.completed_at = datetime.utcnow()
             task.progress_percentage = 100.0
+            if not before["completed"]:
+                # Imported here: NumPy only loads once forecasting is used
+                from smart_scheduler.services.forecast_service import record_completion
+                record_completion(task)
         
+        if task.parent_id is not None:
+            SubtaskService(self.db).apply_change(task.id, before, own_contribution(task))
+        # Shift downstream earliest starts; completing may unblock successors
+        unblocked = DependencyService(self.db).task_changed(task, remaining_before)
+        WorkloadService(self.db).apply(load_before, task_load_of(task))
         self.db.commit()
         self.db.refresh(task)
+        tasks_changed(self.db, [task.id, *unblocked])
         
         return task
     
-    def delete_task(self, task_id: int) -> bool:
+    def delete_task(self, task_id: int, expected_version: Optional[int] = None) -> bool:
         """Delete a task"""
+        ProgressService(self.db).flush([task_id])
+        return versioned_write(self.db, expected_version, lambda: self._delete_task(task_id, expected_version))
+    
+    def _delete_task(self, task_id: int, expected_version: Optional[int]) -> bool:
         task = self.get_task_by_id(task_id)
         if not task:
             return False
+        check_version(task, expected_version)
         
+        SubtaskService(self.db).detach_for_delete(task)
+        unblocked = DependencyService(self.db).detach_for_delete(task)
+        WorkSessionService(self.db).stop(task.id)
+        WorkloadService(self.db).apply(task_load_of(task), Counter())
         self.db.delete(task)
+        TagService(self.db).clear_task_tags(task_id)
         self.db.commit()
+        tasks_changed(self.db, [task_id, *unblocked])
         return True
     
-    def get_task_stats(self) -> dict:
-        """Get task statistics"""
+    def get_task_stats(self, include_archived: bool = False) -> dict:
+        """Get task statistics (of live tasks, or live and archived ones)"""
         total = self.db.query(Task).count()
         completed = self.db.query(Task).filter(Task.status == TaskStatus.COMPLETED).count()
+        if include_archived:
+            # Archived tasks are all COMPLETED or CANCELLED
+            from smart_scheduler.services.archive_service import ArchiveService
+            archived = ArchiveService(self.db).task_status_counts()
+            total += sum(archived.values())
+            completed += archived.get(TaskStatus.COMPLETED, 0)
         in_progress = self.db.query(Task).filter(Task.status == TaskStatus.IN_PROGRESS).count()
         pending = self.db.query(Task).filter(Task.status == TaskStatus.PENDING).count()
         scheduled = self.db.query(Task).filter(Task.status == TaskStatus.SCHEDULED).count()  # NEW
@@ -141,14 +267,31 @@ class TaskService:
         tags: Optional[str] = None,
         scheduled_start_time: Optional[datetime] = None,
         scheduled_end_time: Optional[datetime] = None,
-        project_id: Optional[int] = None
+        project_id: Optional[int] = None,
+        expected_version: Optional[int] = None
     ) -> Optional[Task]:
-        """Update an existing task"""
-        
+        """Update an existing task (optionally only if it is still at `expected_version`)"""
+        changes = dict(
+            title=title, description=description, priority=priority, category=category,
+            estimated_duration=estimated_duration, due_date=due_date, tags=tags,
+            scheduled_start_time=scheduled_start_time, scheduled_end_time=scheduled_end_time,
+            project_id=project_id,
+        )
+        ProgressService(self.db).flush([task_id])
+        return versioned_write(self.db, expected_version,
+                               lambda: self._update_task(task_id, expected_version, **changes))
+    
+    def _update_task(self, task_id: int, expected_version: Optional[int], title, description, priority,
+                     category, estimated_duration, due_date, tags, scheduled_start_time,
+                     scheduled_end_time, project_id) -> Optional[Task]:
         task = self.get_task_by_id(task_id)
         if not task:
             return None
+        check_version(task, expected_version)
         
+        before = own_contribution(task)
+        remaining_before = remaining_minutes(task)
+        load_before = task_load_of(task)
         # Update only provided fields
         if title is not None:
             task.title = title
@@ -164,6 +307,7 @@ class TaskService:
             task.due_date = due_date
         if tags is not None:
             task.tags = tags
+            TagService(self.db).set_task_tags(task.id, tags)
         if scheduled_start_time is not None:
             task.scheduled_start_time = scheduled_start_time
         if scheduled_end_time is not None:
@@ -173,6 +317,35 @@ class TaskService:
         
         task.updated_at = datetime.utcnow()
         
+        if task.parent_id is not None:
+            SubtaskService(self.db).apply_change(task.id, before, own_contribution(task))
+        unblocked = DependencyService(self.db).task_changed(task, remaining_before)
+        WorkloadService(self.db).apply(load_before, task_load_of(task))
+        self.db.commit()
+        self.db.refresh(task)
+        tasks_changed(self.db, [task.id, *unblocked])
+        
+        return task
+    
+    def move_task(self, task_id: int, parent_id: Optional[int],
+                  expected_version: Optional[int] = None) -> Optional[Task]:
+        """Re-parent a task with its whole subtree (parent_id=None makes it top level)"""
+        ProgressService(self.db).flush([task_id])
+        return versioned_write(self.db, expected_version,
+                               lambda: self._move_task(task_id, parent_id, expected_version))
+    
+    def _move_task(self, task_id: int, parent_id: Optional[int], expected_version: Optional[int]) -> Optional[Task]:
+        task = self.get_task_by_id(task_id)
+        if not task:
+            return None
+        check_version(task, expected_version)
+        
+        try:
+            SubtaskService(self.db).move(task, parent_id)
+        except HierarchyError:
+            self.db.rollback()
+            raise
+        task.updated_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(task)
         
@@ -196,33 +369,29 @@ class TaskService:
             .all()
         )
 
-    def get_tasks_plain(self, start_date=None, end_date=None):
-        from datetime import timezone
-        tasks = self.get_tasks()
-        result = []
-        for t in tasks:
-            if not t.due_date:
-                continue
-            # Ensure all datetimes are offset-aware (UTC)
-            due_date = t.due_date
-            if due_date.tzinfo is None:
-                due_date = due_date.replace(tzinfo=timezone.utc)
-            s_date = start_date
-            e_date = end_date
-            if s_date and s_date.tzinfo is None:
-                s_date = s_date.replace(tzinfo=timezone.utc)
-            if e_date and e_date.tzinfo is None:
-                e_date = e_date.replace(tzinfo=timezone.utc)
-            if (not s_date or due_date >= s_date) and (not e_date or due_date <= e_date):
-                result.append({
-                    "id": t.id,
-                    "title": t.title,
-                    "due_date": t.due_date,
-                    "color": "#3B82F6",
-                    "status": t.status.value if hasattr(t.status, 'value') else str(t.status),
-                    "completed": (t.status == 'completed' or (hasattr(t.status, 'value') and t.status.value == 'completed')),
-                    "category": t.category,
-                    "project_id": t.project_id,
-                    "recurrence": t.recurrence.value if hasattr(t.recurrence, 'value') else str(t.recurrence)
-                })
-        return result
\ No newline at end of file
+    def get_tasks_plain(self, start_date=None, end_date=None, tags=None, tag_mode="any"):
+        """Tasks due within [start_date, end_date] as plain dicts for the schedule view"""
+        stmt = select(Task).where(Task.due_date.isnot(None))
+        if tags:
+            stmt = stmt.where(tag_filter(Task.id, tags, tag_mode))
+        start_date = to_naive_utc(start_date)
+        end_date = to_naive_utc(end_date)
+        if start_date:
+            stmt = stmt.where(Task.due_date >= start_date)
+        if end_date:
+            stmt = stmt.where(Task.due_date <= end_date)
+        
+        return [
+            {
+                "id": t.id,
+                "title": t.title,
+                "due_date": t.due_date,
+                "color": "#3B82F6",
+                "status": t.status.value if t.status is not None else None,
+                "completed": t.status == TaskStatus.COMPLETED,
+                "category": t.category,
+                "project_id": t.project_id,
+                "recurrence": t.recurrence.value if t.recurrence is not None else None
+            }
+            for t in load_records(self.db, TaskCalendarRecord, Task, stmt.order_by(Task.due_date))
+        ]
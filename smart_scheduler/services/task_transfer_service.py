@@ -0,0 +1,207 @@
+# smart_scheduler/services/task_transfer_service.py - Bulk task import/export
+import csv
+import io
+import json
+from collections import Counter
+from datetime import datetime, date
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from smart_scheduler.models.task import Task, TaskStatus, TaskPriority, TaskRecurrence
+from smart_scheduler.services.tag_service import TagService
+from smart_scheduler.services.workload_service import WorkloadService, task_load_of
+from smart_scheduler.services.ranking_service import reset_ranking
+
+# Columns carried by exports, in output order
+EXPORT_FIELDS = [
+    "id", "title", "description", "status", "priority", "category", "tags",
+    "estimated_duration", "actual_duration", "progress_percentage",
+    "created_at", "updated_at", "due_date", "completed_at",
+    "scheduled_start_time", "scheduled_end_time", "project_id",
+    "recurrence", "recurrence_end_date",
+    "energy_level_required", "focus_level_required",
+]
+
+# How to turn an incoming (string or JSON) value back into a column value.
+# `id` is deliberately absent: imported rows always get fresh ids.
+_ENUM_FIELDS = {"status": TaskStatus, "priority": TaskPriority, "recurrence": TaskRecurrence}
+_INT_FIELDS = {"estimated_duration", "actual_duration", "project_id",
+               "energy_level_required", "focus_level_required"}
+_FLOAT_FIELDS = {"progress_percentage"}
+_DATETIME_FIELDS = {"created_at", "updated_at", "due_date", "completed_at",
+                    "scheduled_start_time", "scheduled_end_time"}
+_DATE_FIELDS = {"recurrence_end_date"}
+_TEXT_FIELDS = {"title", "description", "category", "tags"}
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+def _export_value(value):
+    if value is None:
+        return None
+    if hasattr(value, "value"):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _coerce_record(record) -> Dict:
+    """Validate one incoming record (a dict or a raw JSON line) and convert it to column values"""
+    if isinstance(record, str):
+        record = json.loads(record)
+    if not isinstance(record, dict):
+        raise ValueError("record must be a JSON object")
+    values = {}
+    for field, raw in record.items():
+        if raw is None or raw == "":
+            continue
+        if field in _ENUM_FIELDS:
+            values[field] = _ENUM_FIELDS[field](str(raw).lower())
+        elif field in _INT_FIELDS:
+            values[field] = int(raw)
+        elif field in _FLOAT_FIELDS:
+            values[field] = float(raw)
+        elif field in _DATETIME_FIELDS:
+            values[field] = datetime.fromisoformat(str(raw))
+        elif field in _DATE_FIELDS:
+            values[field] = date.fromisoformat(str(raw)[:10])
+        elif field in _TEXT_FIELDS:
+            values[field] = str(raw)
+        # Unknown columns (including `id`) are ignored
+
+    if not values.get("title"):
+        raise ValueError("title is required")
+
+    now = datetime.utcnow()
+    values.setdefault("status", TaskStatus.PENDING)
+    values.setdefault("priority", TaskPriority.MEDIUM)
+    values.setdefault("recurrence", TaskRecurrence.NONE)
+    values.setdefault("progress_percentage", 0.0)
+    values.setdefault("energy_level_required", 3)
+    values.setdefault("focus_level_required", 3)
+    values.setdefault("created_at", now)
+    values.setdefault("updated_at", now)
+    return values
+
+def parse_ndjson(lines: Iterable[str]) -> Iterator[str]:
+    """Yield each non-blank line of newline-delimited JSON.
+
+    Decoding happens per record in import_records(), so one malformed
+    line is reported as a failure instead of aborting the import.
+    """
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield line
+
+def parse_csv(lines: Iterable[str]) -> Iterator[Dict]:
+    """Yield one record per CSV row; the first row holds the column names"""
+    yield from csv.DictReader(lines)
+
+def guess_format(filename: Optional[str], default: str = "ndjson") -> str:
+    """Pick an import/export format from a file extension"""
+    if filename and filename.lower().endswith(".csv"):
+        return "csv"
+    return default
+
+class TaskTransferService:
+    """Streaming bulk import and export of tasks"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def iter_rows(self, batch_size: int = 1000) -> Iterator[Dict]:
+        """Yield every task as a plain dict, holding one batch in memory at a time"""
+        columns = [getattr(Task, field) for field in EXPORT_FIELDS]
+        stmt = (
+            select(*columns)
+            .order_by(Task.id)
+            # Server-side cursor where the driver supports it (PostgreSQL);
+            # SQLite's cursor already fetches incrementally
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        for row in self.db.execute(stmt):
+            yield {field: _export_value(value) for field, value in zip(EXPORT_FIELDS, row)}
+
+    def export_ndjson(self, batch_size: int = 1000) -> Iterator[str]:
+        """Yield the task table as newline-delimited JSON"""
+        for row in self.iter_rows(batch_size):
+            yield json.dumps(row, ensure_ascii=False) + "\n"
+
+    def export_csv(self, batch_size: int = 1000) -> Iterator[str]:
+        """Yield the task table as CSV, one row per chunk"""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+
+        def flush():
+            chunk = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk
+
+        writer.writeheader()
+        yield flush()
+        for row in self.iter_rows(batch_size):
+            writer.writerow(row)
+            yield flush()
+
+    def export(self, format: str = "ndjson", batch_size: int = 1000) -> Iterator[str]:
+        if format == "csv":
+            return self.export_csv(batch_size)
+        if format == "ndjson":
+            return self.export_ndjson(batch_size)
+        raise ValueError(f"Unsupported export format: {format}")
+
+    def import_records(
+        self,
+        records: Iterable[Dict],
+        chunk_size: int = 500,
+        skip: int = 0,
+        on_progress: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """Insert records in chunked transactions.
+
+        `skip` is the number of records already handled by an earlier run
+        (the `resume_from` value it reported), so an interrupted import can
+        be restarted without duplicating rows. `on_progress` is called with
+        the running totals after every committed chunk.
+        """
+        progress = {"imported": 0, "skipped": skip, "failed": 0, "resume_from": skip, "errors": []}
+        chunk: List[Dict] = []
+        position = 0
+
+        def commit_chunk():
+            if chunk:
+                inserted = self.db.execute(
+                    insert(Task).returning(Task.id, Task.tags, sort_by_parameter_order=True), chunk
+                )
+                TagService(self.db).set_many_task_tags(inserted.all())
+                load = Counter()
+                for values in chunk:
+                    load.update(task_load_of(values))
+                WorkloadService(self.db).apply(Counter(), load)
+                self.db.commit()
+                progress["imported"] += len(chunk)
+                chunk.clear()
+            progress["resume_from"] = max(position, skip)
+            if on_progress:
+                on_progress(progress)
+
+        for position, record in enumerate(records, start=1):
+            if position <= skip:
+                continue
+            try:
+                chunk.append(_coerce_record(record))
+            except (ValueError, TypeError) as e:
+                progress["failed"] += 1
+                # Keep the error list bounded for very large files
+                if len(progress["errors"]) < 100:
+                    progress["errors"].append({"record": position, "error": str(e)})
+            if len(chunk) >= chunk_size:
+                commit_chunk()
+
+        commit_chunk()
+        if progress["imported"]:
+            reset_ranking()  # re-scored in one pass on the next request
+        return progress
@@ -0,0 +1,206 @@
+# smart_scheduler/services/work_session_service.py - Time tracking and rollups
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import bindparam, func, literal_column, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from smart_scheduler.models.task import Task
+from smart_scheduler.models.work_session import WorkSession, DailyTimeTotal
+
+logger = logging.getLogger(__name__)
+
+# Closed sessions folded per transaction by the rollup job
+ROLLUP_BATCH_SIZE = 5000
+
+# Spelled as a literal so SQLite can match it to ix_work_sessions_pending
+# (partial indexes are never used for a bound parameter)
+_PENDING = WorkSession.rolled_up == literal_column("0")
+
+def split_by_day(started_at: datetime, stopped_at: datetime) -> Iterator[Tuple[date, float]]:
+    """(day, seconds) pieces of a session, cut at midnight"""
+    current = started_at
+    while current < stopped_at:
+        midnight = datetime.combine(current.date() + timedelta(days=1), time.min)
+        end = min(stopped_at, midnight)
+        yield current.date(), (end - current).total_seconds()
+        current = end
+
+class WorkSessionService:
+    """Start/stop work sessions and fold them into reporting rollups"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def open_session(self, task_id: int) -> Optional[WorkSession]:
+        return self.db.execute(
+            select(WorkSession)
+            .where(WorkSession.task_id == task_id, WorkSession.stopped_at.is_(None))
+            .order_by(WorkSession.id.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+
+    def start(self, task_id: int, at: Optional[datetime] = None) -> WorkSession:
+        """Open a session for the task, unless one is already running"""
+        session = self.open_session(task_id)
+        if session is None:
+            session = WorkSession(task_id=task_id, started_at=at or datetime.utcnow())
+            self.db.add(session)
+        return session
+
+    def stop(self, task_id: int, at: Optional[datetime] = None) -> Optional[WorkSession]:
+        """Close the task's running session, if any"""
+        session = self.open_session(task_id)
+        if session is not None:
+            session.stopped_at = max(at or datetime.utcnow(), session.started_at)
+        return session
+
+    def get_task_sessions(self, task_id: int, limit: int = 100) -> List[Dict]:
+        rows = self.db.execute(
+            select(WorkSession.id, WorkSession.started_at, WorkSession.stopped_at)
+            .where(WorkSession.task_id == task_id)
+            .order_by(WorkSession.id.desc())
+            .limit(limit)
+        )
+        return [
+            {
+                "id": row.id,
+                "started_at": row.started_at,
+                "stopped_at": row.stopped_at,
+                "seconds": int((row.stopped_at - row.started_at).total_seconds()) if row.stopped_at else None,
+            }
+            for row in rows
+        ]
+
+    def rollup(self, batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+        """Fold every closed, not yet rolled up session; one transaction per batch.
+
+        Returns the number of sessions folded.
+        """
+        total = 0
+        while True:
+            folded = self._rollup_batch(batch_size)
+            self.db.commit()
+            total += folded
+            if folded < batch_size:
+                return total
+
+    def _rollup_batch(self, batch_size: int) -> int:
+        from smart_scheduler.services.subtask_service import SubtaskService
+
+        sessions = self.db.execute(
+            select(WorkSession.id, WorkSession.task_id, WorkSession.started_at, WorkSession.stopped_at,
+                   Task.category, Task.parent_id)
+            .outerjoin(Task, Task.id == WorkSession.task_id)
+            .where(_PENDING, WorkSession.stopped_at.is_not(None))
+            .order_by(WorkSession.id)
+            .limit(batch_size)
+        ).all()
+        if not sessions:
+            return 0
+
+        # Claim the batch first: if a concurrent rollup got here before us,
+        # fewer rows match and nothing is counted twice
+        claimed = self.db.execute(
+            update(WorkSession)
+            .where(WorkSession.id.in_([session.id for session in sessions]), _PENDING)
+            .values(rolled_up=True)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if claimed != len(sessions):
+            self.db.rollback()
+            return 0
+
+        task_seconds = defaultdict(float)
+        parents = {}
+        daily = defaultdict(lambda: [0.0, 0])
+        for session in sessions:
+            task_seconds[session.task_id] += (session.stopped_at - session.started_at).total_seconds()
+            parents[session.task_id] = session.parent_id
+            for day, seconds in split_by_day(session.started_at, session.stopped_at):
+                totals = daily[(day, session.category or "")]
+                totals[0] += seconds
+                totals[1] += 1
+
+        minutes = {task_id: round(seconds / 60) for task_id, seconds in task_seconds.items()}
+        minutes = {task_id: value for task_id, value in minutes.items() if value}
+        if minutes:
+            tasks = Task.__table__
+            self.db.execute(
+                tasks.update().where(tasks.c.id == bindparam("task_id"))
+                .values(actual_duration=func.coalesce(tasks.c.actual_duration, 0) + bindparam("minutes")),
+                [{"task_id": task_id, "minutes": value} for task_id, value in minutes.items()],
+            )
+            # Keep the subtask rollups (descendant_actual_duration) in step
+            hierarchy = SubtaskService(self.db)
+            for task_id, value in minutes.items():
+                if parents[task_id] is not None:
+                    hierarchy.apply_change(task_id, {"count": 0, "completed": 0, "estimated": 0, "actual": 0},
+                                           {"count": 0, "completed": 0, "estimated": 0, "actual": value})
+
+        upsert = sqlite_insert(DailyTimeTotal)
+        self.db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=["day", "category"],
+                set_={
+                    "seconds": DailyTimeTotal.seconds + upsert.excluded.seconds,
+                    "sessions": DailyTimeTotal.sessions + upsert.excluded.sessions,
+                },
+            ),
+            [
+                {"day": day, "category": category, "seconds": round(seconds), "sessions": count}
+                for (day, category), (seconds, count) in daily.items()
+            ],
+        )
+
+        return len(sessions)
+
+    def time_report(self, start: date, end: date, category: Optional[str] = None) -> Dict:
+        """Tracked time between two days (inclusive), from the rollups only"""
+        filters = [DailyTimeTotal.day >= start, DailyTimeTotal.day <= end]
+        if category is not None:
+            filters.append(DailyTimeTotal.category == category)
+
+        by_day = self.db.execute(
+            select(DailyTimeTotal.day, func.sum(DailyTimeTotal.seconds))
+            .where(*filters).group_by(DailyTimeTotal.day).order_by(DailyTimeTotal.day)
+        ).all()
+        by_category = self.db.execute(
+            select(DailyTimeTotal.category, func.sum(DailyTimeTotal.seconds))
+            .where(*filters).group_by(DailyTimeTotal.category).order_by(func.sum(DailyTimeTotal.seconds).desc())
+        ).all()
+
+        return {
+            "start": start,
+            "end": end,
+            "total_seconds": sum(seconds for _, seconds in by_day),
+            "by_day": [{"day": day, "seconds": seconds} for day, seconds in by_day],
+            "by_category": [{"category": name or None, "seconds": seconds} for name, seconds in by_category],
+        }
+
+def rollup_once() -> int:
+    """Run the rollup job in its own session"""
+    from smart_scheduler.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return WorkSessionService(db).rollup()
+    finally:
+        db.close()
+
+async def rollup_periodically(interval_seconds: int):
+    """Background loop for the API process: fold sessions every interval"""
+    from smart_scheduler.core.writer import run_exclusive
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            folded = await run_exclusive(rollup_once)
+            if folded:
+                logger.info(f"Rolled up {folded} work sessions")
+        except Exception:
+            logger.exception("Work session rollup failed")
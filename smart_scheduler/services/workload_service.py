@@ -0,0 +1,243 @@
+# smart_scheduler/services/workload_service.py - Daily workload rollups for the calendar heatmap
+#
+# daily_load holds, per day x project x category, the minutes of scheduled
+# task time, the number of tasks due and the number of deadlines. Writes
+# apply the difference between an entity's contribution before and after
+# the change; the heatmap is then a range read on the (day, ...) key.
+# Days are UTC, like every stored datetime.
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import logging
+
+from sqlalchemy import bindparam, func, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from smart_scheduler.models.daily_load import DailyLoad
+from smart_scheduler.models.task import TaskStatus
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 1440
+_EPOCH = datetime(1970, 1, 1)
+
+# (day ordinal, project_id or 0, category or "") -> [scheduled minutes, due tasks, deadlines]
+LoadKey = Tuple[int, int, str]
+
+def _epoch_minutes(value: datetime) -> int:
+    """Whole minutes since the epoch - the same truncation as strftime('%s') / 60"""
+    # SQLite stores the wall-clock part only, so compare on that
+    value = value.replace(tzinfo=None)
+    return int((value - _EPOCH).total_seconds()) // 60
+
+def _day_key(epoch_day: int) -> date:
+    return _EPOCH.date() + timedelta(days=epoch_day)
+
+def task_load(start: Optional[datetime], end: Optional[datetime], estimated: Optional[int],
+              due: Optional[datetime], project_id: Optional[int], category: Optional[str],
+              status) -> Counter:
+    """A task's contribution, keyed by (epoch day, project, category, field)"""
+    load = Counter()
+    if status == TaskStatus.CANCELLED:
+        return load
+    project, category = project_id or 0, category or ""
+
+    # Scheduled time: start..end, or start + estimated_duration; split at midnight
+    if start is not None:
+        begin = _epoch_minutes(start)
+        finish = _epoch_minutes(end) if end is not None else begin
+        if finish <= begin:
+            finish = begin + (estimated or 0)
+        while begin < finish:
+            day = begin // MINUTES_PER_DAY
+            piece_end = min(finish, (day + 1) * MINUTES_PER_DAY)
+            load[(day, project, category, 0)] += piece_end - begin
+            begin = piece_end
+
+    if due is not None:
+        load[(_epoch_minutes(due) // MINUTES_PER_DAY, project, category, 1)] += 1
+    return load
+
+def task_load_of(task) -> Counter:
+    """task_load() for a Task instance or an imported record dict"""
+    get = task.get if isinstance(task, dict) else lambda name: getattr(task, name, None)
+    return task_load(get("scheduled_start_time"), get("scheduled_end_time"), get("estimated_duration"),
+                     get("due_date"), get("project_id"), get("category"), get("status"))
+
+def deadline_load_of(deadline) -> Counter:
+    load = Counter()
+    if deadline is not None and deadline.due_date is not None:
+        day = _epoch_minutes(deadline.due_date) // MINUTES_PER_DAY
+        load[(day, deadline.project_id or 0, "", 2)] += 1
+    return load
+
+class WorkloadService:
+    """Incremental daily_load maintenance and the heatmap read"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply(self, before: Counter, after: Counter):
+        """Add after - before to daily_load in one upsert (plus one cleanup DELETE)"""
+        delta = Counter(after)
+        delta.subtract(before)
+        rows: Dict[LoadKey, list] = {}
+        for (day, project, category, field), value in delta.items():
+            if value:
+                rows.setdefault((day, project, category), [0, 0, 0])[field] += value
+        if not rows:
+            return
+
+        params = [
+            {"day": _day_key(day), "project_id": project, "category": category,
+             "scheduled_minutes": minutes, "due_count": due, "deadline_count": deadlines}
+            for (day, project, category), (minutes, due, deadlines) in rows.items()
+        ]
+        upsert = sqlite_insert(DailyLoad)
+        self.db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=["day", "project_id", "category"],
+                set_={
+                    "scheduled_minutes": DailyLoad.scheduled_minutes + upsert.excluded.scheduled_minutes,
+                    "due_count": DailyLoad.due_count + upsert.excluded.due_count,
+                    "deadline_count": DailyLoad.deadline_count + upsert.excluded.deadline_count,
+                },
+            ),
+            params,
+        )
+        # Buckets that dropped to nothing
+        table = DailyLoad.__table__
+        self.db.execute(
+            table.delete().where(
+                table.c.day == bindparam("day"), table.c.project_id == bindparam("project_id"),
+                table.c.category == bindparam("category"), table.c.scheduled_minutes == 0,
+                table.c.due_count == 0, table.c.deadline_count == 0,
+            ),
+            [{"day": p["day"], "project_id": p["project_id"], "category": p["category"]} for p in params],
+        )
+
+    def heatmap(self, start: date, end: date, project_id: Optional[int] = None,
+                category: Optional[str] = None) -> Dict:
+        """Per-day totals between start and end (inclusive); days without load are omitted"""
+        filters = [DailyLoad.day >= start, DailyLoad.day <= end]
+        if project_id is not None:
+            filters.append(DailyLoad.project_id == project_id)
+        if category is not None:
+            filters.append(DailyLoad.category == category)
+
+        rows = self.db.execute(
+            select(DailyLoad.day, func.sum(DailyLoad.scheduled_minutes), func.sum(DailyLoad.due_count),
+                   func.sum(DailyLoad.deadline_count))
+            .where(*filters)
+            .group_by(DailyLoad.day)
+            .order_by(DailyLoad.day)
+        ).all()
+        days = [
+            {"day": day, "scheduled_minutes": minutes, "due_count": due, "deadline_count": deadlines}
+            for day, minutes, due, deadlines in rows
+        ]
+        return {
+            "start": start,
+            "end": end,
+            "max_scheduled_minutes": max((d["scheduled_minutes"] for d in days), default=0),
+            "days": days,
+        }
+
+def rebuild_daily_load(connection) -> int:
+    """Recompute daily_load from scratch with vectorized binning.
+
+    SQLite hands back integer epoch minutes, NumPy splits scheduled spans
+    at midnight and sums every (day, project, category) bucket; there is
+    no per-task Python. Usable from Alembic revisions. Returns the number
+    of buckets written.
+    """
+    import numpy as np
+
+    minutes = "CAST(strftime('%s', {}) AS INTEGER) / 60"
+    tasks = connection.execute(text(
+        f"SELECT {minutes.format('scheduled_start_time')}, {minutes.format('scheduled_end_time')}, "
+        f"coalesce(estimated_duration, 0), {minutes.format('due_date')}, "
+        "coalesce(project_id, 0), coalesce(category, '') "
+        "FROM tasks WHERE status IS NULL OR status != 'CANCELLED'"
+    )).all()
+    deadlines = connection.execute(text(
+        f"SELECT {minutes.format('due_date')}, coalesce(project_id, 0) FROM deadlines"
+    )).all()
+
+    parts = []  # (days, projects, categories, values, field)
+    if tasks:
+        start, end, estimated, due, project, category = (np.array(column, dtype=object) for column in zip(*tasks))
+        project = project.astype(np.int64)
+        category = category.astype(str)
+
+        scheduled = start != None  # noqa: E711 - elementwise None test
+        begin = start[scheduled].astype(np.int64)
+        has_end = end[scheduled] != None  # noqa: E711
+        finish = np.where(has_end, np.where(has_end, end[scheduled], 0).astype(np.int64), 0)
+        finish = np.where(has_end & (finish > begin), finish, begin + estimated[scheduled].astype(np.int64))
+        spans = finish > begin
+        begin, finish = begin[spans], finish[spans]
+        owner = np.flatnonzero(scheduled)[spans]
+
+        # One piece per (task, day touched): repeat each span over its days
+        first_day = begin // MINUTES_PER_DAY
+        count = (finish - 1) // MINUTES_PER_DAY - first_day + 1
+        piece_owner = np.repeat(np.arange(len(begin)), count)
+        offset = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        piece_day = first_day[piece_owner] + offset
+        piece_minutes = (
+            np.minimum(finish[piece_owner], (piece_day + 1) * MINUTES_PER_DAY)
+            - np.maximum(begin[piece_owner], piece_day * MINUTES_PER_DAY)
+        )
+        task_index = owner[piece_owner]
+        parts.append((piece_day, project[task_index], category[task_index], piece_minutes, 0))
+
+        has_due = due != None  # noqa: E711
+        due_day = due[has_due].astype(np.int64) // MINUTES_PER_DAY
+        parts.append((due_day, project[has_due], category[has_due], np.ones(len(due_day), dtype=np.int64), 1))
+
+    if deadlines:
+        due, project = (np.array(column, dtype=object) for column in zip(*deadlines))
+        has_due = due != None  # noqa: E711
+        due_day = due[has_due].astype(np.int64) // MINUTES_PER_DAY
+        parts.append((due_day, project[has_due].astype(np.int64), np.full(len(due_day), ""),
+                      np.ones(len(due_day), dtype=np.int64), 2))
+
+    connection.execute(text("DELETE FROM daily_load"))
+    if not parts:
+        return 0
+    days = np.concatenate([p[0] for p in parts])
+    if not len(days):
+        return 0
+    projects = np.concatenate([p[1] for p in parts])
+    categories = np.concatenate([p[2] for p in parts])
+    values = np.concatenate([p[3] for p in parts])
+    fields = np.concatenate([np.full(len(p[0]), p[4]) for p in parts])
+
+    # Group on (day, project, category): pack the three codes into one
+    # int64 key so grouping is a single 1-D sort, then bincount each field
+    project_ids, project_codes = np.unique(projects, return_inverse=True)
+    category_names, category_codes = np.unique(categories, return_inverse=True)
+    first_day = days.min()
+    width = len(project_ids) * len(category_names)
+    keys = (days - first_day) * width + project_codes * len(category_names) + category_codes
+    unique_keys, bucket = np.unique(keys, return_inverse=True)
+    totals = np.zeros((3, len(unique_keys)), dtype=np.int64)
+    for field in range(3):
+        selected = fields == field
+        totals[field] = np.bincount(bucket[selected], weights=values[selected], minlength=len(unique_keys))
+
+    # Plain tuples through exec_driver_sql: the Date column's text form is
+    # the ISO day, which NumPy renders without a Python loop
+    bucket_days = (unique_keys // width + first_day).astype("datetime64[D]").astype(str)
+    bucket_projects = project_ids[unique_keys % width // len(category_names)]
+    bucket_categories = category_names[unique_keys % len(category_names)]
+    rows = list(zip(bucket_days.tolist(), bucket_projects.tolist(), bucket_categories.tolist(), *totals.tolist()))
+    connection.exec_driver_sql(
+        "INSERT INTO daily_load (day, project_id, category, scheduled_minutes, due_count, deadline_count) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    return len(rows)
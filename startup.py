@@ -70,6 +70,24 @@ def run_development_server():
         logger.error(f"❌ Server startup failed: {e}")
         sys.exit(1)
 
+def run_production_server():
+    """Start the production profile: WORKERS processes (1 by default), uvloop/httptools, no reload.
+
+    Tuned through Settings / environment: WORKERS, KEEP_ALIVE_SECONDS,
+    BACKLOG, LIMIT_CONCURRENCY, GRACEFUL_SHUTDOWN_SECONDS and ACCESS_LOG
+    (on, off or async).
+    """
+    try:
+        from smart_scheduler.main import run_server
+        logger.info("🏭 Starting production server...")
+        run_server(production=True)
+    except ImportError as e:
+        logger.error(f"❌ Failed to import server: {e}")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"❌ Server startup failed: {e}")
+        sys.exit(1)
+
 def main():
     """Main startup function"""
     logger.info("🤖 Jarvis AI Assistant - Startup Script")
@@ -91,7 +109,10 @@ def main():
     logger.info("✅ Environment checks passed")
     logger.info("🚀 Starting server...")
     
-    run_development_server()
+    if "--production" in sys.argv[1:] or os.environ.get("ENVIRONMENT", "").lower() == "production":
+        run_production_server()
+    else:
+        run_development_server()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
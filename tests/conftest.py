@@ -0,0 +1,126 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The engine is built from settings at import time, so the test database
+# has to be chosen before anything imports smart_scheduler
+TEST_DB_DIR = tempfile.mkdtemp(prefix="smart_scheduler-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DB_DIR}/test.db"
+# Buffered progress is written by the tests (or the reads they make), not by a timer racing them
+os.environ["PROGRESS_FLUSH_SECONDS"] = "3600"
+
+# Static files and templates are mounted relative to the repository root
+os.chdir(ROOT)
+sys.path.insert(0, str(ROOT))
+
+
+# Bulk rows for the stress tests and benchmarks: every third one completed
+SEED_TASKS_SQL = """
+WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :count)
+INSERT INTO tasks (id, title, description, status, priority, category, estimated_duration, created_at, updated_at,
+                   due_date, progress_percentage, recurrence, energy_level_required, focus_level_required,
+                   descendant_count, descendant_completed_count, descendant_estimated_duration,
+                   descendant_actual_duration, earliest_start, version)
+SELECT i, 'task ' || i, 'seeded task ' || i, CASE i % 3 WHEN 0 THEN 'COMPLETED' ELSE 'PENDING' END, 'MEDIUM',
+       'study', 30 + i % 90, datetime('now', '-' || (i % 365) || ' days'), datetime('now'),
+       datetime('now', '+' || (i % 60) || ' days'), 0, 'NONE', 3, 3, 0, 0, 0, 0, 0, 1
+FROM n
+"""
+
+def scratch_engine(path):
+    """Engine on a new database file with the full schema"""
+    import smart_scheduler.models  # noqa: F401 - registers the tables
+    from smart_scheduler.core.database import Base
+
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    return engine
+
+def seed_tasks(engine, count):
+    with engine.begin() as connection:
+        connection.execute(text(SEED_TASKS_SQL), {"count": count})
+
+def stamp_head(engine):
+    """Mark a create_all() database as current, so the app starts on it"""
+    from smart_scheduler.core.database import SCHEMA_VERSION
+
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)"))
+        connection.execute(text("INSERT INTO alembic_version VALUES (:version)"), {"version": SCHEMA_VERSION})
+
+def start_server(log_path, production, **env):
+    """run_server() in a subprocess on a free port, with `env` on top of ours; (process, port) once it answers"""
+    import httpx
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    with open(log_path, "wb") as log:
+        server = subprocess.Popen(
+            [sys.executable, "-c", f"from smart_scheduler.main import run_server; run_server(production={production})"],
+            cwd=ROOT, env={**os.environ, **env, "PORT": str(port)}, stdout=log, stderr=log,
+        )
+    for _ in range(300):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/health", timeout=1)
+            return server, port
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError(f"server did not start, see {log_path}")
+
+async def _client(port, paths, offset, deadline, statuses, latencies, method, body):
+    """One keep-alive connection cycling through `paths`; raw HTTP keeps the client cheap"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    headers = f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n" if body else ""
+    sent = offset
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        writer.write(f"{method} {paths[sent % len(paths)]} HTTP/1.1\r\nHost: 127.0.0.1\r\n{headers}\r\n".encode() + body)
+        sent += 1
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = next(int(line.split(b":")[1]) for line in head.split(b"\r\n")
+                      if line.lower().startswith(b"content-length:"))
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - started)
+        statuses[int(head.split(b" ", 2)[1])] += 1
+    writer.close()
+
+def hammer(port, paths, seconds, connections, method="GET", body=b""):
+    """Load a server from `connections` keep-alive clients, each sending `method` with `body` to `paths` in turn;
+    (status counts, sorted latencies, elapsed seconds)"""
+    async def run():
+        statuses, latencies = Counter(), []
+        started = time.perf_counter()
+        await asyncio.gather(*(_client(port, paths, number, started + seconds, statuses, latencies, method, body)
+                               for number in range(connections)))
+        return statuses, sorted(latencies), time.perf_counter() - started
+    return asyncio.run(run())
+
+@pytest.fixture
+def scratch_db(tmp_path):
+    """(engine, sessionmaker) on a throwaway database"""
+    engine = scratch_engine(tmp_path / "scratch.db")
+    yield engine, sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient on the app and the session's test database, with the lifespan running"""
+    from fastapi.testclient import TestClient
+    from smart_scheduler.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
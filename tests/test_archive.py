@@ -0,0 +1,40 @@
+"""Archiving the newest rows must not hand their ids (or tags) to new ones"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, text
+
+from smart_scheduler.models.archive import TaskArchive, TaskArchiveTag
+from smart_scheduler.models.deadline import Deadline
+from smart_scheduler.models.task import TaskStatus
+from smart_scheduler.models.task_tag import TaskTag
+from smart_scheduler.services.archive_service import ArchiveService
+from smart_scheduler.services.task_service import TaskService
+
+LONG_AGO = datetime.utcnow() - timedelta(days=200)
+
+def test_archived_ids_are_not_reused(scratch_db):
+    engine, Session = scratch_db
+    with Session() as db:
+        service = TaskService(db)
+        for title in ("read", "revise"):
+            task = service.create_task(title, tags="exam")
+            service.update_task_status(task.id, TaskStatus.COMPLETED)
+        db.add(Deadline(title="essay", due_date=LONG_AGO, completed=True, completed_at=LONG_AGO))
+        db.commit()
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE tasks SET completed_at = :at"), {"at": LONG_AGO})
+
+    with Session() as db:
+        # Everything goes, the newest task and deadline included
+        assert ArchiveService(db).archive(older_than_days=90) == {"tasks": 2, "deadlines": 1}
+        task = TaskService(db).create_task("new", tags="fresh")
+        db.add(Deadline(title="report", due_date=datetime.utcnow()))
+        db.commit()
+        assert task.id == 3
+        assert db.execute(select(Deadline.id)).scalar() == 2
+
+        # The archived tags moved along and still filter the archive
+        assert db.execute(select(TaskTag.task_id, TaskTag.tag)).all() == [(3, "fresh")]
+        assert db.execute(select(TaskArchiveTag.task_id)).scalars().all() == [1, 2]
+        archived = TaskService(db).tasks_statement(tags=["exam"], model=TaskArchive)
+        assert {row.title for row in db.execute(archived).scalars()} == {"read", "revise"}
@@ -0,0 +1,66 @@
+"""Batch fetch (GET /api/tasks?ids=): unknown and archived ids, sparse fields, bad input"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from smart_scheduler.core.database import SessionLocal
+from smart_scheduler.core.serialization import MAX_BATCH_IDS
+from smart_scheduler.services.archive_service import ArchiveService
+
+UNKNOWN_ID = 10 ** 9
+
+@pytest.fixture(scope="module")
+def batch(client):
+    """Ids of two live tasks and one archived one"""
+    ids = [client.post("/api/tasks", json={"title": f"batch {number}"}).json()["id"] for number in range(3)]
+    client.patch(f"/api/tasks/{ids[2]}/complete")
+    with SessionLocal() as db:
+        db.execute(text("UPDATE tasks SET completed_at = :at WHERE id = :id"),
+                   {"at": datetime.utcnow() - timedelta(days=200), "id": ids[2]})
+        db.commit()
+        assert ArchiveService(db).archive(older_than_days=90)["tasks"] == 1
+    return ids
+
+def fetch(client, **params):
+    response = client.get("/api/tasks", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+def test_unknown_ids_are_null_in_place(client, batch):
+    live, other, _ = batch
+    # Request order, repeats dropped, id always included in a sparse fieldset
+    assert fetch(client, ids=f"{other},{UNKNOWN_ID},{live},{other}", fields="title") == {
+        "items": [{"id": other, "title": "batch 1"}, None, {"id": live, "title": "batch 0"}],
+        "missing": [UNKNOWN_ID],
+    }
+
+def test_archived_ids_need_include_archived(client, batch):
+    live, _, archived = batch
+    ids = f"{archived},{live},{UNKNOWN_ID}"
+    assert fetch(client, ids=ids, fields="title") == {
+        "items": [None, {"id": live, "title": "batch 0"}, None],
+        "missing": [archived, UNKNOWN_ID],
+    }
+    # The fieldset applies to archived rows too; every row says where it came from
+    assert fetch(client, ids=ids, fields="title,status", include_archived=True) == {
+        "items": [
+            {"id": archived, "title": "batch 2", "status": "completed", "archived": True},
+            {"id": live, "title": "batch 0", "status": "pending", "archived": False},
+            None,
+        ],
+        "missing": [UNKNOWN_ID],
+    }
+
+@pytest.mark.parametrize("params", [
+    {"fields": "title,no_such_field"},
+    {"fields": "title,no_such_field", "include_archived": True},
+    {"ids": "1,two"},
+    {"ids": ","},
+    {"ids": ",".join(str(task_id) for task_id in range(1, MAX_BATCH_IDS + 2))},
+])
+def test_bad_ids_or_fields_are_client_errors(client, batch, params):
+    params.setdefault("ids", str(batch[0]))
+    response = client.get("/api/tasks", params=params)
+    assert response.status_code == 400
+    assert response.json()["detail"]
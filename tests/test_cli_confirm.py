@@ -0,0 +1,49 @@
+"""Destructive CLI commands fail closed without a terminal, unless --yes is given"""
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import text
+
+from conftest import ROOT, scratch_engine, seed_tasks, stamp_head
+
+@pytest.fixture
+def cli(tmp_path):
+    """Runs the scheduler launcher on a seeded scratch database with stdin not a terminal;
+    returns (run(args, stdin) -> output, task ids left)"""
+    path = tmp_path / "cli.db"
+    engine = scratch_engine(path)
+    seed_tasks(engine, 3)
+    stamp_head(engine)
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}")
+
+    def run(args, stdin=""):
+        return subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", "import sys; from smart_scheduler.cli.main import app; app(sys.argv[1:])", *args],
+            input=stdin, env=env, cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+
+    def task_ids():
+        with engine.connect() as connection:
+            return connection.execute(text("SELECT id FROM tasks ORDER BY id")).scalars().all()
+
+    yield run, task_ids
+    engine.dispose()
+
+def test_delete_needs_yes_without_a_terminal(cli):
+    run, task_ids = cli
+    assert "Operation cancelled" in run(["delete-task", "1"])
+    # A piped shell script is no confirmation either
+    assert "Operation cancelled" in run(["shell", "--no-timing"], stdin="delete-task 2\n")
+    assert task_ids() == [1, 2, 3]
+
+    run(["delete-task", "1", "--yes"])
+    run(["shell", "--no-timing"], stdin="delete-task 2 -y\n")
+    assert task_ids() == [3]
+
+def test_restore_needs_yes_without_a_terminal(cli, tmp_path):
+    run, task_ids = cli
+    # Cancelled before the backup is even looked at
+    assert "Restore cancelled" in run(["restore", str(tmp_path / "missing.db")])
+    assert task_ids() == [1, 2, 3]
@@ -0,0 +1,42 @@
+"""CLI cold start: --help and hello must not load Typer, SQLAlchemy or the models"""
+import statistics
+import subprocess
+import sys
+import time
+
+import pytest
+
+from conftest import ROOT
+
+# The request's target for `scheduler --help` / `scheduler hello`, on top of
+# a bare interpreter start
+CLI_BUDGET_SECONDS = 0.1
+RUNS = 5
+
+# Runs the launcher, then reports which heavy modules it loaded
+PROBE = (
+    "import sys; from smart_scheduler.cli.main import app; app(sys.argv[1:]); "
+    "print(sorted(m for m in ('typer', 'click', 'sqlalchemy', 'smart_scheduler.models') if m in sys.modules), "
+    "file=sys.stderr)"
+)
+
+def median_seconds(command):
+    """Median wall time of `command` in a fresh process"""
+    times = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, capture_output=True, check=True)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+@pytest.mark.parametrize("args", [["--help"], ["hello"]])
+def test_fast_paths_skip_heavy_imports(args):
+    result = subprocess.run([sys.executable, "-c", PROBE, *args], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stderr.strip().splitlines()[-1] == "[]"
+
+@pytest.mark.parametrize("args", [["--help"], ["hello"]])
+def test_cold_start_budget(args):
+    interpreter = median_seconds([sys.executable, "-c", "pass"])
+    cli = median_seconds([sys.executable, "-c", PROBE, *args])
+    print(f"scheduler {' '.join(args)}: {cli * 1000:.0f} ms (bare interpreter {interpreter * 1000:.0f} ms)")
+    assert cli - interpreter < CLI_BUDGET_SECONDS
@@ -0,0 +1,43 @@
+"""Concurrent read-modify-write through PUT /api/tasks/{id}: If-Match turns lost updates into 409s"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+WRITERS = 8
+INCREMENTS = 25
+
+def increment(client, task_id):
+    """Add one minute to the estimate, re-reading on every conflict; returns the number of 409s"""
+    conflicts = 0
+    while True:
+        current = client.get(f"/api/tasks/{task_id}")
+        body = {"title": "contended", "estimated_duration": current.json()["estimated_duration"] + 1}
+        response = client.put(f"/api/tasks/{task_id}", json=body, headers={"If-Match": current.headers["ETag"]})
+        if response.status_code == 200:
+            return conflicts
+        assert response.status_code == 409, response.text
+        conflicts += 1
+
+@pytest.mark.slow
+def test_concurrent_increments_are_not_lost(client):
+    task = client.post("/api/tasks", json={"title": "contended", "estimated_duration": 0}).json()
+    start = client.get(f"/api/tasks/{task['id']}").json()
+
+    def writer(_):
+        return sum(increment(client, task["id"]) for _ in range(INCREMENTS))
+
+    with ThreadPoolExecutor(WRITERS) as pool:
+        conflicts = sum(pool.map(writer, range(WRITERS)))
+
+    end = client.get(f"/api/tasks/{task['id']}").json()
+    print(f"\n{WRITERS} writers x {INCREMENTS} increments: {conflicts} conflicts retried")
+    assert end["estimated_duration"] == start["estimated_duration"] + WRITERS * INCREMENTS
+    assert end["version"] == start["version"] + WRITERS * INCREMENTS
+
+def test_stale_if_match_is_rejected(client):
+    task = client.post("/api/tasks", json={"title": "stale"}).json()
+    stale = client.get(f"/api/tasks/{task['id']}").headers["ETag"]
+    body = {"title": "stale", "estimated_duration": 45}
+    assert client.put(f"/api/tasks/{task['id']}", json=body, headers={"If-Match": stale}).status_code == 200
+    response = client.put(f"/api/tasks/{task['id']}", json=body, headers={"If-Match": stale})
+    assert response.status_code == 409
@@ -0,0 +1,95 @@
+"""Write-behind for progress and start/pause: fewer commits, and never over a completion"""
+import pytest
+from sqlalchemy import event, select, text
+
+from conftest import seed_tasks
+from smart_scheduler.core.config import settings
+from smart_scheduler.models.task import Task, TaskStatus
+from smart_scheduler.services import progress_service
+from smart_scheduler.services.progress_service import ProgressService, flush_pending, pending_count
+from smart_scheduler.services.work_session_service import WorkSessionService
+
+TASKS = 20
+UPDATES = 10
+
+@pytest.fixture(autouse=True)
+def empty_buffer(monkeypatch):
+    """The buffer is per process: start every test without the others' updates"""
+    monkeypatch.setattr(progress_service, "_pending", {})
+
+def count_commits(engine):
+    commits = []
+    event.listen(engine, "commit", lambda connection: commits.append(1))
+    return commits
+
+def record_progress(Session):
+    with Session() as db:
+        service = ProgressService(db)
+        for step in range(UPDATES):
+            for task_id in range(1, TASKS + 1):
+                # Seeded ids: every third task is completed, so use the open ones
+                service.set_progress(task_id * 3 - 1, step * 10)
+        service.flush()
+
+def test_buffering_cuts_commits_tenfold(scratch_db, monkeypatch):
+    engine, Session = scratch_db
+    seed_tasks(engine, TASKS * 3)
+    commits = count_commits(engine)
+
+    monkeypatch.setattr(settings, "progress_flush_seconds", 0)
+    record_progress(Session)
+    write_through = len(commits)
+
+    commits.clear()
+    monkeypatch.setattr(settings, "progress_flush_seconds", 5)
+    record_progress(Session)
+    assert len(commits) * 10 <= write_through
+    with Session() as db:
+        assert set(db.execute(select(Task.progress_percentage).where(Task.id % 3 == 2)).scalars()) == {90.0}
+
+def test_flush_never_overwrites_a_completion(scratch_db, monkeypatch):
+    engine, Session = scratch_db
+    seed_tasks(engine, 3)
+    monkeypatch.setattr(settings, "progress_flush_seconds", 5)
+    with Session() as db:
+        service = ProgressService(db)
+        service.set_running(1, True)
+        service.set_progress(1, 40)
+    # Another worker completes the task before this one flushes
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE tasks SET status = 'COMPLETED', progress_percentage = 100 WHERE id = 1"))
+    with Session() as db:
+        assert flush_pending(db) == []
+        db.commit()
+        task = db.get(Task, 1)
+        assert (task.status, task.progress_percentage, task.version) == (TaskStatus.COMPLETED, 100.0, 1)
+        assert WorkSessionService(db).open_session(1) is None
+    assert pending_count() == 0
+
+def test_reads_outside_the_task_routes_see_pending_updates(client, monkeypatch):
+    monkeypatch.setattr(settings, "progress_flush_seconds", 60)
+    task = client.post("/api/tasks", json={"title": "pending start", "due_date": "2030-06-01T09:00:00"}).json()
+    in_progress = client.get("/api/stats").json()["in_progress"]
+    assert client.post(f"/api/tasks/{task['id']}/start").status_code == 200
+    assert pending_count() == 1
+
+    # Row reads overlay the buffered status without writing it
+    schedule = client.get("/api/schedule/", params={"start_date": "2030-06-01T00:00:00",
+                                                    "end_date": "2030-06-02T00:00:00"}).json()
+    assert [item["status"] for item in schedule if item["id"] == task["id"]] == ["in_progress"]
+    assert pending_count() == 1
+    # Counts can't be overlaid: the stats write it first
+    assert client.get("/api/stats").json()["in_progress"] == in_progress + 1
+    assert pending_count() == 0
+
+def test_starting_a_done_task_goes_through_the_status_hooks(scratch_db, monkeypatch):
+    engine, Session = scratch_db
+    seed_tasks(engine, 3)
+    monkeypatch.setattr(settings, "progress_flush_seconds", 5)
+    with Session() as db:
+        # Seeded task 3 is completed: reopening it is written at once, not buffered
+        assert ProgressService(db).set_running(3, True)
+        assert pending_count() == 0
+        task = db.get(Task, 3)
+        assert task.status == TaskStatus.IN_PROGRESS
+        assert WorkSessionService(db).open_session(3) is not None
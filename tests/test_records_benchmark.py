@@ -0,0 +1,38 @@
+"""Listing 100k tasks: ORM instances vs TaskRecord rows, time and retained memory"""
+import gc
+import time
+import tracemalloc
+
+import pytest
+from sqlalchemy import select
+
+from conftest import seed_tasks
+from smart_scheduler.models.records import TaskRecord, load_records
+from smart_scheduler.models.task import Task
+
+TASKS = 100_000
+
+def measure(Session, load):
+    """(seconds, bytes retained) for loading every task with `load(db)` and keeping the result"""
+    gc.collect()
+    with Session() as db:
+        tracemalloc.start()
+        started = time.perf_counter()
+        rows = load(db)
+        seconds = time.perf_counter() - started
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        assert len(rows) == TASKS
+    return seconds, retained
+
+@pytest.mark.slow
+def test_listing_100k_tasks(scratch_db):
+    engine, Session = scratch_db
+    seed_tasks(engine, TASKS)
+
+    orm_seconds, orm_bytes = measure(Session, lambda db: db.execute(select(Task)).scalars().all())
+    record_seconds, record_bytes = measure(Session, lambda db: load_records(db, TaskRecord, Task, select(Task)))
+    print(f"\n{TASKS} tasks: ORM {orm_seconds:.2f} s / {orm_bytes / 2**20:.0f} MB, "
+          f"TaskRecord {record_seconds:.2f} s / {record_bytes / 2**20:.0f} MB")
+    assert record_seconds < orm_seconds
+    assert record_bytes * 2 < orm_bytes
@@ -0,0 +1,43 @@
+"""ensure_schema(): only empty databases are created, everything older waits for Alembic"""
+import pytest
+from sqlalchemy import create_engine, text
+
+from smart_scheduler.core import database
+from smart_scheduler.core.database import (
+    BASELINE_SCHEMA_VERSION, SCHEMA_VERSION, SchemaOutOfDate, ensure_schema, get_schema_version,
+)
+
+@pytest.fixture
+def scratch_engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "_schema_checked", False)
+    yield engine
+    engine.dispose()
+
+def test_empty_database_is_created_and_stamped(scratch_engine):
+    ensure_schema()
+    assert get_schema_version() == SCHEMA_VERSION
+    with scratch_engine.connect() as connection:
+        columns = [row[1] for row in connection.execute(text("PRAGMA table_info(tasks)"))]
+    assert "version" in columns and "parent_id" in columns
+
+def test_unversioned_database_is_stamped_baseline_and_refused(scratch_engine):
+    # What the old import-time create_tables() left behind: tables, no alembic_version
+    with scratch_engine.begin() as connection:
+        connection.execute(text("CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR NOT NULL)"))
+    with pytest.raises(SchemaOutOfDate, match="alembic upgrade head"):
+        ensure_schema()
+    assert get_schema_version() == BASELINE_SCHEMA_VERSION
+    with scratch_engine.connect() as connection:
+        tables = {row[0] for row in connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+    assert tables == {"tasks", "alembic_version"}
+
+def test_stale_revision_creates_nothing(scratch_engine):
+    database.stamp_schema_version(BASELINE_SCHEMA_VERSION)
+    with pytest.raises(SchemaOutOfDate):
+        ensure_schema()
+    with scratch_engine.connect() as connection:
+        tables = {row[0] for row in connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+    # No task_tags etc. created ahead of the revisions that add them
+    assert tables == {"alembic_version"}
@@ -0,0 +1,27 @@
+"""Search ranks every match, not just the newest ones"""
+from sqlalchemy import text
+
+from conftest import seed_tasks
+from smart_scheduler.services.search_service import SearchService
+
+def test_old_best_match_ranks_first(scratch_db):
+    engine, Session = scratch_db
+    seed_tasks(engine, 3000)
+    with engine.begin() as connection:
+        # Every task mentions "seeded" in its description; the oldest one also in its title
+        connection.execute(text("UPDATE tasks SET title = 'seeded reading' WHERE id = 5"))
+    with Session() as db:
+        page = SearchService(db).search("seeded", types=["task"], limit=10)
+    assert page["results"][0]["id"] == 5
+    assert page["has_more"]
+
+def test_pages_do_not_overlap_and_has_more_is_exact(scratch_db):
+    engine, Session = scratch_db
+    seed_tasks(engine, 30)
+    with Session() as db:
+        service = SearchService(db)
+        first = service.search("seeded", types=["task"], limit=20)
+        second = service.search("seeded", types=["task"], limit=20, offset=20)
+    assert first["has_more"] and not second["has_more"]
+    ids = [row["id"] for row in first["results"] + second["results"]]
+    assert sorted(ids) == list(range(1, 31))
@@ -0,0 +1,52 @@
+"""Serialization cost per 10k tasks: ORM + Pydantic + jsonable_encoder vs column rows + FastJSONResponse"""
+import time
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import ConfigDict, create_model
+from sqlalchemy import select
+
+from conftest import seed_tasks
+from smart_scheduler.core.serialization import ORJSON_AVAILABLE, FastJSONResponse, row_dicts
+from smart_scheduler.models.task import Task
+
+TASKS = 10_000
+
+# What a response_model=List[...] route with orm_mode did per request:
+# validate every ORM object, then jsonable_encoder, then json.dumps
+TaskOut = create_model(
+    "TaskOut",
+    __config__=ConfigDict(from_attributes=True),
+    **{column.key: (column.type.python_type | None, None) for column in Task.__table__.columns},
+)
+TASK_FIELDS = [column.key for column in Task.__table__.columns]
+
+def best_of(runs, fn):
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+@pytest.mark.slow
+def test_serialization_per_10k_tasks(scratch_db):
+    engine, Session = scratch_db
+    seed_tasks(engine, TASKS)
+
+    def orm_path():
+        with Session() as db:
+            tasks = db.execute(select(Task)).scalars().all()
+            return JSONResponse(jsonable_encoder([TaskOut.model_validate(task) for task in tasks])).body
+
+    def fast_path():
+        with Session() as db:
+            return FastJSONResponse(row_dicts(db, TASK_FIELDS, Task)).body
+
+    assert len(fast_path()) > 0 and len(orm_path()) > 0
+    before = best_of(3, orm_path)
+    after = best_of(3, fast_path)
+    print(f"\n{TASKS} tasks: ORM + Pydantic + jsonable_encoder {before * 1000:.0f} ms, "
+          f"row_dicts + FastJSONResponse {after * 1000:.0f} ms (orjson: {ORJSON_AVAILABLE})")
+    assert after * 2 < before
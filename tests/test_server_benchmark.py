@@ -0,0 +1,53 @@
+"""Requests per second on /api/health: development profile vs production profile
+
+The load generator shares the CPU with the server, so the comparison is on
+server CPU time per request; requests per second are printed alongside.
+"""
+import os
+
+import pytest
+
+from conftest import hammer, start_server
+
+SECONDS = 5.0
+CONNECTIONS = 32
+PATH = "/api/health"
+
+def cpu_seconds(pid):
+    """User + system CPU time of a process and its children (the reloader's server) so far"""
+    with open(f"/proc/{pid}/stat") as stat:
+        fields = stat.read().rsplit(")", 1)[1].split()
+    with open(f"/proc/{pid}/task/{pid}/children") as children:
+        child_pids = children.read().split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK") + sum(map(cpu_seconds, child_pids))
+
+def load(server, port):
+    """(requests per second, server CPU microseconds per request, non-200 responses)"""
+    cpu_before = cpu_seconds(server.pid)
+    statuses, _, seconds = hammer(port, [PATH], SECONDS, CONNECTIONS)
+    ok = statuses[200]
+    return ok / seconds, (cpu_seconds(server.pid) - cpu_before) / ok * 1e6, sum(statuses.values()) - ok
+
+@pytest.mark.slow
+@pytest.mark.skipif(not os.path.exists("/proc/self/stat"), reason="reads process CPU time from /proc")
+def test_production_profile_costs_less_per_request(tmp_path):
+    results = {}
+    for production in (False, True):
+        # Each profile with its defaults, except the production access log:
+        # off, as recommended behind a proxy that logs requests itself
+        profile = "production" if production else "development"
+        env = {"DATABASE_URL": f"sqlite:///{tmp_path}/{profile}.db"}
+        if production:
+            env["ACCESS_LOG"] = "off"
+        server, port = start_server(tmp_path / f"{profile}.log", production, **env)
+        try:
+            results[production] = load(server, port)
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+    (dev_rps, dev_cpu, dev_errors), (prod_rps, prod_cpu, prod_errors) = results[False], results[True]
+    print(f"\n{PATH}, {CONNECTIONS} keep-alive connections, {SECONDS:.0f} s: "
+          f"development {dev_rps:.0f} req/s at {dev_cpu:.0f} us CPU/request, "
+          f"production {prod_rps:.0f} req/s at {prod_cpu:.0f} us CPU/request")
+    assert dev_errors == prod_errors == 0
+    assert prod_cpu < dev_cpu
@@ -0,0 +1,83 @@
+"""Dashboards refreshing together: identical schedule/stats requests with single-flight off and on"""
+import asyncio
+
+import httpx
+import pytest
+
+from conftest import hammer, scratch_engine, seed_tasks, stamp_head, start_server
+from smart_scheduler.core.single_flight import SingleFlightMiddleware
+
+TASKS = 3000
+SECONDS = 5.0
+CLIENTS = 50
+PATHS = ["/api/schedule/?start_date=2020-01-01T00:00:00&end_date=2030-01-01T00:00:00", "/api/stats"]
+
+def percentile(latencies, fraction):
+    return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+@pytest.mark.slow
+def test_single_flight_fan_in(tmp_path):
+    engine = scratch_engine(tmp_path / "dashboards.db")
+    seed_tasks(engine, TASKS)
+    stamp_head(engine)
+    engine.dispose()
+
+    results = {}
+    for enabled in (False, True):
+        server, port = start_server(
+            tmp_path / f"single_flight_{enabled}.log", True, DATABASE_URL=f"sqlite:///{tmp_path}/dashboards.db",
+            WORKERS="1", ACCESS_LOG="off", SINGLE_FLIGHT=str(enabled).lower(),
+        )
+        try:
+            statuses, latencies, seconds = hammer(port, PATHS, SECONDS, CLIENTS)
+            flights = httpx.get(f"http://127.0.0.1:{port}/api/health").json()["single_flight"]
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+        results[enabled] = statuses, latencies, seconds, flights
+        print(f"\nsingle-flight {'on' if enabled else 'off'}: {statuses[200] / seconds:.0f} req/s, "
+              f"p50 {percentile(latencies, 0.5):.0f} ms, p99 {percentile(latencies, 0.99):.0f} ms, "
+              f"{statuses[503]} shed with 503; {flights}")
+
+    off, on = results[False], results[True]
+    assert off[3] is None
+    assert set(on[0]) == {200}
+    # Most responses were replays of a leader's
+    assert on[3]["coalesced"] > on[3]["leaders"]
+    assert on[0][200] / on[2] > 2 * off[0][200] / off[2]
+
+def test_reads_after_a_write_do_not_join_an_older_flight():
+    async def main():
+        release = asyncio.Event()
+        answers = iter(["before", "after"])
+
+        async def app(scope, receive, send):
+            if scope["path"] == "/api/stats":
+                answer = next(answers).encode()
+                if answer == b"before":
+                    await release.wait()
+            else:
+                answer = b"written"
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": answer})
+
+        middleware = SingleFlightMiddleware(app)
+
+        async def request(method, path):
+            sent = []
+            scope = {"type": "http", "method": method, "path": path, "query_string": b""}
+            await middleware(scope, None, lambda message: asyncio.sleep(0, sent.append(message)))
+            return sent[-1]["body"]
+
+        leader = asyncio.create_task(request("GET", "/api/stats"))
+        await asyncio.sleep(0)
+        # Answered while the leader is still computing from older data
+        await request("POST", "/api/tasks/1/start")
+        follower = asyncio.create_task(request("GET", "/api/stats"))
+        await asyncio.sleep(0)
+        release.set()
+        return await leader, await follower, middleware.stats()
+
+    leader, follower, stats = asyncio.run(main())
+    assert (leader, follower) == (b"before", b"after")
+    assert stats == {"in_flight": 0, "leaders": 2, "coalesced": 0}
@@ -0,0 +1,68 @@
+"""Startup budget: importing the app stays cheap and the schema check runs in the lifespan"""
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+
+from conftest import ROOT
+
+# Generous for a loaded CI machine; the import was ~0.7s and the first
+# request ~0.15s on a single-core VM
+IMPORT_BUDGET_SECONDS = 2.0
+FIRST_REQUEST_BUDGET_SECONDS = 1.0
+
+# Loaded on first use (handlers, the lifespan, the middleware stack), never by the import
+DEFERRED_MODULES = (
+    "smart_scheduler.services.task_service",
+    "smart_scheduler.services.ranking_service",
+    "smart_scheduler.services.progress_service",
+    "smart_scheduler.services.project_service",
+    "smart_scheduler.core.writer",
+    "smart_scheduler.core.admission",
+    "smart_scheduler.core.single_flight",
+    "smart_scheduler.core.serialization",
+    "smart_scheduler.api.routes",
+    "jinja2",
+)
+
+PROBE = textwrap.dedent("""
+    import sqlite3, sys, time
+    started = time.perf_counter()
+    import smart_scheduler.main as main
+    imported = time.perf_counter()
+    loaded = ",".join(name for name in sys.argv[2].split(",") if name in sys.modules) or "-"
+    tables = sqlite3.connect(sys.argv[1]).execute("SELECT count(*) FROM sqlite_master").fetchone()[0]
+    from fastapi.testclient import TestClient
+    with TestClient(main.app) as client:
+        status = client.get("/api/health").status_code
+    answered = time.perf_counter()
+    print(imported - started, answered - imported, tables, status, loaded)
+""")
+
+def cold_start(db_path):
+    """Import time, time to first response, tables present and deferred modules loaded after the import,
+    in a fresh interpreter"""
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}")
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", PROBE, str(db_path), ",".join(DEFERRED_MODULES)],
+        env=env, cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    loaded = [] if output[4] == "-" else output[4].split(",")
+    return float(output[0]), float(output[1]), int(output[2]), int(output[3]), loaded
+
+def test_cold_import_and_first_request(tmp_path):
+    db_path = tmp_path / "startup.db"
+    import_seconds, first_request_seconds, tables, status, loaded = cold_start(db_path)
+    assert status == 200
+    # Importing the app must not touch the database, nor load services, routers or templates
+    assert tables == 0
+    assert loaded == []
+    assert import_seconds < IMPORT_BUDGET_SECONDS
+    assert first_request_seconds < FIRST_REQUEST_BUDGET_SECONDS
+
+    # Second start against the now current schema: only the alembic_version read
+    import_seconds, first_request_seconds, tables, status, loaded = cold_start(db_path)
+    assert status == 200 and tables > 0 and loaded == []
+    assert import_seconds < IMPORT_BUDGET_SECONDS
+    assert first_request_seconds < FIRST_REQUEST_BUDGET_SECONDS
@@ -0,0 +1,21 @@
+"""GET /api/reports/time only reads; folding sessions is POST /api/reports/rollup's job"""
+from datetime import datetime, timedelta
+
+from smart_scheduler.core.database import SessionLocal
+from smart_scheduler.models.work_session import WorkSession
+
+def test_report_reads_and_rollup_folds(client):
+    task_id = client.post("/api/tasks", json={"title": "reading", "category": "report-test"}).json()["id"]
+    stopped = datetime.utcnow()
+    with SessionLocal() as db:
+        db.add(WorkSession(task_id=task_id, started_at=stopped - timedelta(minutes=30), stopped_at=stopped))
+        db.commit()
+
+    report = client.get("/api/reports/time", params={"category": "report-test"}).json()
+    assert report["total_seconds"] == 0
+    with SessionLocal() as db:
+        assert db.query(WorkSession).filter_by(task_id=task_id, rolled_up=False).count() == 1
+
+    assert client.post("/api/reports/rollup").json()["rolled_up"] >= 1
+    report = client.get("/api/reports/time", params={"category": "report-test"}).json()
+    assert report["total_seconds"] == 30 * 60
@@ -0,0 +1,94 @@
+"""Concurrent task updates through the server: one connection per request vs the write-serialization queue"""
+import asyncio
+import json
+import re
+import sqlite3
+
+import pytest
+from sqlalchemy import text
+
+from conftest import hammer, scratch_engine, seed_tasks, stamp_head, start_server
+from smart_scheduler.core.writer import WriteQueue
+
+TASKS = 500
+CLIENTS = 32
+SECONDS = 8.0
+
+# What a typical mutating request does: read the task, write it back, commit
+BODY = json.dumps({"title": "updated under load", "estimated_duration": 45}).encode()
+PATHS = [f"/api/tasks/{task_id}" for task_id in range(1, TASKS + 1)]
+
+def run(tmp_path, serialized):
+    """(writes/s, status counts, 'database is locked' in the log, versions bumped) for one server"""
+    mode = "serialized" if serialized else "direct"
+    path = tmp_path / f"{mode}.db"
+    engine = scratch_engine(path)
+    seed_tasks(engine, TASKS)
+    stamp_head(engine)
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+
+    log = tmp_path / f"{mode}.log"
+    server, port = start_server(log, False, DATABASE_URL=f"sqlite:///{path}", ACCESS_LOG="off",
+                                WRITE_SERIALIZATION=str(serialized).lower())
+    try:
+        statuses, _, seconds = hammer(port, PATHS, SECONDS, CLIENTS, method="PUT", body=BODY)
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+    with engine.connect() as connection:
+        bumped = connection.execute(text("SELECT SUM(version) - COUNT(*) FROM tasks")).scalar()
+    engine.dispose()
+    locked = len(re.findall("database is locked", log.read_text(errors="replace")))
+    return statuses[200] / seconds, statuses, locked, bumped
+
+@pytest.mark.slow
+def test_serialized_writes_never_hit_a_locked_database(tmp_path):
+    direct_rate, direct_statuses, direct_locked, direct_bumped = run(tmp_path, serialized=False)
+    rate, statuses, locked, bumped = run(tmp_path, serialized=True)
+    print(f"\n{CLIENTS} clients updating tasks for {SECONDS:.0f} s: "
+          f"direct {direct_rate:.0f} writes/s {dict(direct_statuses)} with {direct_locked} 'database is locked', "
+          f"serialized {rate:.0f} writes/s {dict(statuses)} with {locked}")
+
+    assert locked == 0 and set(statuses) == {200}
+    # Every acknowledged update landed exactly once, in both modes
+    assert bumped == statuses[200]
+    assert direct_bumped == direct_statuses[200]
+    assert rate > direct_rate
+
+def test_jobs_with_their_own_session_run_with_no_batch_open(scratch_db):
+    engine, _ = scratch_db
+    seed_tasks(engine, 2)
+    path = engine.url.database
+
+    def own_commit():
+        # No busy wait: fails at once if the writer still held its batch open
+        connection = sqlite3.connect(path, timeout=0)
+        connection.execute("UPDATE tasks SET title = 'imported' WHERE id = 2")
+        connection.commit()
+        connection.close()
+
+    async def main():
+        queue = WriteQueue(str(engine.url))
+        queue.start()
+
+        async def request():
+            async with queue.session() as db:
+                db.execute(text("UPDATE tasks SET title = 'requested' WHERE id = 1"))
+                db.commit()
+
+        async def job():
+            async with queue.paused():
+                own_commit()
+
+        # The request leaves its batch open for the queued job, which commits it first
+        await asyncio.gather(request(), job())
+        stats = queue.stats()
+        queue.stop()
+        return stats
+
+    stats = asyncio.run(main())
+    assert stats["writes"] == 1 and stats["failed_batches"] == 0
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT title FROM tasks ORDER BY id")).scalars().all() == ["requested", "imported"]